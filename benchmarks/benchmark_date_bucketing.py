@@ -0,0 +1,71 @@
+"""
+Grouping `--size` documents (10M by default) by day, week and 15 minutes,
+`$dateToString` strings versus `$dateTrunc` dates.
+
+    python -m benchmarks.benchmark_date_bucketing --size 10000000
+"""
+from asyncio import run
+from datetime import (
+    datetime,
+    timedelta,
+)
+
+from beanie import Document
+
+from benchmarks.common import (
+    parse_arguments,
+    connect,
+    seed,
+    measure,
+)
+from utilsbeanie.utilsbeanie import UtilsBeanie
+
+
+class BenchmarkEvent(Document):
+    pid: int
+    created_at: datetime
+
+    class Settings:
+        name = "benchmark_events"
+
+
+START = datetime(2020, 1, 1)
+
+
+async def main() -> None:
+    arguments = parse_arguments(__doc__.splitlines()[1], default_size=10_000_000)
+    await connect(arguments, [BenchmarkEvent])
+
+    await seed(
+        BenchmarkEvent,
+        arguments.size,
+        # one document every 10 seconds, about three years for 10M
+        lambda i: {"pid": i, "created_at": START + timedelta(seconds=10 * i)},
+        arguments.reseed,
+    )
+
+    for use_date_trunc in (False, True):
+        utils_beanie = UtilsBeanie(document=BenchmarkEvent, use_date_trunc=use_date_trunc)
+
+        for group_by_on in (
+            ["created_at_by_year_month_day"],
+            ["created_at_by_week"],
+            ["created_at_by_15_minutes"],
+        ):
+            if not use_date_trunc and group_by_on != ["created_at_by_year_month_day"]:
+                # no `$dateToString` format for these
+                continue
+
+            await measure(
+                f"use_date_trunc={use_date_trunc} {group_by_on[0]}",
+                lambda: utils_beanie.fetch_by_aggregation_pipeline(
+                    aggregation_pipeline=utils_beanie.build_group_by_pipeline(group_by_on),
+                    sort={"_id": 1},
+                    allowDiskUse=True,
+                ),
+                arguments.repeat,
+            )
+
+
+if __name__ == "__main__":
+    run(main())
@@ -0,0 +1,91 @@
+"""
+Paginated 1:1 lookups over `--size` base documents (1M by default), joining
+before versus after `$skip`/`$limit`.
+
+    python -m benchmarks.benchmark_deferred_lookup --size 1000000
+"""
+from asyncio import run
+
+from beanie import Document
+from pydantic import BaseModel
+from pymongo import IndexModel
+
+from benchmarks.common import (
+    parse_arguments,
+    connect,
+    seed,
+    measure,
+)
+from utilsbeanie.utilsbeanie import UtilsBeanie
+
+
+class BenchmarkOrder(Document):
+    pid: int
+    customer_pid: int
+    amount: int
+
+    class Settings:
+        name = "benchmark_orders"
+        indexes = [IndexModel([("pid", 1)]), IndexModel([("amount", 1), ("pid", 1)])]
+
+
+class BenchmarkCustomer(Document):
+    pid: int
+    name: str
+
+    class Settings:
+        name = "customer"
+        indexes = [IndexModel([("pid", 1)], unique=True)]
+
+
+class CustomerProjection(BaseModel):
+    pid: int
+    name: str
+
+
+class OrderProjection(BaseModel):
+    pid: int
+    amount: int
+    customer_obj: CustomerProjection | None = None
+
+
+async def main() -> None:
+    arguments = parse_arguments(__doc__.splitlines()[1])
+    await connect(arguments, [BenchmarkOrder, BenchmarkCustomer])
+
+    await seed(
+        BenchmarkCustomer,
+        arguments.size,
+        lambda i: {"pid": i, "name": f"customer {i}"},
+        arguments.reseed,
+    )
+    await seed(
+        BenchmarkOrder,
+        arguments.size,
+        lambda i: {"pid": i, "customer_pid": i, "amount": i % 1000},
+        arguments.reseed,
+    )
+
+    for defer_lookups in (False, True):
+        utils_beanie = UtilsBeanie(document=BenchmarkOrder, defer_lookups=defer_lookups)
+        aggregation_pipeline = utils_beanie.build_aggregation_pipeline(
+            attributes=(("customer", CustomerProjection),),
+            final_projection=OrderProjection,
+        )
+
+        for current_page in (1, 1000):
+            await measure(
+                f"defer_lookups={defer_lookups} page {current_page}",
+                lambda: utils_beanie.fetch_by_aggregation_pipeline(
+                    aggregation_pipeline=aggregation_pipeline,
+                    last_filter={"amount": {"$lt": 500}},
+                    sort={"pid": 1},
+                    current_page=current_page,
+                    page_size=20,
+                ),
+                arguments.repeat,
+            )
+
+
+if __name__ == "__main__":
+    run(main())
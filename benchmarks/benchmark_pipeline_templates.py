@@ -0,0 +1,104 @@
+"""
+Building the pipeline of a 5-lookup endpoint `--size` times (10,000 by
+default), memoized versus rebuilt on every call. No database is needed.
+
+    python -m benchmarks.benchmark_pipeline_templates --size 10000
+"""
+from asyncio import run
+
+from beanie import Document
+from pydantic import BaseModel
+
+from benchmarks.common import (
+    parse_arguments,
+    measure,
+)
+from utilsbeanie.utility.aggregation_mixin import clear_pipeline_templates
+from utilsbeanie.utilsbeanie import UtilsBeanie
+
+
+class BenchmarkInvoice(Document):
+    pid: int
+
+    class Settings:
+        name = "benchmark_invoices"
+
+
+def make_projection(name: str) -> type[BaseModel]:
+    return type(
+        f"{name.title()}Projection",
+        (BaseModel,),
+        {
+            "__annotations__": {f"field_{i}": str for i in range(10)},
+            **{f"field_{i}": "" for i in range(10)},
+        },
+    )
+
+
+ATTRIBUTES = tuple(
+    (name, make_projection(name))
+    for name in ("customer", "seller", "currency", "category", "warehouse")
+)
+
+DICT_ATTRIBUTES = tuple(
+    {
+        "lookup_from": name,
+        "lookup_local_field": f"{name}_pid",
+        "lookup_foreign_field": "pid",
+        "lookup_as": f"{name}_obj",
+        "projection_model": projection,
+    }
+    for name, projection in ATTRIBUTES
+)
+
+
+class InvoiceProjection(BaseModel):
+    pid: int
+    customer_obj: dict | None = None
+    seller_obj: dict | None = None
+    currency_obj: dict | None = None
+    category_obj: dict | None = None
+    warehouse_obj: dict | None = None
+
+
+async def main() -> None:
+    arguments = parse_arguments(__doc__.splitlines()[1], default_size=10_000)
+    utils_beanie = UtilsBeanie(document=BenchmarkInvoice)
+
+    def build_tuple_attributes() -> None:
+        for _ in range(arguments.size):
+            utils_beanie.build_aggregation_pipeline(
+                attributes=ATTRIBUTES,
+                final_projection=InvoiceProjection,
+            )
+
+    def build_dict_attributes() -> None:
+        for _ in range(arguments.size):
+            utils_beanie.build_aggregation_pipeline(
+                attributes=DICT_ATTRIBUTES,
+                final_projection={"_id": 0, "pid": 1, "customer_obj": 1},
+            )
+
+    def rebuild() -> None:
+        # what every call did before memoization
+        for _ in range(arguments.size):
+            clear_pipeline_templates()
+            utils_beanie._build_aggregation_pipeline(
+                attributes=ATTRIBUTES,
+                final_projection=InvoiceProjection,
+            )
+
+    for label, func in (
+        ("rebuilt on every call", rebuild),
+        ("memoized, tuple attributes", build_tuple_attributes),
+        ("memoized, dict attributes", build_dict_attributes),
+    ):
+
+        async def run_func(func=func) -> None:
+            func()
+
+        await measure(f"{arguments.size} x 5 lookups {label}", run_func, arguments.repeat)
+
+
+if __name__ == "__main__":
+    run(main())
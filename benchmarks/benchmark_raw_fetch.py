@@ -0,0 +1,83 @@
+"""
+Model parsing versus `lazy_parse` versus the raw fast path, `--size` rows (10k by default) per request.
+
+    python -m benchmarks.benchmark_raw_fetch --size 10000
+"""
+from asyncio import run
+from random import Random
+from time import process_time
+
+from beanie import Document
+from bson.raw_bson import RawBSONDocument
+
+from benchmarks.common import (
+    parse_arguments,
+    connect,
+    seed,
+    measure,
+)
+from utilsbeanie.utilsbeanie import UtilsBeanie
+
+
+class BenchmarkRawFetchDoc(Document):
+    pid: int
+    name: str
+    value: int
+    tags: list[str]
+    score: float
+
+    class Settings:
+        name = "benchmark_raw_fetch_docs"
+
+
+async def main() -> None:
+    arguments = parse_arguments(__doc__.splitlines()[1], default_size=10_000)
+    await connect(arguments, [BenchmarkRawFetchDoc])
+
+    utils = UtilsBeanie(document=BenchmarkRawFetchDoc)
+    random = Random(0)
+
+    def make_raw_document(i: int) -> dict:
+        return {
+            "pid": i,
+            "name": f"name {i}",
+            "value": random.randrange(1_000),
+            "tags": random.choices(["a", "b", "c", "d", "e"], k=3),
+            "score": random.random(),
+        }
+
+    await seed(BenchmarkRawFetchDoc, arguments.size, make_raw_document, arguments.reseed)
+
+    modes = (
+        ("models", {}),
+        ("lazy_parse", {"lazy_parse": True}),
+        ("raw dict", {"raw": True}),
+        ("raw RawBSONDocument", {"raw": True, "raw_document_class": RawBSONDocument}),
+    )
+    for label, kwargs in modes:
+        best = await measure(
+            f"fetch_list_by_filter {label}",
+            lambda: utils.fetch_list_by_filter({}, **kwargs),
+            arguments.repeat,
+        )
+
+        start = process_time()
+        rows = await utils.fetch_list_by_filter({}, **kwargs)
+        # touch one field per row, the work a listing does at least
+        sum(i.value if isinstance(i, Document) else i["value"] for i in rows)
+        cpu = (process_time() - start) * 1000
+        print(
+            f"{'':<60} {len(rows) / best * 1000:>10.0f} rows/s   cpu {cpu:>10.2f} ms",
+            flush=True,
+        )
+
+    for label, kwargs in modes[::2]:
+        await measure(
+            f"fetch_by_aggregation_pipeline {label}",
+            lambda: utils.fetch_by_aggregation_pipeline(first_filter={}, **kwargs),
+            arguments.repeat,
+        )
+
+
+if __name__ == "__main__":
+    run(main())
@@ -0,0 +1,78 @@
+"""
+Regex search versus search tokens over `--size` documents (1M by default).
+
+    python -m benchmarks.benchmark_search_tokens --size 1000000
+"""
+from asyncio import run
+from random import Random
+
+from beanie import Document
+from pymongo import IndexModel
+
+from benchmarks.common import (
+    parse_arguments,
+    connect,
+    seed,
+    measure,
+)
+from utilsbeanie.utilsbeanie import UtilsBeanie
+
+WORDS = [f"word{i}" for i in range(5_000)]
+
+
+class BenchmarkSearchDoc(Document):
+    pid: int
+    name: str
+    description: str
+
+    class Settings:
+        name = "benchmark_search_docs"
+        indexes = [IndexModel([("_search_tokens", 1)])]
+
+
+async def main() -> None:
+    arguments = parse_arguments(__doc__.splitlines()[1])
+    await connect(arguments, [BenchmarkSearchDoc])
+
+    regex_utils = UtilsBeanie(document=BenchmarkSearchDoc)
+    token_utils = UtilsBeanie(
+        document=BenchmarkSearchDoc,
+        fields_names_for_search_tokens=("name", "description"),
+        search_tokens_edge_ngram_min_length=3,
+    )
+
+    random = Random(0)
+
+    def make_raw_document(i: int) -> dict:
+        raw = {
+            "pid": i,
+            "name": " ".join(random.choices(WORDS, k=2)),
+            "description": " ".join(random.choices(WORDS, k=8)),
+        }
+        raw["_search_tokens"] = token_utils.prepare_search_tokens(raw)
+        return raw
+
+    await seed(BenchmarkSearchDoc, arguments.size, make_raw_document, arguments.reseed)
+
+    for search in (["word42"], ["word42 word4242"], ["word9"]):
+        inputs = {"search": search}
+        for label, utils in (("regex", regex_utils), ("tokens", token_utils)):
+            filter_ = utils.prepare_filter(
+                inputs=inputs,
+                search_field_name="search",
+                fields_names_for_search=("name", "description"),
+            )
+            await measure(
+                f"{label} {search}",
+                lambda: utils.fetch_list_by_filter(filter_, page_size=20, current_page=1),
+                arguments.repeat,
+            )
+            await measure(
+                f"{label} {search} count",
+                lambda: utils.fetch_count(filter_),
+                arguments.repeat,
+            )
+
+
+if __name__ == "__main__":
+    run(main())
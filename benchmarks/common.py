@@ -0,0 +1,83 @@
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+)
+
+from utilsbeanie.engine import Engin
+
+
+def parse_arguments(description: str, default_size: int = 1_000_000):
+    parser = ArgumentParser(description=description)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", default=27017)
+    parser.add_argument("--database", default="utilsbeanie_benchmark")
+    parser.add_argument("--size", type=int, default=default_size)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--reseed",
+        action="store_true",
+        help="drop and populate the collections even if they already have --size documents",
+    )
+    return parser.parse_args()
+
+
+async def connect(arguments, document_models: list) -> None:
+    connection_string, database = Engin.create_connection_string(
+        host=arguments.host,
+        port=arguments.port,
+        database=arguments.database,
+        username=None,
+        password=None,
+        authdb=None,
+    )
+    await Engin.init_beanie(
+        connection_string=connection_string,
+        database=database,
+        list_of_documents_pathes=document_models,
+    )
+
+
+async def seed(
+    document,
+    size: int,
+    make_raw_document: Callable[[int], Dict[str, Any]],
+    reseed: bool = False,
+    batch_size: int = 10_000,
+) -> None:
+    collection = document.get_motor_collection()
+    if not reseed and await collection.estimated_document_count() == size:
+        return
+
+    await collection.delete_many({})
+    for start in range(0, size, batch_size):
+        await collection.insert_many(
+            [make_raw_document(i) for i in range(start, min(start + batch_size, size))],
+            ordered=False,
+        )
+    print(f"seeded {size} documents into {document.get_collection_name()}", flush=True)
+
+
+async def measure(
+    label: str,
+    func: Callable[[], Awaitable[Any]],
+    repeat: int = 5,
+) -> float:
+    """Run `func` once to warm up, then `repeat` times; print and return the best time in ms."""
+    await func()
+
+    timings = list()
+    for _ in range(repeat):
+        start = perf_counter()
+        await func()
+        timings.append((perf_counter() - start) * 1000)
+
+    best = min(timings)
+    print(
+        f"{label:<60} best {best:>10.2f} ms   mean {sum(timings) / len(timings):>10.2f} ms",
+        flush=True,
+    )
+    return best
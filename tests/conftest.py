@@ -1,17 +1,33 @@
 import asyncio
 from beanie import init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient
-from tests.sample_document import SampleDoc, SampleDocWithUniquePid
+from tests.sample_document import (
+    SampleDoc,
+    SampleDocWithUniquePid,
+    SampleDocForSearch,
+    SampleDocWithSearchTokens,
+)
 
 
 async def clean_db():
     client = AsyncIOMotorClient("mongodb://localhost:27017")
     await init_beanie(
         database=client.test_db,
-        document_models=[SampleDoc, SampleDocWithUniquePid],
+        document_models=[
+            SampleDoc,
+            SampleDocWithUniquePid,
+            SampleDocForSearch,
+            SampleDocWithSearchTokens,
+        ],
     )
     await SampleDoc.find({}).delete()
     await SampleDocWithUniquePid.find({}).delete()
+    await SampleDocForSearch.find({}).delete()
+    await SampleDocWithSearchTokens.find({}).delete()
+    # migration state, rollup watermarks, rollups and partitions of earlier runs
+    for name in await client.test_db.list_collection_names():
+        if name.startswith(("utilsbeanie_", "sample_docs_")):
+            await client.test_db.drop_collection(name)
 
 
 async def need_to_be_run():
@@ -3,7 +3,12 @@ import pytest_asyncio
 from beanie import init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient
 from utilsbeanie.utilsbeanie import UtilsBeanie
-from tests.sample_document import SampleDoc, SampleDocWithUniquePid
+from tests.sample_document import (
+    SampleDoc,
+    SampleDocWithUniquePid,
+    SampleDocForSearch,
+    SampleDocWithSearchTokens,
+)
 
 
 
@@ -15,7 +20,12 @@ async def initialize_beanie():
     client = AsyncIOMotorClient("mongodb://localhost:27017")
     await init_beanie(
         database=client.test_db,
-        document_models=[SampleDoc, SampleDocWithUniquePid],
+        document_models=[
+            SampleDoc,
+            SampleDocWithUniquePid,
+            SampleDocForSearch,
+            SampleDocWithSearchTokens,
+        ],
     )
 
 
@@ -32,3 +42,78 @@ def utils_beanie_unique_pid():
         document=SampleDocWithUniquePid,
         field_separator="__",
         )
+
+@pytest.fixture(scope="module")
+def utils_beanie_for_search():
+    return UtilsBeanie(
+        document=SampleDocForSearch,
+        field_separator="__",
+        )
+
+@pytest.fixture(scope="module")
+def utils_beanie_search_tokens():
+    return UtilsBeanie(
+        document=SampleDocForSearch,
+        field_separator="__",
+        fields_names_for_search_tokens=("name", "title"),
+        search_tokens_edge_ngram_min_length=2,
+        )
+
+@pytest.fixture(scope="module")
+def utils_beanie_search_tokens_field():
+    return UtilsBeanie(
+        document=SampleDocWithSearchTokens,
+        field_separator="__",
+        fields_names_for_search_tokens=("name", "title"),
+        search_tokens_edge_ngram_min_length=2,
+        )
+
+@pytest.fixture(scope="module")
+def utils_beanie_text_search():
+    return UtilsBeanie(
+        document=SampleDocForSearch,
+        field_separator="__",
+        use_text_search=True,
+        )
+
+@pytest.fixture(scope="module")
+def utils_beanie_date_trunc():
+    return UtilsBeanie(
+        document=SampleDoc,
+        field_separator="__",
+        use_date_trunc=True,
+        group_by_timezone="Asia/Tehran",
+        )
+
+@pytest.fixture(scope="module")
+def utils_beanie_bucket_cache():
+    return UtilsBeanie(
+        document=SampleDoc,
+        field_separator="__",
+        use_group_by_bucket_cache=True,
+        )
+
+@pytest.fixture(scope="module")
+def utils_beanie_creation_time():
+    return UtilsBeanie(
+        document=SampleDoc,
+        field_separator="__",
+        creation_time_field_name="created_at",
+        )
+
+@pytest.fixture(scope="module")
+def utils_beanie_creation_time_pid():
+    return UtilsBeanie(
+        document=SampleDoc,
+        field_separator="__",
+        creation_time_field_name="created_at",
+        creation_time_key="pid",
+        )
+
+@pytest.fixture(scope="module")
+def utils_beanie_partitioned():
+    return UtilsBeanie(
+        document=SampleDoc,
+        field_separator="__",
+        partition_field_name="pid",
+        )
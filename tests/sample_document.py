@@ -1,6 +1,10 @@
-from typing import Annotated
+from typing import Annotated, List
 
 from beanie import Document, Indexed
+from pydantic import Field
+from pymongo import IndexModel
+
+from utilsbeanie.constant import CASE_INSENSITIVE_COLLATION
 
 
 class SampleDoc(Document):
@@ -17,4 +21,27 @@ class SampleDocWithUniquePid(Document):
     value: int
 
     class Settings:
-        name = "sample_doc_with_unique_pid"
\ No newline at end of file
+        name = "sample_doc_with_unique_pid"
+
+
+class SampleDocForSearch(Document):
+    pid: int
+    name: str
+    title: str
+
+    class Settings:
+        name = "sample_doc_for_search"
+        indexes = [
+            IndexModel([("name", 1)]),
+            IndexModel([("title", 1)], collation=CASE_INSENSITIVE_COLLATION),
+        ]
+
+
+class SampleDocWithSearchTokens(Document):
+    pid: int
+    name: str
+    title: str
+    search_tokens: List[str] = Field(default_factory=list, alias="_search_tokens")
+
+    class Settings:
+        name = "sample_doc_with_search_tokens"
@@ -0,0 +1,66 @@
+import pytest
+from tests.sample_document import SampleDoc
+from tests.fixtures import initialize_beanie, utils_beanie
+
+
+@pytest.mark.asyncio
+async def test_prepare_sample_size(utils_beanie):
+    assert utils_beanie.prepare_sample_size(population=1_000_000, sample_size=500) == 500
+    assert utils_beanie.prepare_sample_size(population=100, sample_size=500) == 100
+    # ±1 percentage point at 95%: 9604 documents, less from a finite population
+    assert utils_beanie.prepare_sample_size(population=10**9, error_budget=0.01) == 9604
+    assert utils_beanie.prepare_sample_size(population=10_000, error_budget=0.01) == 4900
+
+    with pytest.raises(ValueError):
+        utils_beanie.build_approximate_group_by_pipeline(
+            group_by_on=["name"],
+            population=10,
+            sample_size=5,
+            metrics={"p_values": ("distinct", "value")},
+        )
+
+
+@pytest.mark.asyncio
+async def test_fetch_by_approximate_group_by(utils_beanie):
+    await SampleDoc.get_motor_collection().insert_many(
+        [
+            {"pid": pid, "name": "Approx A" if pid % 4 else "Approx B", "value": pid % 10}
+            for pid in range(9400, 9800)
+        ]
+    )
+    arguments = dict(
+        aggregation_pipeline=[],
+        inputs={"name": ["Approx"]},
+        fields_names_for_regex=("name",),
+        group_by_on=["name"],
+        metrics={"total": ("sum", "value"), "average": ("avg", "value")},
+        sort={"_id.name": 1},
+    )
+    exact = await utils_beanie.fetch_by_group_by_aggregation_pipeline(**arguments)
+
+    result = await utils_beanie.fetch_by_approximate_group_by_aggregation_pipeline(
+        **arguments,
+        sample_size=1000,
+    )
+    assert result["sampling"] == {
+        "population": 400,
+        "sample_size": 400,
+        "confidence": 0.95,
+        "is_exact": True,
+    }
+    for estimated, i in zip(result["data"], exact):
+        assert estimated["count"] == i["count"]
+        assert estimated["intervals"]["count"] == [i["count"], i["count"]]
+        assert estimated["total"] == i["total"]
+
+    result = await utils_beanie.fetch_by_approximate_group_by_aggregation_pipeline(
+        **arguments,
+        sample_size=200,
+        confidence=0.999,
+    )
+    assert result["sampling"]["is_exact"] is False
+    for estimated, i in zip(result["data"], exact):
+        assert estimated["_id"] == i["_id"]
+        for name in ("count", "total", "average"):
+            low, high = estimated["intervals"][name]
+            assert low <= i[name] <= high
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, timezone
+from os import urandom
+
+import pytest
+from bson import ObjectId
+
+from tests.sample_document import SampleDoc
+from tests.fixtures import (
+    initialize_beanie,
+    utils_beanie,
+    utils_beanie_creation_time,
+    utils_beanie_creation_time_pid,
+)
+
+START = datetime(2024, 5, 1, 12, 0, 0)
+# around the window [START + 10s, START + 20s), within half a second of the
+# `_id` and pid timestamps, which are whole seconds
+OFFSETS = [0, 9.4, 9.6, 10, 10.4, 10.6, 15, 19.4, 19.6, 20, 20.4, 20.6, 30]
+
+
+async def insert_documents(value: int) -> None:
+    documents = list()
+    for index, offset in enumerate(OFFSETS):
+        created_at = START + timedelta(seconds=offset)
+        seconds = created_at.replace(tzinfo=timezone.utc).timestamp()
+        documents.append(
+            {
+                "_id": ObjectId(int(seconds).to_bytes(4, "big") + urandom(8)),
+                "pid": int(f"{seconds:.0f}{1000 + index}"),
+                "name": f"Creation Time {offset}",
+                "value": value,
+                "created_at": created_at,
+            }
+        )
+    await SampleDoc.get_motor_collection().insert_many(documents)
+
+
+async def fetch_pids(filter_: dict, value: int) -> list:
+    documents = await SampleDoc.get_motor_collection().find(
+        {"$and": [filter_, {"value": value}]}
+    ).to_list(length=None)
+    return sorted(i["pid"] for i in documents)
+
+
+@pytest.mark.asyncio
+async def test_creation_time_bounds_are_equivalent(
+    utils_beanie,
+    utils_beanie_creation_time,
+    utils_beanie_creation_time_pid,
+):
+    value = 9986
+    await insert_documents(value)
+
+    for inputs in (
+        {
+            "created_at_from": START + timedelta(seconds=10),
+            "created_at_to": START + timedelta(seconds=20),
+        },
+        {"created_at_from": START + timedelta(seconds=10.5)},
+        {"created_at_to": START + timedelta(seconds=19.5)},
+    ):
+        expected = await fetch_pids(
+            utils_beanie.prepare_filter(inputs=inputs, fields_names_for_range=("created_at",)),
+            value,
+        )
+        assert expected
+
+        for utils in (utils_beanie_creation_time, utils_beanie_creation_time_pid):
+            filter_ = utils.prepare_filter(inputs=inputs, fields_names_for_range=("created_at",))
+            bounds = filter_["$and"][1]
+            assert list(bounds) == [utils.creation_time_key]
+            assert await fetch_pids(filter_, value) == expected
+
+            # the bounds alone hold every document of the window
+            assert set(expected) <= set(await fetch_pids(bounds, value))
+
+
+@pytest.mark.asyncio
+async def test_creation_time_bounds(utils_beanie_creation_time, utils_beanie_creation_time_pid):
+    from_ = datetime(2024, 5, 1, 12, 0, 10, tzinfo=timezone.utc)
+    to = datetime(2024, 5, 1, 12, 0, 20, tzinfo=timezone.utc)
+
+    bounds = utils_beanie_creation_time.prepare_creation_time_bounds(from_=from_, to=to)
+    assert bounds == {
+        "$gte": ObjectId.from_datetime(from_ - timedelta(seconds=1)),
+        "$lt": ObjectId.from_datetime(to + timedelta(seconds=2)),
+    }
+
+    bounds = utils_beanie_creation_time_pid.prepare_creation_time_bounds(from_=from_, to=to)
+    assert bounds == {
+        "$gte": int(from_.timestamp() - 1) * 10_000,
+        "$lt": int(to.timestamp() + 3) * 10_000,
+    }
+
+
+@pytest.mark.asyncio
+async def test_creation_time_bounds_skipped(utils_beanie_creation_time):
+    assert utils_beanie_creation_time.prepare_filter(
+        inputs={"created_at_from": START, "created_at_include_null": True},
+        fields_names_for_range=("created_at",),
+    ) == {"$or": [{"created_at": {"$gte": START}}, {"created_at": None}]}
+
+    assert utils_beanie_creation_time.prepare_filter(
+        inputs={"created_at_from": "2024-05-01"},
+        fields_names_for_range=("created_at",),
+    ) == {"$or": [{"created_at": {"$gte": "2024-05-01"}}]}
@@ -0,0 +1,64 @@
+import pytest
+from tests.sample_document import SampleDoc
+from tests.fixtures import initialize_beanie, utils_beanie
+from utilsbeanie.utilsbeanie import UtilsBeanie
+
+
+@pytest.mark.asyncio
+async def test_fetch_distinct_values(utils_beanie):
+    await SampleDoc.get_motor_collection().insert_many(
+        [{"pid": pid, "name": f"Distinct {pid % 3}", "value": 1} for pid in range(9850, 9856)]
+    )
+
+    result = await utils_beanie.fetch_distinct_values("name", prefix="Distinct ")
+    assert result == {
+        "values": ["Distinct 0", "Distinct 1", "Distinct 2"],
+        "is_prefix_mode": False,
+    }
+
+    # writes through UtilsBeanie reach the catalog without reading the collection
+    await utils_beanie.insert_one_without_pid({"pid": 9856, "name": "Distinct 3", "value": 1})
+    await utils_beanie.update_one_by_pid_no_return(9856, {"name": "Distinct 4"})
+    result = await utils_beanie.fetch_distinct_values("name", prefix="Distinct ", limit=10)
+    assert result["values"] == [f"Distinct {i}" for i in range(5)]
+
+    # the update replaced "Distinct 3", which only the reconciliation drops
+    assert await utils_beanie.reconcile_distinct_values("name") is True
+    result = await utils_beanie.fetch_distinct_values("name", prefix="Distinct ")
+    assert result["values"] == ["Distinct 0", "Distinct 1", "Distinct 2", "Distinct 4"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_distinct_values_in_prefix_mode(utils_beanie):
+    await SampleDoc.get_motor_collection().insert_many(
+        [{"pid": pid, "name": f"Prefix {pid}", "value": 1} for pid in range(9860, 9864)]
+    )
+
+    # the catalogs belong to each object, so its own settings apply
+    utils = UtilsBeanie(document=SampleDoc, distinct_values_max_cardinality=2)
+    result = await utils.fetch_distinct_values("name", prefix="Prefix 986", limit=3)
+    assert result == {
+        "values": ["Prefix 9860", "Prefix 9861", "Prefix 9862"],
+        "is_prefix_mode": True,
+    }
+
+
+@pytest.mark.asyncio
+async def test_distinct_values_catalogs_shared_between_objects(utils_beanie):
+    await SampleDoc.get_motor_collection().insert_many(
+        [{"pid": pid, "name": f"Shared {pid}", "value": 1} for pid in range(9760, 9762)]
+    )
+    reader = UtilsBeanie(document=SampleDoc)
+    writer = UtilsBeanie(document=SampleDoc, distinct_values_catalogs=reader.distinct_values_catalogs)
+    assert (await reader.fetch_distinct_values("name", prefix="Shared "))["values"] == [
+        "Shared 9760",
+        "Shared 9761",
+    ]
+
+    await writer.insert_one_without_pid({"pid": 9762, "name": "Shared 9762", "value": 1})
+    await utils_beanie.insert_one_without_pid({"pid": 9763, "name": "Shared 9763", "value": 1})
+    assert (await reader.fetch_distinct_values("name", prefix="Shared "))["values"] == [
+        "Shared 9760",
+        "Shared 9761",
+        "Shared 9762",
+    ]
@@ -0,0 +1,52 @@
+import pytest
+from tests.sample_document import SampleDoc
+from tests.fixtures import initialize_beanie, utils_beanie
+
+
+@pytest.mark.asyncio
+async def test_fetch_facet_counts(utils_beanie):
+    await SampleDoc.get_motor_collection().insert_many(
+        [
+            {"pid": pid, "name": f"Facet {'ABC'[pid % 3]}", "value": pid - 9800}
+            for pid in range(9800, 9830)
+        ]
+    )
+    inputs = {
+        "name": ["Facet A", "Facet B"],
+        "value_from": 10,
+        "search": ["Facet"],
+    }
+    result = await utils_beanie.fetch_facet_counts(
+        inputs=inputs,
+        fields_names_for_in=("name",),
+        fields_names_for_range=("value",),
+        search_field_name="search",
+        fields_names_for_search=("name",),
+        ranges_boundaries={"value": [0, 10, 20, 30]},
+    )
+
+    # every name with value >= 10, ignoring the chosen names
+    assert result["facets"]["name"] == [
+        {"value": "Facet A", "count": 7},
+        {"value": "Facet B", "count": 7},
+        {"value": "Facet C", "count": 6},
+    ]
+    # every value of names A and B, ignoring value_from
+    assert result["facets"]["value"] == [
+        {"from": 0, "to": 10, "count": 6},
+        {"from": 10, "to": 20, "count": 7},
+        {"from": 20, "to": 30, "count": 7},
+    ]
+    assert result["total"] == 14
+
+    result = await utils_beanie.fetch_facet_counts(
+        inputs=inputs,
+        fields_names_for_in=("name",),
+        fields_names_for_range=("value",),
+        search_field_name="search",
+        fields_names_for_search=("name",),
+        number_of_buckets=2,
+        values_limit=1,
+    )
+    assert len(result["facets"]["name"]) == 1
+    assert sum(i["count"] for i in result["facets"]["value"]) == 20
@@ -0,0 +1,90 @@
+import pytest
+from pydantic import BaseModel
+from tests.sample_document import SampleDoc, SampleDocWithUniquePid
+from tests.fixtures import initialize_beanie, utils_beanie
+
+
+class UniqueProjection(BaseModel):
+    name: str
+
+
+ATTRIBUTES = (
+    {
+        "lookup_from": "sample_doc_with_unique_pid",
+        "lookup_local_field": "pid",
+        "lookup_foreign_field": "pid",
+        "lookup_as": "unique_obj",
+        "projection_model": UniqueProjection,
+        "to_one": True,
+    },
+)
+FINAL_PROJECTION = {"_id": 0, "name": 1, "unique_obj": 1}
+
+
+async def insert_sample_docs(start: int, value: int) -> None:
+    for i in range(start, start + 6):
+        await SampleDoc(pid=i, name=f"Application Join {i}", value=value).insert()
+        if i % 2:
+            await SampleDocWithUniquePid(pid=i, name=f"Unique {i}", value=value).insert()
+
+
+@pytest.mark.asyncio
+async def test_fetch_by_application_join_matches_lookup(utils_beanie):
+    await insert_sample_docs(start=8000, value=8008)
+
+    kwargs = dict(
+        first_filter={"value": 8008},
+        sort={"pid": -1},
+        current_page=1,
+        page_size=4,
+    )
+
+    application_joined = await utils_beanie.fetch_by_application_join(
+        attributes=ATTRIBUTES,
+        final_projection=FINAL_PROJECTION,
+        **kwargs,
+    )
+    server_joined = await utils_beanie.fetch_by_aggregation_pipeline(
+        aggregation_pipeline=utils_beanie.build_aggregation_pipeline(
+            attributes=ATTRIBUTES,
+            final_projection=FINAL_PROJECTION,
+        ),
+        **kwargs,
+    )
+
+    assert application_joined == server_joined
+    assert application_joined[0] == {
+        "name": "Application Join 8005",
+        "unique_obj": {"name": "Unique 8005"},
+    }
+    assert application_joined[1] == {"name": "Application Join 8004"}
+
+
+@pytest.mark.asyncio
+async def test_fetch_by_application_join_without_unwind(utils_beanie):
+    await insert_sample_docs(start=8100, value=8108)
+
+    result = await utils_beanie.fetch_by_application_join_with_pagination(
+        attributes=({**ATTRIBUTES[0], "unwind": False},),
+        final_projection={"_id": 0, "pid": 1, "unique_obj": 1},
+        first_filter={"value": 8108},
+        sort={"pid": 1},
+        current_page=1,
+        page_size=2,
+    )
+
+    assert result["pagination"]["total"] == 6
+    assert result["data"] == [
+        {"pid": 8100, "unique_obj": []},
+        {"pid": 8101, "unique_obj": [{"name": "Unique 8101"}]},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_fetch_by_application_join_refuses_to_many_unwind(utils_beanie):
+    with pytest.raises(ValueError):
+        await utils_beanie.fetch_by_application_join(
+            attributes=({**ATTRIBUTES[0], "to_one": False},),
+            final_projection=FINAL_PROJECTION,
+            first_filter={"value": 8208},
+        )
@@ -0,0 +1,72 @@
+import pytest
+
+numpy = pytest.importorskip("numpy")
+
+from tests.sample_document import SampleDoc
+from tests.fixtures import initialize_beanie, utils_beanie
+from utilsbeanie.constant import EnumOrderBy
+
+
+@pytest.mark.asyncio
+async def test_fetch_columns(utils_beanie):
+    for pid in range(9900, 9905):
+        await SampleDoc(pid=pid, name=f"Columns Test {pid % 2}", value=9900).insert()
+
+    result = await utils_beanie.fetch_columns(
+        {"value": 9900},
+        fields=("pid", "name"),
+        order_by={"pid": EnumOrderBy.ASCENDING},
+        initial_capacity=2,
+    )
+    assert result["length"] == 5
+    assert result["columns"]["pid"].dtype == numpy.int64
+    assert result["columns"]["pid"].tolist() == list(range(9900, 9905))
+    assert result["columns"]["name"].dtype == object
+    assert result["columns"]["name"].tolist()[:2] == ["Columns Test 0", "Columns Test 1"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_columns_dictionary_encoded_and_structured(utils_beanie):
+    for pid in range(9905, 9909):
+        await SampleDoc(pid=pid, name=f"Columns Test {pid % 2}", value=9905).insert()
+
+    result = await utils_beanie.fetch_columns(
+        {"value": 9905},
+        fields=("pid", "name", "value"),
+        dtypes={"value": "float32"},
+        dictionary_encoded=("name",),
+        structured=True,
+        order_by={"pid": EnumOrderBy.ASCENDING},
+    )
+    columns = result["columns"]
+    assert columns.dtype.names == ("pid", "name", "value")
+    assert columns["name"].tolist() == [0, 1, 0, 1]
+    assert result["dictionaries"]["name"].tolist() == ["Columns Test 1", "Columns Test 0"]
+    assert columns["value"].dtype == numpy.float32
+    assert columns["value"].tolist() == [9905.0] * 4
+
+
+@pytest.mark.asyncio
+async def test_fetch_columns_missing_values(utils_beanie):
+    await SampleDoc(pid=9909, name="Columns Test", value=9909).insert()
+
+    result = await utils_beanie.fetch_columns(
+        {"value": 9909},
+        fields=("pid", "missing"),
+        dtypes={"missing": "float64"},
+    )
+    assert numpy.isnan(result["columns"]["missing"][0])
+
+    with pytest.raises(ValueError):
+        await utils_beanie.fetch_columns(
+            {"value": 9909},
+            fields=("missing",),
+            dtypes={"missing": "int64"},
+        )
+
+
+@pytest.mark.asyncio
+async def test_fetch_columns_empty(utils_beanie):
+    result = await utils_beanie.fetch_columns({"value": 9910}, fields=("pid", "name"))
+    assert result["length"] == 0
+    assert len(result["columns"]["pid"]) == 0
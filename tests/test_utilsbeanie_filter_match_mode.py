@@ -0,0 +1,85 @@
+import pytest
+from tests.sample_document import SampleDocForSearch
+from tests.fixtures import initialize_beanie, utils_beanie_for_search
+from utilsbeanie.constant import EnumMatchMode, CASE_INSENSITIVE_COLLATION
+
+
+async def explain_winning_plan(filter_: dict, **kwargs) -> str:
+    cursor = SampleDocForSearch.get_motor_collection().find(filter_, **kwargs)
+    explanation = await cursor.explain()
+    return str(explanation["queryPlanner"]["winningPlan"])
+
+
+@pytest.mark.asyncio
+async def test_prepare_filter_contains_mode_keeps_unanchored_regex(utils_beanie_for_search):
+    filter_ = utils_beanie_for_search.prepare_filter(
+        inputs={"name": ["alpha beta"]},
+        fields_names_for_regex=("name",),
+    )
+    assert filter_ == {
+        "$or": [
+            {"$and": [{"name": {"$regex": "alpha"}}, {"name": {"$regex": "beta"}}]}
+        ]
+    }
+
+
+@pytest.mark.asyncio
+async def test_prepare_filter_prefix_mode_uses_ixscan(utils_beanie_for_search):
+    await SampleDocForSearch(pid=1, name="Prefix Alpha", title="t").insert()
+    await SampleDocForSearch(pid=2, name="Other Alpha", title="t").insert()
+
+    filter_ = utils_beanie_for_search.prepare_filter(
+        inputs={"name": ["Prefix"]},
+        fields_names_for_regex=("name",),
+        fields_match_modes={"name": EnumMatchMode.PREFIX},
+    )
+    assert filter_ == {"$or": [{"name": {"$regex": "^Prefix"}}]}
+
+    assert "IXSCAN" in await explain_winning_plan(filter_)
+
+    fetched_docs = await utils_beanie_for_search.fetch_list_by_filter(filter_)
+    assert [doc.pid for doc in fetched_docs] == [1]
+
+
+@pytest.mark.asyncio
+async def test_prepare_filter_exact_ci_mode_uses_ixscan(utils_beanie_for_search):
+    await SampleDocForSearch(pid=3, name="n", title="Exact Title").insert()
+    await SampleDocForSearch(pid=4, name="n", title="Exact Title Longer").insert()
+
+    filter_ = utils_beanie_for_search.prepare_filter(
+        inputs={"title": ["exact TITLE"]},
+        fields_names_for_regex=("title",),
+        fields_match_modes={"title": EnumMatchMode.EXACT_CI},
+    )
+    assert filter_ == {"$or": [{"title": "exact TITLE"}]}
+
+    assert "IXSCAN" in await explain_winning_plan(
+        filter_, collation=CASE_INSENSITIVE_COLLATION
+    )
+
+    fetched_docs = await utils_beanie_for_search.fetch_list_by_filter(
+        filter_, collation=CASE_INSENSITIVE_COLLATION
+    )
+    assert [doc.pid for doc in fetched_docs] == [3]
+
+
+@pytest.mark.asyncio
+async def test_prepare_filter_search_field_prefix_mode_uses_ixscan(utils_beanie_for_search):
+    await SampleDocForSearch(pid=5, name="Searchable", title="t").insert()
+
+    filter_ = utils_beanie_for_search.prepare_filter(
+        inputs={"search": ["Search"]},
+        search_field_name="search",
+        fields_names_for_search=("name",),
+        fields_match_modes={"name": EnumMatchMode.PREFIX},
+    )
+    assert filter_ == {"$and": [{"name": {"$regex": "^Search"}}]}
+
+    assert "IXSCAN" in await explain_winning_plan(filter_)
+
+    result = await utils_beanie_for_search.fetch_by_aggregation_pipeline(
+        first_filter=filter_,
+        current_page=1,
+        page_size=10,
+    )
+    assert [doc["pid"] for doc in result] == [5]
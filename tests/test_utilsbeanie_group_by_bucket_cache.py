@@ -0,0 +1,112 @@
+from datetime import (
+    datetime,
+    timedelta,
+)
+
+import pytest
+from tests.sample_document import SampleDoc
+from tests.fixtures import initialize_beanie, utils_beanie, utils_beanie_bucket_cache
+
+
+@pytest.mark.asyncio
+async def test_find_group_by_bucket_field(utils_beanie_bucket_cache):
+    find = utils_beanie_bucket_cache.find_group_by_bucket_field
+    assert find(["name", "created_at_by_year_month_day"]) == ("created_at", "day")
+    assert find(["meta__created_at_by_week"]) == ("meta.created_at", "week")
+    assert find(["created_at_by_month"]) is None
+    assert find(["created_at_by_15_minutes"]) is None
+    assert find(["name"]) is None
+
+
+@pytest.mark.asyncio
+async def test_sort_objs(utils_beanie_bucket_cache):
+    objs = [
+        {"_id": {"name": "b"}, "count": 1},
+        {"_id": {"name": "a"}, "count": 1},
+        {"_id": {}, "count": 3},
+        {"_id": {"name": "c"}, "count": 2},
+    ]
+    result = utils_beanie_bucket_cache.sort_objs(objs, {"count": -1, "_id.name": 1})
+    assert [i["_id"].get("name") for i in result] == [None, "c", "a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_group_by_with_bucket_cache(utils_beanie, utils_beanie_bucket_cache):
+    now = datetime.utcnow()
+    collection = SampleDoc.get_motor_collection()
+    await collection.insert_many(
+        [
+            {"pid": 9310, "name": "Bucket A", "value": 1, "created_at": now - timedelta(days=3)},
+            {"pid": 9311, "name": "Bucket A", "value": 2, "created_at": now - timedelta(days=3)},
+            {"pid": 9312, "name": "Bucket B", "value": 4, "created_at": now - timedelta(days=2)},
+            {"pid": 9313, "name": "Bucket B", "value": 8, "created_at": now},
+            {"pid": 9314, "name": "Bucket B", "value": 16},
+        ]
+    )
+
+    async def fetch(utils_beanie, current_page: int = 1) -> dict:
+        return await utils_beanie.fetch_by_group_by_aggregation_pipeline_with_pagination(
+            aggregation=[],
+            inputs={"name": ["Bucket"]},
+            fields_names_for_regex=("name",),
+            group_by_on=["name", "created_at_by_year_month_day"],
+            metrics={"total": ("sum", "value")},
+            sort={"_id.name": 1, "total": -1},
+            current_page=current_page,
+            page_size=3,
+        )
+
+    result = await fetch(utils_beanie_bucket_cache)
+    assert result == await fetch(utils_beanie)
+    assert result["pagination"]["total"] == 4
+    assert await fetch(utils_beanie_bucket_cache, current_page=2) == await fetch(
+        utils_beanie, current_page=2
+    )
+
+    # closed buckets are not read again until they are invalidated
+    await collection.insert_one(
+        {"pid": 9315, "name": "Bucket A", "value": 100, "created_at": now - timedelta(days=3)}
+    )
+    assert (await fetch(utils_beanie_bucket_cache))["data"][0]["total"] == 3
+
+    assert utils_beanie_bucket_cache.invalidate_group_by_buckets(
+        "created_at",
+        since=now - timedelta(days=3),
+        until=now - timedelta(days=3),
+    ) == 1
+    result = await fetch(utils_beanie_bucket_cache)
+    assert result == await fetch(utils_beanie)
+    assert result["data"][0]["total"] == 103
+
+    # open buckets are aggregated on every call
+    await collection.insert_one({"pid": 9316, "name": "Bucket B", "value": 32, "created_at": now})
+    assert await fetch(utils_beanie_bucket_cache) == await fetch(utils_beanie)
+
+    # writes through the object invalidate the buckets of the times they touch
+    await utils_beanie_bucket_cache.update_one_by_pid_no_return(9311, {"value": 200})
+    await utils_beanie_bucket_cache.delete_one_by_pid(9312)
+    result = await fetch(utils_beanie_bucket_cache)
+    assert result == await fetch(utils_beanie)
+    assert result["data"][0]["total"] == 301
+
+
+@pytest.mark.asyncio
+async def test_fetch_group_by_buckets_times(utils_beanie_bucket_cache):
+    collection = SampleDoc.get_motor_collection()
+    await collection.insert_many(
+        [
+            {"pid": 9320, "name": "Times", "value": 9320, "created_at": datetime(2024, 1, 5)},
+            {"pid": 9321, "name": "Times", "value": 9320, "created_at": datetime(2024, 1, 9)},
+            {"pid": 9322, "name": "Times", "value": 9320, "created_at": "2024-01-01"},
+            {"pid": 9323, "name": "Times", "value": 9320},
+        ]
+    )
+    utils_beanie_bucket_cache.group_by_buckets_cache["test"] = {"time_field": "created_at"}
+    try:
+        assert await utils_beanie_bucket_cache.fetch_group_by_buckets_times(
+            {"value": 9320},
+            [{"created_at": datetime(2024, 2, 1)}, {"name": "Times"}],
+        ) == [("created_at", datetime(2024, 1, 5), datetime(2024, 2, 1))]
+        assert await utils_beanie_bucket_cache.fetch_group_by_buckets_times({"value": 0}) == []
+    finally:
+        del utils_beanie_bucket_cache.group_by_buckets_cache["test"]
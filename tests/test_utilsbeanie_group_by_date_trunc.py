@@ -0,0 +1,98 @@
+from datetime import datetime
+
+import pytest
+from tests.sample_document import SampleDoc
+from tests.fixtures import initialize_beanie, utils_beanie, utils_beanie_date_trunc
+
+
+@pytest.mark.asyncio
+async def test_build_group_by_pipeline_string_suffixes(utils_beanie):
+    assert utils_beanie.build_group_by_pipeline(
+        ["name", "created_at_by_year_month_day"]
+    ) == [
+        {
+            "$group": {
+                "_id": {
+                    "name": "$name",
+                    "created_at_by_year_month_day": {
+                        "$dateToString": {
+                            "format": "%Y-%m-%d",
+                            "date": "$created_at",
+                            "timezone": "UTC",
+                        }
+                    },
+                },
+                "count": {"$sum": 1},
+            }
+        },
+    ]
+
+
+@pytest.mark.asyncio
+async def test_build_group_by_pipeline_string_and_date_trunc_suffixes(utils_beanie):
+    (group,) = utils_beanie.build_group_by_pipeline(
+        ["created_at_by_year", "created_at_by_month", "created_at_by_week"]
+    )
+    assert group["$group"]["_id"]["created_at_by_year"]["$dateToString"]["format"] == "%Y"
+    assert group["$group"]["_id"]["created_at_by_month"]["$dateToString"]["format"] == "%m"
+    assert group["$group"]["_id"]["created_at_by_week"]["$dateTrunc"]["date"] == "$created_at"
+
+
+@pytest.mark.asyncio
+async def test_build_group_by_pipeline_date_trunc_suffixes(utils_beanie_date_trunc):
+    assert utils_beanie_date_trunc.build_group_by_pipeline(
+        ["created_at_by_week", "meta__created_at_by_15_minutes", "created_at_by_hour"]
+    ) == [
+        {
+            "$group": {
+                "_id": {
+                    "created_at_by_week": {
+                        "$dateTrunc": {
+                            "date": "$created_at",
+                            "unit": "week",
+                            "binSize": 1,
+                            "timezone": "Asia/Tehran",
+                            "startOfWeek": "monday",
+                        }
+                    },
+                    "meta__created_at_by_15_minutes": {
+                        "$dateTrunc": {
+                            "date": "$meta.created_at",
+                            "unit": "minute",
+                            "binSize": 15,
+                            "timezone": "Asia/Tehran",
+                        }
+                    },
+                    "created_at_by_hour": {
+                        "$hour": {"date": "$created_at", "timezone": "Asia/Tehran"}
+                    },
+                },
+                "count": {"$sum": 1},
+            }
+        },
+    ]
+
+
+@pytest.mark.asyncio
+async def test_fetch_by_group_by_quarter(utils_beanie_date_trunc):
+    # 2024-03-31 21:00 UTC is already 2024-04-01 in Tehran (+03:30)
+    await SampleDoc.get_motor_collection().insert_many(
+        [
+            {"pid": 9001, "name": "q", "value": 9000, "created_at": datetime(2024, 1, 5)},
+            {"pid": 9002, "name": "q", "value": 9000, "created_at": datetime(2024, 3, 31, 21)},
+            {"pid": 9003, "name": "q", "value": 9000, "created_at": datetime(2024, 5, 5)},
+        ]
+    )
+
+    result = await utils_beanie_date_trunc.fetch_by_group_by_aggregation_pipeline(
+        aggregation_pipeline=[],
+        inputs={"value": [9000]},
+        fields_names_for_in=("value",),
+        group_by_on=["created_at_by_quarter"],
+        sort={"_id.created_at_by_quarter": 1},
+    )
+
+    assert [(i["_id"]["created_at_by_quarter"], i["count"]) for i in result] == [
+        (datetime(2023, 12, 31, 20, 30), 1),
+        (datetime(2024, 3, 31, 20, 30), 2),
+    ]
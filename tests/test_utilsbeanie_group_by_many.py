@@ -0,0 +1,57 @@
+import pytest
+from tests.sample_document import SampleDoc
+from tests.fixtures import initialize_beanie, utils_beanie
+
+
+@pytest.mark.asyncio
+async def test_fetch_group_by_many(utils_beanie):
+    for pid, name, value in (
+        (9101, "Many A", 9100),
+        (9102, "Many A", 9100),
+        (9103, "Many B", 9100),
+        (9104, "Many B", 9101),
+    ):
+        await SampleDoc(pid=pid, name=name, value=value).insert()
+
+    inputs = {"name": ["Many"]}
+    result = await utils_beanie.fetch_group_by_many(
+        aggregation_pipeline=[],
+        inputs=inputs,
+        fields_names_for_regex=("name",),
+        groupings={
+            "by_name": ["name"],
+            "by_name_value": ["name", "value"],
+        },
+        sort={"_id": 1},
+    )
+
+    assert result == {
+        "by_name": [
+            {"_id": {"name": "Many A"}, "count": 2},
+            {"_id": {"name": "Many B"}, "count": 2},
+        ],
+        "by_name_value": [
+            {"_id": {"name": "Many A", "value": 9100}, "count": 2},
+            {"_id": {"name": "Many B", "value": 9100}, "count": 1},
+            {"_id": {"name": "Many B", "value": 9101}, "count": 1},
+        ],
+    }
+
+    for name, group_by_on in (("by_name", ["name"]), ("by_name_value", ["name", "value"])):
+        assert await utils_beanie.fetch_by_group_by_aggregation_pipeline(
+            aggregation_pipeline=[],
+            inputs=inputs,
+            fields_names_for_regex=("name",),
+            group_by_on=group_by_on,
+            sort={"_id": 1},
+        ) == result[name]
+
+    result = await utils_beanie.fetch_group_by_many(
+        aggregation_pipeline=[],
+        inputs=inputs,
+        fields_names_for_regex=("name",),
+        groupings=[["value"]],
+        sort={"count": -1},
+        limit=1,
+    )
+    assert result == {"value": [{"_id": {"value": 9100}, "count": 3}]}
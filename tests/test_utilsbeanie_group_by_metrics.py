@@ -0,0 +1,72 @@
+import pytest
+from tests.sample_document import SampleDoc
+from tests.fixtures import initialize_beanie, utils_beanie
+
+
+@pytest.mark.asyncio
+async def test_build_group_by_pipeline_with_metrics(utils_beanie):
+    assert utils_beanie.build_group_by_pipeline(
+        group_by_on=["name"],
+        metrics={
+            "total": ("sum", "value"),
+            "p_values": ("distinct", "value"),
+            "latest_pids": ("top", "pid", {"meta__created_at": -1}, 2),
+        },
+    ) == [
+        {
+            "$group": {
+                "_id": {"name": "$name"},
+                "count": {"$sum": 1},
+                "total": {"$sum": "$value"},
+                "p_values": {"$addToSet": "$value"},
+                "latest_pids": {
+                    "$topN": {
+                        "n": 2,
+                        "sortBy": {"meta.created_at": -1},
+                        "output": "$pid",
+                    }
+                },
+            }
+        },
+        {"$addFields": {"p_values": {"$size": "$p_values"}}},
+    ]
+
+    with pytest.raises(ValueError):
+        utils_beanie.build_group_by_pipeline(
+            group_by_on=["name"],
+            metrics={"median": ("median", "value")},
+        )
+
+
+@pytest.mark.asyncio
+async def test_fetch_by_group_by_with_metrics_filtered_by_last_filter(utils_beanie):
+    for pid, name, value in (
+        (9201, "Metrics A", 10),
+        (9202, "Metrics A", 10),
+        (9203, "Metrics A", 30),
+        (9204, "Metrics B", 5),
+    ):
+        await SampleDoc(pid=pid, name=name, value=value).insert()
+
+    result = await utils_beanie.fetch_by_group_by_aggregation_pipeline(
+        aggregation_pipeline=[],
+        inputs={"name": ["Metrics"], "__total_from": 20},
+        fields_names_for_regex=("name",),
+        fields_names_for_range=("total",),
+        group_by_on=["name"],
+        metrics={
+            "total": ("sum", "value"),
+            "maximum": ("max", "value"),
+            "p_values": ("distinct", "value"),
+        },
+    )
+
+    assert result == [
+        {
+            "_id": {"name": "Metrics A"},
+            "count": 3,
+            "total": 50,
+            "maximum": 30,
+            "p_values": 2,
+        }
+    ]
@@ -53,6 +53,15 @@ async def test_insert_one_by_epoch_pid(utils_beanie_unique_pid: UtilsBeanie):
     assert fetched_doc.name == inputs["name"]
     assert fetched_doc.value == inputs["value"]
 
+@pytest.mark.asyncio
+async def test_insert_one_by_epoch_pid_rejects_other_suffix_widths(utils_beanie_unique_pid: UtilsBeanie):
+    """
+    Test that a suffix range wider than epoch_pid_suffix_digits is refused
+    instead of producing pids the creation time helpers cannot decode.
+    """
+    with pytest.raises(ValueError):
+        await utils_beanie_unique_pid.insert_one_by_epoch_pid({"name": "Wide", "value": 1}, min=10000, max=99999)
+
 # from unittest.mock import patch
 
 # @pytest.fixture
@@ -0,0 +1,137 @@
+import pytest
+from pydantic import BaseModel
+from tests.sample_document import SampleDoc, SampleDocWithUniquePid
+from tests.fixtures import initialize_beanie, utils_beanie
+from utilsbeanie.constant import EnumJoinStrategy
+
+
+class UniqueProjection(BaseModel):
+    name: str
+
+
+def make_lookup(lookup_as: str) -> dict:
+    return {
+        "lookup_from": "sample_doc_with_unique_pid",
+        "lookup_local_field": "pid",
+        "lookup_foreign_field": "pid",
+        "lookup_as": lookup_as,
+        "projection_model": UniqueProjection,
+        "to_one": True,
+    }
+
+
+@pytest.mark.asyncio
+async def test_plan_join_strategies(utils_beanie):
+    lookups = [
+        utils_beanie.prepare_lookup_attribute(make_lookup(i))
+        for i in ("sorted_obj", "indexed_obj", "unindexed_obj", "reference_obj")
+    ]
+    stats = {"count": 10_000, "is_indexed": True, "is_reference": False}
+    decisions = utils_beanie.plan_join_strategies(
+        lookups=lookups,
+        last_filter=None,
+        sort={"sorted_obj.name": 1},
+        page_size=10,
+        collections_stats={
+            "sorted_obj": stats,
+            "indexed_obj": stats,
+            "unindexed_obj": {**stats, "is_indexed": False},
+            "reference_obj": {**stats, "is_reference": True},
+        },
+    )
+    assert {key: value["strategy"] for key, value in decisions.items()} == {
+        "sorted_obj": EnumJoinStrategy.SERVER,
+        "indexed_obj": EnumJoinStrategy.DEFERRED,
+        "unindexed_obj": EnumJoinStrategy.APPLICATION,
+        "reference_obj": EnumJoinStrategy.APPLICATION,
+    }
+    assert decisions["sorted_obj"]["reason"] == "read by last_filter or sort"
+
+    decisions = utils_beanie.plan_join_strategies(
+        lookups=lookups[1:2],
+        last_filter=None,
+        sort=None,
+        page_size=None,
+        collections_stats={"indexed_obj": stats},
+    )
+    assert decisions["indexed_obj"]["strategy"] == EnumJoinStrategy.SERVER
+
+
+@pytest.mark.asyncio
+async def test_plan_join_strategies_keeps_to_many_lookups_on_the_server(utils_beanie):
+    lookup = utils_beanie.prepare_lookup_attribute({**make_lookup("many_obj"), "to_one": False})
+    stats = {"count": 10_000, "is_indexed": True, "is_reference": True}
+    decisions = utils_beanie.plan_join_strategies(
+        lookups=[lookup],
+        last_filter=None,
+        sort=None,
+        page_size=10,
+        collections_stats={"many_obj": stats},
+    )
+    assert decisions["many_obj"]["strategy"] == EnumJoinStrategy.SERVER
+    assert not decisions["many_obj"]["is_flippable"]
+
+    decisions = utils_beanie.plan_join_strategies(
+        lookups=[{**lookup, "unwind": False}],
+        last_filter=None,
+        sort=None,
+        page_size=10,
+        collections_stats={"many_obj": {**stats, "is_reference": False}},
+    )
+    assert decisions["many_obj"]["strategy"] == EnumJoinStrategy.DEFERRED
+
+
+@pytest.mark.asyncio
+async def test_choose_join_plan_explores_then_uses_the_faster(utils_beanie):
+    shape = "test_choose_join_plan"
+    decisions = {
+        "unique_obj": {
+            "strategy": EnumJoinStrategy.DEFERRED,
+            "reason": "indexed",
+            "is_flippable": True,
+        }
+    }
+
+    for _ in range(utils_beanie.join_planner_min_samples):
+        assert utils_beanie.choose_join_plan(shape, decisions) == decisions
+        utils_beanie.record_join_outcome(shape, decisions, duration=20, number_of_rows=10)
+
+    for _ in range(utils_beanie.join_planner_min_samples):
+        chosen = utils_beanie.choose_join_plan(shape, decisions)
+        assert chosen["unique_obj"]["strategy"] == EnumJoinStrategy.APPLICATION
+        assert chosen["unique_obj"]["reason"].startswith("exploring")
+        utils_beanie.record_join_outcome(shape, chosen, duration=5, number_of_rows=10)
+
+    chosen = utils_beanie.choose_join_plan(shape, decisions)
+    assert chosen["unique_obj"]["strategy"] == EnumJoinStrategy.APPLICATION
+    assert chosen["unique_obj"]["reason"].startswith("observed 5.00 ms against 20.00 ms")
+
+
+@pytest.mark.asyncio
+async def test_fetch_by_planned_join_records_decisions(utils_beanie):
+    for i in range(8500, 8506):
+        await SampleDoc(pid=i, name=f"Planned {i}", value=8508).insert()
+        if i % 2:
+            await SampleDocWithUniquePid(pid=i, name=f"Unique {i}", value=8508).insert()
+
+    result = await utils_beanie.fetch_by_planned_join_with_pagination(
+        attributes=(make_lookup("unique_obj"),),
+        final_projection={"_id": 0, "pid": 1, "unique_obj": 1},
+        first_filter={"value": 8508},
+        sort={"pid": 1},
+        current_page=2,
+        page_size=2,
+    )
+    assert result["pagination"]["total"] == 6
+    assert result["data"] == [
+        {"pid": 8502},
+        {"pid": 8503, "unique_obj": {"name": "Unique 8503"}},
+    ]
+
+    report = [
+        i
+        for i in utils_beanie.get_join_planner_report()
+        if i["shape"]["first_filter"] == ["value"]
+    ]
+    assert report[0]["decisions"]["unique_obj"]["strategy"] == "deferred"
+    assert report[0]["plans"]["unique_obj:deferred"]["count"] == 1
@@ -0,0 +1,82 @@
+import pytest
+
+from tests.sample_document import SampleDoc
+from tests.fixtures import initialize_beanie, utils_beanie
+
+
+@pytest.mark.asyncio
+async def test_run_migration_inputs(utils_beanie):
+    for pid in range(9970, 9977):
+        await SampleDoc(pid=pid, name="Migration Test", value=9970).insert()
+
+    dry_run = await utils_beanie.run_migration(
+        "test_run_migration_inputs",
+        filter_={"value": 9970},
+        inputs={"name": "Migrated"},
+        dry_run=True,
+    )
+    assert dry_run["remaining"] == 7
+    assert await SampleDoc.find({"name": "Migrated", "value": 9970}).count() == 0
+
+    result = await utils_beanie.run_migration(
+        "test_run_migration_inputs",
+        filter_={"value": 9970},
+        inputs={"name": "Migrated"},
+        batch_size=3,
+    )
+    assert result["status"] == "done"
+    assert result["processed"] == 7
+    assert result["modified"] == 7
+    assert result["batches"] == 3
+    assert await SampleDoc.find({"name": "Migrated", "value": 9970}).count() == 7
+
+    assert await utils_beanie.fetch_migration("test_run_migration_inputs") == result
+
+
+@pytest.mark.asyncio
+async def test_run_migration_resumes_after_failure(utils_beanie):
+    for pid in range(9977, 9985):
+        await SampleDoc(pid=pid, name="Migration Test", value=9977).insert()
+
+    calls = list()
+
+    def failing_transform(batch):
+        calls.append([i["pid"] for i in batch])
+        if len(calls) == 2:
+            raise RuntimeError("crash")
+        return [{"value": 9978, "name": f"Migrated {i['pid']}"} for i in batch]
+
+    with pytest.raises(RuntimeError):
+        await utils_beanie.run_migration(
+            "test_run_migration_resumes_after_failure",
+            filter_={"value": {"$in": [9977, 9978]}},
+            transform=failing_transform,
+            batch_size=3,
+        )
+
+    checkpoint = await utils_beanie.fetch_migration("test_run_migration_resumes_after_failure")
+    assert checkpoint["status"] == "running"
+    assert checkpoint["processed"] == 3
+
+    async def transform(batch):
+        calls.append([i["pid"] for i in batch])
+        return [None if i["pid"] == 9984 else {"value": 9978} for i in batch]
+
+    result = await utils_beanie.run_migration(
+        "test_run_migration_resumes_after_failure",
+        filter_={"value": {"$in": [9977, 9978]}},
+        transform=transform,
+        batch_size=3,
+    )
+    assert calls[2:] == [[9980, 9981, 9982], [9983, 9984]]
+    assert result["status"] == "done"
+    assert result["processed"] == 8
+    assert result["modified"] == 7
+    assert await SampleDoc.find({"value": 9978}).count() == 7
+    assert await SampleDoc.find({"value": 9977}).count() == 1
+
+
+@pytest.mark.asyncio
+async def test_run_migration_requires_inputs_or_transform(utils_beanie):
+    with pytest.raises(ValueError):
+        await utils_beanie.run_migration("test_run_migration_requires_inputs_or_transform")
@@ -0,0 +1,135 @@
+from asyncio import Queue, create_task
+
+import pytest
+
+from tests.sample_document import SampleDoc
+from tests.fixtures import initialize_beanie, utils_beanie
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_callback(utils_beanie):
+    for pid in range(9920, 9950):
+        await SampleDoc(pid=pid, name="Scan Test", value=9920).insert()
+
+    batches = list()
+    state = await utils_beanie.parallel_scan(
+        callback=lambda index, batch: batches.append((index, batch)),
+        filter_={"value": 9920},
+        number_of_partitions=3,
+        field_name="pid",
+        projection={"pid": 1, "_id": 0},
+        batch_size=4,
+    )
+    pids = sorted(i["pid"] for _, batch in batches for i in batch)
+    assert pids == list(range(9920, 9950))
+    assert all(len(batch) <= 4 for _, batch in batches)
+    assert all(i["is_done"] for i in state["partitions"])
+    assert sum(i["count"] for i in state["partitions"]) == 30
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_resume(utils_beanie):
+    for pid in range(9950, 9960):
+        await SampleDoc(pid=pid, name="Scan Test", value=9950).insert()
+
+    state = utils_beanie.prepare_scan_state(field_name="pid", split_points=[9955])
+    state["partitions"][0].update({"last": 9952, "count": 3})
+    state["partitions"][1]["is_done"] = True
+
+    batches = list()
+    state = await utils_beanie.parallel_scan(
+        callback=lambda index, batch: batches.append((index, batch)),
+        filter_={"value": 9950},
+        batch_size=100,
+        state=state,
+    )
+    assert [(index, [i["pid"] for i in batch]) for index, batch in batches] == [
+        (0, [9953, 9954])
+    ]
+    assert state["partitions"][0] == {
+        "lower": None,
+        "upper": 9955,
+        "last": 9954,
+        "count": 5,
+        "is_done": True,
+    }
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_documents_outside_the_ranges(utils_beanie):
+    for pid in range(9750, 9756):
+        await SampleDoc(pid=pid, name="Scan Test", value=9750).insert()
+    await SampleDoc.get_motor_collection().insert_many(
+        [
+            {"pid": None, "name": "Scan Null", "value": 9750},
+            {"name": "Scan Missing", "value": 9750},
+            {"pid": "9757", "name": "Scan String", "value": 9750},
+        ]
+    )
+
+    state = utils_beanie.prepare_scan_state(field_name="pid", split_points=[9752, 9754])
+    assert len(state["partitions"]) == 4
+
+    batches = list()
+    try:
+        state = await utils_beanie.parallel_scan(
+            callback=lambda index, batch: batches.append((index, batch)),
+            filter_={"value": 9750},
+            projection={"name": 1, "_id": 0},
+            batch_size=2,
+            state=state,
+        )
+    finally:
+        # not parseable as `SampleDoc`
+        await SampleDoc.get_motor_collection().delete_many(
+            {"value": 9750, "name": {"$ne": "Scan Test"}}
+        )
+    names = sorted(i["name"] for index, batch in batches if index == 3 for i in batch)
+    assert names == ["Scan Missing", "Scan Null", "Scan String"]
+    assert sum(i["count"] for i in state["partitions"]) == 9
+    assert state["partitions"][3]["last"] is not None
+
+    assert utils_beanie.prepare_scan_state(field_name="_id", split_points=[1])["partitions"][-1] == {
+        "lower": 1,
+        "upper": None,
+        "last": None,
+        "count": 0,
+        "is_done": False,
+    }
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_queue(utils_beanie):
+    for pid in range(9960, 9970):
+        await SampleDoc(pid=pid, name="Scan Test", value=9960).insert()
+
+    queue = Queue(maxsize=1)
+    received = list()
+
+    async def consume():
+        while True:
+            _, batch = await queue.get()
+            received.extend(i["pid"] for i in batch)
+            queue.task_done()
+
+    consumer = create_task(consume())
+    checkpoints = list()
+    await utils_beanie.parallel_scan(
+        queue=queue,
+        filter_={"value": 9960},
+        number_of_partitions=2,
+        batch_size=3,
+        on_checkpoint=lambda state: checkpoints.append(state),
+    )
+    await queue.join()
+    consumer.cancel()
+
+    assert sorted(received) == list(range(9960, 9970))
+    assert checkpoints
+
+
+@pytest.mark.asyncio
+async def test_prepare_scan_split_points(utils_beanie):
+    assert utils_beanie.prepare_scan_split_points(list(range(100)), 4) == [25, 50, 75]
+    assert utils_beanie.prepare_scan_split_points([1, 1, 1, 2], 4) == [1, 2]
+    assert utils_beanie.prepare_scan_split_points([], 4) == []
@@ -0,0 +1,191 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from tests.sample_document import SampleDoc
+from tests.fixtures import (
+    initialize_beanie,
+    utils_beanie,
+    utils_beanie_partitioned,
+)
+from utilsbeanie.constant import EnumOrderBy
+from utilsbeanie.utilsbeanie import UtilsBeanie
+
+MONTHS = [datetime(2001, 1, 15), datetime(2001, 2, 15), datetime(2001, 3, 15)]
+
+
+class BytesWriter:
+    def __init__(self):
+        self.chunks = list()
+
+    async def write(self, chunk: bytes) -> None:
+        self.chunks.append(chunk)
+
+
+def to_pid(time: datetime, suffix: int) -> int:
+    return int(time.replace(tzinfo=timezone.utc).timestamp()) * 10**4 + suffix
+
+
+async def insert_documents(utils_beanie_partitioned, value: int) -> None:
+    for index, month in enumerate(MONTHS):
+        for suffix in range(1000, 1003):
+            await utils_beanie_partitioned.insert_one_without_pid(
+                {
+                    "pid": to_pid(month, suffix),
+                    "name": f"Partition {index} {suffix}",
+                    "value": value,
+                }
+            )
+
+
+@pytest.mark.asyncio
+async def test_partition_time_ranges(utils_beanie_partitioned):
+    start = utils_beanie_partitioned.prepare_partition_start(datetime(2001, 12, 31, 23))
+    assert start == datetime(2001, 12, 1)
+    assert utils_beanie_partitioned.prepare_next_partition_start(start) == datetime(2002, 1, 1)
+    assert utils_beanie_partitioned.prepare_partition_name("sample_docs", start) == "sample_docs_200112"
+    assert utils_beanie_partitioned.parse_partition_name("sample_docs", "sample_docs_200112") == start
+    assert utils_beanie_partitioned.parse_partition_name("sample_docs", "sample_docs_rollups") is None
+
+    since, until = utils_beanie_partitioned.prepare_partition_time_range(
+        {
+            "$and": [
+                {"pid": {"$gte": to_pid(MONTHS[0], 0)}},
+                {"$or": [{"pid": to_pid(MONTHS[1], 0)}, {"pid": {"$lt": to_pid(MONTHS[2], 0)}}]},
+            ],
+            "value": 1,
+        }
+    )
+    assert (since, until) == (MONTHS[0], MONTHS[2])
+    assert utils_beanie_partitioned.prepare_partition_time_range(
+        {"pid": {"$gt": to_pid(MONTHS[0], 0), "$lte": to_pid(MONTHS[1], 0)}}
+    ) == (MONTHS[0], MONTHS[1])
+
+    starts = [datetime(2001, 1, 1), datetime(2001, 2, 1), datetime(2001, 3, 1)]
+    assert utils_beanie_partitioned.filter_partition_starts(
+        starts, since=MONTHS[1], until=MONTHS[1]
+    ) == [datetime(2001, 2, 1)]
+    assert utils_beanie_partitioned.filter_partition_starts(starts) == starts
+
+    weekly = UtilsBeanie(document=SampleDoc, partition_field_name="pid", partition_days=7)
+    start = weekly.prepare_partition_start(datetime(2001, 3, 15, 12))
+    assert start == datetime(2001, 3, 15)
+    assert weekly.prepare_partition_name("sample_docs", start) == "sample_docs_20010315"
+    assert weekly.parse_partition_name("sample_docs", "sample_docs_20010315") == start
+
+
+@pytest.mark.asyncio
+async def test_fetch_from_partitions(utils_beanie, utils_beanie_partitioned):
+    value = 9987
+    await utils_beanie_partitioned.drop_partitions_before(datetime(2002, 1, 1))
+    await insert_documents(utils_beanie_partitioned, value)
+
+    assert await utils_beanie.fetch_count({"value": value}) == 0
+    partitions = await utils_beanie_partitioned.fetch_partitions(refresh=True)
+    assert sorted(i for i in partitions if i.startswith("sample_docs_2001")) == [
+        "sample_docs_200101",
+        "sample_docs_200102",
+        "sample_docs_200103",
+    ]
+
+    filter_ = {"value": value, "pid": {"$gte": to_pid(MONTHS[1], 0)}}
+    assert await utils_beanie_partitioned.fetch_partition_names_by_filter(filter_) == [
+        "sample_docs_200102",
+        "sample_docs_200103",
+    ]
+
+    result = await utils_beanie_partitioned.fetch_list_by_filter(
+        filter_,
+        order_by={"pid": EnumOrderBy.DESCENDING},
+        skip=1,
+        limit=3,
+    )
+    assert [i.pid for i in result] == [
+        to_pid(MONTHS[2], 1001),
+        to_pid(MONTHS[2], 1000),
+        to_pid(MONTHS[1], 1002),
+    ]
+    assert all(isinstance(i, SampleDoc) for i in result)
+
+    assert await utils_beanie_partitioned.fetch_count({"value": value}) == 9
+    result = await utils_beanie_partitioned.fetch_list_by_filter_with_pagination(
+        filter_,
+        current_page=2,
+        page_size=4,
+        order_by={"pid": EnumOrderBy.ASCENDING},
+    )
+    assert result["pagination"]["total"] == 6
+    assert [i.pid for i in result["data"]] == [to_pid(MONTHS[2], 1001), to_pid(MONTHS[2], 1002)]
+
+    result = await utils_beanie_partitioned.fetch_by_aggregation_pipeline(
+        first_filter={"value": value},
+        aggregation_pipeline=[
+            {"$group": {"_id": "$value", "count": {"$sum": 1}, "max_pid": {"$max": "$pid"}}},
+        ],
+    )
+    assert result == [{"_id": value, "count": 9, "max_pid": to_pid(MONTHS[2], 1002)}]
+
+
+@pytest.mark.asyncio
+async def test_drop_partitions_before(utils_beanie_partitioned):
+    value = 9988
+    await utils_beanie_partitioned.drop_partitions_before(datetime(2002, 1, 1))
+    await insert_documents(utils_beanie_partitioned, value)
+
+    dropped = await utils_beanie_partitioned.drop_partitions_before(datetime(2001, 3, 1))
+    assert dropped == ["sample_docs_200101", "sample_docs_200102"]
+    assert await utils_beanie_partitioned.fetch_count({"value": value}) == 3
+    assert await utils_beanie_partitioned.fetch_list_by_filter(
+        {"value": value, "pid": {"$lt": to_pid(MONTHS[2], 0)}}
+    ) == []
+
+    with pytest.raises(ValueError):
+        await utils_beanie_partitioned.insert_into_partition(
+            SampleDoc(pid=-1, name="Partition", value=value).model_copy(update={"pid": None})
+        )
+
+
+@pytest.mark.asyncio
+async def test_other_actions_with_partitions(utils_beanie_partitioned):
+    value = 9989
+    await utils_beanie_partitioned.drop_partitions_before(datetime(2002, 1, 1))
+    await insert_documents(utils_beanie_partitioned, value)
+
+    result = await utils_beanie_partitioned.fetch_facet_counts(
+        inputs={"value": [value]},
+        fields_names_for_in=("value",),
+    )
+    assert result["total"] == 9
+
+    assert await utils_beanie_partitioned.fetch_distinct_values_by_prefix(
+        "name", prefix="Partition 2 "
+    ) == ["Partition 2 1000", "Partition 2 1001", "Partition 2 1002"]
+
+    writer = BytesWriter()
+    assert await utils_beanie_partitioned.stream_list_by_filter(
+        writer,
+        {"value": value, "pid": {"$gte": to_pid(MONTHS[2], 0)}},
+        order_by={"pid": EnumOrderBy.ASCENDING},
+    ) == 3
+    assert [i["pid"] for i in json.loads(b"".join(writer.chunks))] == [
+        to_pid(MONTHS[2], suffix) for suffix in range(1000, 1003)
+    ]
+
+    writer = BytesWriter()
+    assert await utils_beanie_partitioned.stream_by_aggregation_pipeline(
+        writer,
+        first_filter={"value": value},
+        aggregation_pipeline=[{"$group": {"_id": "$value", "count": {"$sum": 1}}}],
+    ) == 1
+    assert json.loads(b"".join(writer.chunks)) == [{"_id": value, "count": 9}]
+
+    with pytest.raises(ValueError):
+        await utils_beanie_partitioned.parallel_scan(callback=print)
+    with pytest.raises(ValueError):
+        await utils_beanie_partitioned.refresh_rollup("sample_docs_rollup")
+    with pytest.raises(ValueError):
+        await utils_beanie_partitioned.fetch_columns({"value": value}, fields=("pid",))
+    with pytest.raises(ValueError):
+        await utils_beanie_partitioned.run_migration("sample_docs_partitioned", inputs={"value": 0})
+
@@ -0,0 +1,265 @@
+import pytest
+from tests.sample_document import SampleDoc
+from tests.fixtures import initialize_beanie, utils_beanie
+
+
+LOOKUP = {
+    "$lookup": {
+        "from": "sample_doc_with_unique_pid",
+        "localField": "pid",
+        "foreignField": "pid",
+        "as": "unique_obj",
+        "pipeline": [{"$project": {"_id": 0, "name": 1}}, {"$limit": 1}],
+    }
+}
+UNWIND = {"$unwind": {"path": "$unique_obj", "preserveNullAndEmptyArrays": True}}
+PROJECT = {"$project": {"_id": 0, "pid": 1, "value": 1, "unique_obj": 1}}
+
+
+@pytest.mark.asyncio
+async def test_optimizer_removes_empty_stages_and_merges_matches(utils_beanie):
+    optimized = utils_beanie.optimize_aggregation_pipeline(
+        [
+            {"$match": {"value": 1}},
+            {"$match": {}},
+            {"$match": {"pid": 2}},
+            {"$skip": 0},
+            {"$limit": 5},
+        ]
+    )
+    assert optimized == [{"$match": {"value": 1, "pid": 2}}, {"$limit": 5}]
+
+
+@pytest.mark.asyncio
+async def test_optimizer_pushes_base_field_conditions_ahead_of_lookup(utils_beanie):
+    optimized = utils_beanie.optimize_aggregation_pipeline(
+        [
+            LOOKUP,
+            UNWIND,
+            PROJECT,
+            {"$match": {"$and": [{"value": 1}, {"unique_obj.name": "x"}]}},
+            {"$sort": {"pid": 1}},
+        ]
+    )
+    assert optimized == [
+        {"$match": {"value": 1}},
+        LOOKUP,
+        UNWIND,
+        {"$match": {"unique_obj.name": "x"}},
+        PROJECT,
+        {"$sort": {"pid": 1}},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_optimizer_keeps_conditions_after_group_and_computed_fields(utils_beanie):
+    aggregation_pipeline = [
+        {"$addFields": {"double": {"$multiply": ["$value", 2]}}},
+        {"$match": {"double": 4}},
+        {"$group": {"_id": "$pid", "count": {"$sum": 1}}},
+        {"$match": {"count": 1}},
+    ]
+    assert utils_beanie.optimize_aggregation_pipeline(aggregation_pipeline) == aggregation_pipeline
+
+
+@pytest.mark.asyncio
+async def test_optimizer_keeps_conditions_after_computed_and_nested_projections(utils_beanie):
+    for project in (
+        {"$project": {"x": "$y"}},
+        {"$project": {"x": {"$add": ["$y", 1]}}},
+        {"$project": {"a": {"b": 1}}},
+        {"$project": {"_id": 1}},
+    ):
+        aggregation_pipeline = [project, {"$match": {"c": None}}]
+        assert utils_beanie.push_down_match_stages(aggregation_pipeline) == aggregation_pipeline
+
+    for project in ({"$project": {"x": "$c"}}, {"$project": {"c": {"$add": ["$c", 1]}}}):
+        aggregation_pipeline = [project, {"$match": {"c": 1}}]
+        assert utils_beanie.push_down_match_stages(aggregation_pipeline) == aggregation_pipeline
+
+    assert utils_beanie.push_down_match_stages(
+        [{"$project": {"c": 1, "x": "$y"}}, {"$match": {"c": 1}}]
+    ) == [{"$match": {"c": 1}}, {"$project": {"c": 1, "x": "$y"}}]
+
+
+@pytest.mark.asyncio
+async def test_optimizer_defers_lookups_after_pagination(utils_beanie):
+    optimized = utils_beanie.optimize_aggregation_pipeline(
+        [
+            LOOKUP,
+            UNWIND,
+            PROJECT,
+            {"$match": {"value": 1}},
+            {"$sort": {"pid": 1}},
+            {"$skip": 20},
+            {"$limit": 10},
+        ],
+        defer_lookups=True,
+    )
+    assert optimized == [
+        {"$match": {"value": 1}},
+        {"$sort": {"pid": 1}},
+        {"$skip": 20},
+        {"$limit": 10},
+        LOOKUP,
+        UNWIND,
+        PROJECT,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_optimizer_keeps_lookups_before_sort_on_joined_fields(utils_beanie):
+    aggregation_pipeline = [
+        LOOKUP,
+        UNWIND,
+        PROJECT,
+        {"$sort": {"unique_obj.name": 1}},
+        {"$limit": 10},
+    ]
+    assert (
+        utils_beanie.optimize_aggregation_pipeline(aggregation_pipeline, defer_lookups=True)
+        == aggregation_pipeline
+    )
+
+
+@pytest.mark.asyncio
+async def test_optimizer_keeps_to_many_lookups_before_pagination(utils_beanie):
+    to_many_lookup = {
+        "$lookup": {**LOOKUP["$lookup"], "pipeline": [{"$project": {"_id": 0, "name": 1}}]}
+    }
+    for join_stages in (
+        [to_many_lookup, UNWIND],
+        [LOOKUP, {"$unwind": {"path": "$tags", "preserveNullAndEmptyArrays": True}}],
+    ):
+        aggregation_pipeline = [
+            *join_stages,
+            {"$sort": {"pid": 1}},
+            {"$limit": 10},
+        ]
+        assert (
+            utils_beanie.optimize_aggregation_pipeline(aggregation_pipeline, defer_lookups=True)
+            == aggregation_pipeline
+        )
+
+    assert utils_beanie.build_lookup_stages(
+        utils_beanie.prepare_lookup_attribute(("unique", SampleDoc))
+    )[0]["$lookup"]["pipeline"][-1] != {"$limit": 1}
+    assert utils_beanie.build_lookup_stages(
+        utils_beanie.prepare_lookup_attribute(
+            {
+                "lookup_from": "unique",
+                "lookup_local_field": "unique_pid",
+                "lookup_foreign_field": "pid",
+                "lookup_as": "unique_obj",
+                "projection_model": SampleDoc,
+                "to_one": True,
+            }
+        )
+    )[0]["$lookup"]["pipeline"][-1] == {"$limit": 1}
+
+
+@pytest.mark.asyncio
+async def test_prune_count_pipeline_drops_unread_joins(utils_beanie):
+    pruned = utils_beanie.prune_count_pipeline(
+        [
+            {"$match": {"pid": 1}},
+            LOOKUP,
+            UNWIND,
+            PROJECT,
+            {"$match": {"value": 1}},
+            {"$count": "count"},
+        ]
+    )
+    assert pruned == [
+        {"$match": {"pid": 1}},
+        {"$match": {"value": 1}},
+        {"$count": "count"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_prune_count_pipeline_keeps_joins_read_by_filter(utils_beanie):
+    aggregation_pipeline = [
+        LOOKUP,
+        {"$unwind": "$unique_obj"},
+        PROJECT,
+        {"$match": {"unique_obj.name": "x"}},
+        {"$count": "count"},
+    ]
+    assert utils_beanie.prune_count_pipeline(aggregation_pipeline) == [
+        LOOKUP,
+        {"$unwind": "$unique_obj"},
+        {"$match": {"unique_obj.name": "x"}},
+        {"$count": "count"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_prune_count_pipeline_keeps_stages_that_change_the_count(utils_beanie):
+    to_many_lookup = {
+        "$lookup": {**LOOKUP["$lookup"], "pipeline": [{"$project": {"_id": 0, "name": 1}}]}
+    }
+    for aggregation_pipeline in (
+        [to_many_lookup, UNWIND, {"$match": {"value": 1}}, {"$count": "count"}],
+        [{"$project": {"x": "$y"}}, {"$match": {"c": None}}, {"$count": "count"}],
+    ):
+        assert utils_beanie.prune_count_pipeline(aggregation_pipeline) == aggregation_pipeline
+
+
+@pytest.mark.asyncio
+async def test_optimizer_prints_diff(utils_beanie, capsys):
+    utils_beanie.optimize_aggregation_pipeline(
+        [{"$match": {"value": 1}}, {"$match": {}}],
+        print_diff=True,
+    )
+    assert '-{"$match": {}}' in capsys.readouterr().out
+
+
+@pytest.mark.asyncio
+async def test_fetch_by_aggregation_pipeline_result_is_unchanged_by_optimizer(utils_beanie):
+    for i in range(7000, 7005):
+        await SampleDoc(pid=i, name=f"Optimizer {i}", value=7007).insert()
+
+    kwargs = dict(
+        aggregation_pipeline=[LOOKUP, UNWIND, PROJECT],
+        last_filter={"value": 7007, "pid": {"$gte": 7002}},
+        sort={"pid": -1},
+        current_page=1,
+        page_size=2,
+    )
+
+    optimized = await utils_beanie.fetch_by_aggregation_pipeline(**kwargs)
+
+    utils_beanie.optimize_aggregation_pipelines = False
+    try:
+        not_optimized = await utils_beanie.fetch_by_aggregation_pipeline(**kwargs)
+    finally:
+        utils_beanie.optimize_aggregation_pipelines = True
+
+    assert optimized == not_optimized
+    assert [i["pid"] for i in optimized] == [7004, 7003]
+
+
+@pytest.mark.asyncio
+async def test_fetch_with_pagination_count_is_unchanged_by_pruning(utils_beanie):
+    for i in range(7100, 7110):
+        await SampleDoc(pid=i, name=f"Pruning {i}", value=7117).insert()
+
+    kwargs = dict(
+        aggregation_pipeline=[LOOKUP, UNWIND, PROJECT],
+        last_filter={"value": 7117, "pid": {"$lt": 7107}},
+        sort={"pid": 1},
+        current_page=2,
+        page_size=3,
+    )
+
+    pruned = await utils_beanie.fetch_by_aggregation_pipeline_with_pagination(**kwargs)
+
+    utils_beanie.optimize_aggregation_pipelines = False
+    try:
+        not_pruned = await utils_beanie.fetch_by_aggregation_pipeline_with_pagination(**kwargs)
+    finally:
+        utils_beanie.optimize_aggregation_pipelines = True
+
+    assert pruned == not_pruned
+    assert pruned["pagination"]["total"] == 7
@@ -0,0 +1,91 @@
+import copy
+
+import pytest
+from pydantic import BaseModel
+from tests.fixtures import initialize_beanie, utils_beanie, utils_beanie_unique_pid
+
+
+class NameProjection(BaseModel):
+    name: str
+
+
+ATTRIBUTES = (
+    ("category", NameProjection),
+    {
+        "lookup_from": "sample_doc_with_unique_pid",
+        "lookup_local_field": "pid",
+        "lookup_foreign_field": "pid",
+        "lookup_as": "unique_obj",
+        "projection_model": NameProjection,
+        "unwind": False,
+    },
+)
+
+
+@pytest.mark.asyncio
+async def test_build_aggregation_pipeline_shares_read_only_stages(utils_beanie):
+    pipeline = utils_beanie.build_aggregation_pipeline(
+        attributes=ATTRIBUTES,
+        final_projection={"_id": 0, "name": 1, "unique_obj": 1},
+    )
+    same_pipeline = utils_beanie.build_aggregation_pipeline(
+        attributes=copy.deepcopy(ATTRIBUTES),
+        final_projection={"_id": 0, "name": 1, "unique_obj": 1},
+    )
+
+    assert pipeline == same_pipeline
+    assert pipeline is not same_pipeline
+    assert all(i is j for i, j in zip(pipeline, same_pipeline))
+    assert pipeline == [
+        {
+            "$lookup": {
+                "from": "category",
+                "localField": "category_pid",
+                "foreignField": "pid",
+                "as": "category_obj",
+                "pipeline": ({"$project": {"_id": 0, "name": 1}},),
+            }
+        },
+        {"$unwind": {"path": "$category_obj", "preserveNullAndEmptyArrays": True}},
+        {
+            "$lookup": {
+                "from": "sample_doc_with_unique_pid",
+                "localField": "pid",
+                "foreignField": "pid",
+                "as": "unique_obj",
+                "pipeline": ({"$project": {"_id": 0, "name": 1}},),
+            }
+        },
+        {"$project": {"_id": 0, "name": 1, "unique_obj": 1}},
+    ]
+
+    with pytest.raises(TypeError):
+        pipeline[-1]["$project"]["pid"] = 1
+
+    stage = copy.deepcopy(pipeline[-1])
+    stage["$project"]["pid"] = 1
+    assert utils_beanie.build_aggregation_pipeline(
+        attributes=ATTRIBUTES,
+        final_projection={"_id": 0, "name": 1, "unique_obj": 1},
+    )[-1] == {"$project": {"_id": 0, "name": 1, "unique_obj": 1}}
+
+
+@pytest.mark.asyncio
+async def test_build_aggregation_pipeline_is_memoized_per_document(
+    utils_beanie,
+    utils_beanie_unique_pid,
+):
+    pipeline = utils_beanie.build_aggregation_pipeline(
+        attributes=ATTRIBUTES,
+        final_projection=NameProjection,
+    )
+    other_pipeline = utils_beanie_unique_pid.build_aggregation_pipeline(
+        attributes=ATTRIBUTES,
+        final_projection=NameProjection,
+    )
+
+    assert pipeline == other_pipeline
+    assert pipeline[0] is not other_pipeline[0]
+    assert utils_beanie.prepare_projection_fields(
+        NameProjection
+    ) is utils_beanie.prepare_projection_fields(NameProjection)
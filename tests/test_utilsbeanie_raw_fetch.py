@@ -0,0 +1,93 @@
+import pytest
+from bson.raw_bson import RawBSONDocument
+from pydantic import BaseModel
+
+from tests.sample_document import SampleDoc
+from tests.fixtures import initialize_beanie, utils_beanie
+from utilsbeanie.constant import EnumOrderBy
+
+
+class PidName(BaseModel):
+    pid: int
+    name: str
+
+
+@pytest.mark.asyncio
+async def test_fetch_list_by_filter_raw(utils_beanie):
+    await SampleDoc(pid=9870, name="Raw Test 1", value=9870).insert()
+    await SampleDoc(pid=9871, name="Raw Test 2", value=9870).insert()
+    await SampleDoc(pid=9872, name="Raw Test 3", value=9870).insert()
+
+    fetched_docs = await utils_beanie.fetch_list_by_filter(
+        {"value": 9870},
+        order_by={"pid": EnumOrderBy.DESCENDING},
+        limit=2,
+        raw=True,
+    )
+    assert [type(i) for i in fetched_docs] == [dict, dict]
+    assert [i["pid"] for i in fetched_docs] == [9872, 9871]
+    assert fetched_docs[0]["name"] == "Raw Test 3"
+    assert "_id" in fetched_docs[0]
+
+
+@pytest.mark.asyncio
+async def test_fetch_list_by_filter_raw_projection_and_lazy(utils_beanie):
+    await SampleDoc(pid=9873, name="Raw Test 4", value=9873).insert()
+
+    fetched_docs = await utils_beanie.fetch_list_by_filter(
+        {"value": 9873},
+        projection_model=PidName,
+        raw=True,
+        raw_document_class=RawBSONDocument,
+    )
+    assert len(fetched_docs) == 1
+    assert isinstance(fetched_docs[0], RawBSONDocument)
+    assert {i: fetched_docs[0][i] for i in fetched_docs[0] if i != "_id"} == {
+        "pid": 9873,
+        "name": "Raw Test 4",
+    }
+
+
+@pytest.mark.asyncio
+async def test_fetch_list_by_filter_with_pagination_raw(utils_beanie):
+    for pid in range(9874, 9879):
+        await SampleDoc(pid=pid, name=f"Raw Test {pid}", value=9874).insert()
+
+    result = await utils_beanie.fetch_list_by_filter_with_pagination(
+        {"value": 9874},
+        current_page=2,
+        page_size=2,
+        order_by={"pid": EnumOrderBy.ASCENDING},
+        raw=True,
+    )
+    assert result["pagination"] == {"total": 5, "current": 2, "page_size": 2}
+    assert [i["pid"] for i in result["data"]] == [9876, 9877]
+
+
+@pytest.mark.asyncio
+async def test_fetch_by_aggregation_pipeline_raw(utils_beanie):
+    await SampleDoc(pid=9879, name="Raw Test 9", value=9879).insert()
+    await SampleDoc(pid=9880, name="Raw Test 10", value=9879).insert()
+
+    fetched_docs = await utils_beanie.fetch_by_aggregation_pipeline(
+        first_filter={"value": 9879},
+        order_by={"pid": EnumOrderBy.ASCENDING},
+        projection_model=PidName,
+        raw=True,
+    )
+    assert [{i: j for i, j in doc.items() if i != "_id"} for doc in fetched_docs] == [
+        {"pid": 9879, "name": "Raw Test 9"},
+        {"pid": 9880, "name": "Raw Test 10"},
+    ]
+
+    result = await utils_beanie.fetch_by_aggregation_pipeline_with_pagination(
+        first_filter={"value": 9879},
+        order_by={"pid": EnumOrderBy.DESCENDING},
+        current_page=1,
+        page_size=1,
+        raw=True,
+        raw_document_class=RawBSONDocument,
+    )
+    assert result["pagination"]["total"] == 2
+    assert isinstance(result["data"][0], RawBSONDocument)
+    assert result["data"][0]["pid"] == 9880
@@ -0,0 +1,103 @@
+import pytest
+from pydantic import BaseModel
+from tests.sample_document import SampleDoc, SampleDocWithUniquePid
+from tests.fixtures import initialize_beanie, utils_beanie
+from utilsbeanie.constant import EnumReferenceConsistency
+
+
+class UniqueProjection(BaseModel):
+    name: str
+
+
+ATTRIBUTES = (
+    {
+        "lookup_from": "sample_doc_with_unique_pid",
+        "lookup_local_field": "pid",
+        "lookup_foreign_field": "pid",
+        "lookup_as": "unique_obj",
+        "projection_model": UniqueProjection,
+        "to_one": True,
+    },
+)
+FINAL_PROJECTION = {"_id": 0, "pid": 1, "unique_obj": 1}
+
+
+async def insert_sample_docs(start: int, value: int) -> None:
+    for i in range(start, start + 4):
+        await SampleDoc(pid=i, name=f"Reference {i}", value=value).insert()
+        if i % 2:
+            await SampleDocWithUniquePid(pid=i, name=f"Unique {i}", value=value).insert()
+
+
+async def fetch_joined(utils_beanie, value: int) -> list:
+    return await utils_beanie.fetch_by_application_join(
+        attributes=ATTRIBUTES,
+        final_projection=FINAL_PROJECTION,
+        first_filter={"value": value},
+        sort={"pid": 1},
+    )
+
+
+@pytest.mark.asyncio
+async def test_application_join_resolves_from_reference_cache(utils_beanie):
+    await insert_sample_docs(start=8200, value=8208)
+    expected = await fetch_joined(utils_beanie, value=8208)
+
+    utils_beanie.register_reference_collection("sample_doc_with_unique_pid")
+    try:
+        assert await fetch_joined(utils_beanie, value=8208) == expected
+        assert await fetch_joined(utils_beanie, value=8208) == expected
+
+        stats = utils_beanie.get_reference_cache_stats()["sample_doc_with_unique_pid"]
+        assert stats["is_loaded"]
+        assert stats["loads"] == 1
+        assert stats["hits"] == 2
+        assert stats["number_of_objs"] >= 2
+    finally:
+        utils_beanie.unregister_reference_collection("sample_doc_with_unique_pid")
+
+    assert expected == [
+        {"pid": 8200},
+        {"pid": 8201, "unique_obj": {"name": "Unique 8201"}},
+        {"pid": 8202},
+        {"pid": 8203, "unique_obj": {"name": "Unique 8203"}},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_reference_cache_version_mode_reloads_after_insert(utils_beanie):
+    await insert_sample_docs(start=8300, value=8308)
+    utils_beanie.register_reference_collection(
+        "sample_doc_with_unique_pid",
+        consistency_mode=EnumReferenceConsistency.VERSION,
+    )
+    try:
+        result = await fetch_joined(utils_beanie, value=8308)
+        assert "unique_obj" not in result[0]
+
+        await SampleDocWithUniquePid(pid=8300, name="Unique 8300", value=8308).insert()
+
+        result = await fetch_joined(utils_beanie, value=8308)
+        assert result[0] == {"pid": 8300, "unique_obj": {"name": "Unique 8300"}}
+
+        stats = utils_beanie.get_reference_cache_stats()["sample_doc_with_unique_pid"]
+        assert stats["loads"] == 2
+    finally:
+        utils_beanie.unregister_reference_collection("sample_doc_with_unique_pid")
+
+
+@pytest.mark.asyncio
+async def test_reference_cache_over_budget_falls_back_to_queries(utils_beanie):
+    await insert_sample_docs(start=8400, value=8408)
+    expected = await fetch_joined(utils_beanie, value=8408)
+
+    utils_beanie.register_reference_collection("sample_doc_with_unique_pid", max_bytes=1)
+    try:
+        assert await fetch_joined(utils_beanie, value=8408) == expected
+
+        stats = utils_beanie.get_reference_cache_stats()["sample_doc_with_unique_pid"]
+        assert not stats["is_loaded"]
+        assert stats["rejected_loads"] == 1
+        assert stats["fallbacks"] == 1
+    finally:
+        utils_beanie.unregister_reference_collection("sample_doc_with_unique_pid")
@@ -0,0 +1,118 @@
+from datetime import datetime
+
+import pytest
+from tests.sample_document import SampleDoc
+from tests.fixtures import initialize_beanie, utils_beanie_date_trunc
+
+METRICS = {"total": ("sum", "value"), "average": ("avg", "value")}
+
+
+def register_daily_rollup(utils_beanie) -> None:
+    utils_beanie.register_rollup(
+        name="daily",
+        time_field="created_at",
+        time_bucket="_by_year_month_day",
+        group_by_on=("name",),
+        metrics=METRICS,
+        max_staleness=0,
+        lag=0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_find_covering_rollup(utils_beanie_date_trunc):
+    register_daily_rollup(utils_beanie_date_trunc)
+
+    def find(group_by_on, first_filter=None, metrics=None):
+        return utils_beanie_date_trunc.find_covering_rollup(
+            aggregation_pipeline=[],
+            first_filter=first_filter,
+            middle_filter={},
+            group_by_on=group_by_on,
+            metrics=metrics,
+        )
+
+    # midnight in Tehran (+03:30)
+    day_start = datetime(2024, 5, 1, 20, 30)
+    assert find(
+        ["name", "created_at_by_year_month"],
+        {"$or": [{"created_at": {"$gte": day_start}}]},
+        {"total": ("sum", "value")},
+    )["name"] == "daily"
+    assert find(["created_at_by_week"])["name"] == "daily"
+    assert find(["created_at_by_day"])["name"] == "daily"
+
+    assert find(["name"], {"created_at": {"$gte": datetime(2024, 5, 1)}}) is None
+    assert find(["name"], {"created_at": {"$lte": day_start}}) is None
+    assert find(["name"], {"value": 1}) is None
+    assert find(["created_at_by_hour"]) is None
+    assert find(["value"]) is None
+    assert find(["name"], metrics={"p_values": ("distinct", "value")}) is None
+
+    with pytest.raises(ValueError):
+        utils_beanie_date_trunc.register_rollup(
+            name="distinct",
+            time_field="created_at",
+            metrics={"p_values": ("distinct", "value")},
+        )
+
+
+@pytest.mark.asyncio
+async def test_truncate_datetime(utils_beanie_date_trunc):
+    value = datetime(2024, 5, 2, 1, 15, 30)
+    assert utils_beanie_date_trunc.truncate_datetime(value, "hour") == datetime(2024, 5, 2, 1)
+    assert utils_beanie_date_trunc.truncate_datetime(value, "day", "Asia/Tehran") == datetime(
+        2024, 5, 1, 20, 30
+    )
+    # Thursday -> Monday
+    assert utils_beanie_date_trunc.truncate_datetime(value, "week") == datetime(2024, 4, 29)
+    assert utils_beanie_date_trunc.truncate_datetime(value, "quarter", "+01:00") == datetime(
+        2024, 3, 31, 23
+    )
+
+
+@pytest.mark.asyncio
+async def test_group_by_from_rollup_matches_raw_documents(utils_beanie_date_trunc):
+    register_daily_rollup(utils_beanie_date_trunc)
+    collection = SampleDoc.get_motor_collection()
+    await collection.insert_many(
+        [
+            {"pid": 9301, "name": "Rollup A", "value": 1, "created_at": datetime(2024, 5, 1, 10)},
+            {"pid": 9302, "name": "Rollup A", "value": 2, "created_at": datetime(2024, 5, 1, 22)},
+            {"pid": 9303, "name": "Rollup B", "value": 4, "created_at": datetime(2024, 5, 9, 10)},
+        ]
+    )
+
+    async def fetch(use_rollups: bool) -> dict:
+        utils_beanie_date_trunc.use_rollups = use_rollups
+        try:
+            return await utils_beanie_date_trunc.fetch_by_group_by_aggregation_pipeline_with_pagination(
+                aggregation=[],
+                inputs={"name": ["Rollup"]},
+                fields_names_for_regex=("name",),
+                group_by_on=["name", "created_at_by_week"],
+                metrics=METRICS,
+                sort={"_id": 1},
+            )
+        finally:
+            utils_beanie_date_trunc.use_rollups = True
+
+    result = await fetch(use_rollups=True)
+    assert result == await fetch(use_rollups=False)
+    assert result["pagination"]["total"] == 2
+
+    # a late document, for a week that was already rolled up
+    await collection.insert_one(
+        {"pid": 9304, "name": "Rollup A", "value": 6, "created_at": datetime(2024, 4, 30)}
+    )
+    result = await fetch(use_rollups=True)
+    assert result == await fetch(use_rollups=False)
+    assert result["data"][0]["count"] == 3
+    assert result["data"][0]["average"] == 3
+
+    # a deleted document leaves its bucket without documents
+    await collection.delete_one({"pid": 9303})
+    await utils_beanie_date_trunc.refresh_rollup("daily", since=datetime(2024, 5, 9))
+    result = await fetch(use_rollups=True)
+    assert result == await fetch(use_rollups=False)
+    assert result["pagination"]["total"] == 1
@@ -0,0 +1,126 @@
+import pytest
+from tests.sample_document import SampleDocForSearch, SampleDocWithSearchTokens
+from tests.fixtures import (
+    initialize_beanie,
+    utils_beanie_search_tokens,
+    utils_beanie_search_tokens_field,
+)
+
+
+async def fetch_raw(doc_id):
+    return await SampleDocForSearch.get_motor_collection().find_one({"_id": doc_id})
+
+
+@pytest.mark.asyncio
+async def test_insert_keeps_search_tokens(utils_beanie_search_tokens):
+    doc = await utils_beanie_search_tokens.insert_one_without_pid(
+        {"pid": 1000, "name": "Café Token", "title": "Big-Report"}
+    )
+
+    raw = await fetch_raw(doc.id)
+    assert raw["_search_tokens"] == sorted(
+        {"ca", "caf", "cafe", "to", "tok", "toke", "token",
+         "bi", "big", "re", "rep", "repo", "repor", "report"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_update_no_return_refreshes_search_tokens(utils_beanie_search_tokens):
+    doc = await utils_beanie_search_tokens.insert_one_without_pid(
+        {"pid": 1001, "name": "Before Token", "title": "Kept"}
+    )
+
+    await utils_beanie_search_tokens.update_list_by_filter_no_return(
+        {"pid": 1001}, {"name": "Afterwards"}
+    )
+
+    raw = await fetch_raw(doc.id)
+    assert "afterwards" in raw["_search_tokens"]
+    assert "before" not in raw["_search_tokens"]
+    assert "kept" in raw["_search_tokens"]
+
+
+@pytest.mark.asyncio
+async def test_update_with_return_refreshes_search_tokens(utils_beanie_search_tokens):
+    doc = await utils_beanie_search_tokens.insert_one_without_pid(
+        {"pid": 1002, "name": "Replaced Token", "title": "Old"}
+    )
+
+    await utils_beanie_search_tokens.update_one_by_id_with_return(
+        doc.id, {"title": "Newer"}
+    )
+
+    raw = await fetch_raw(doc.id)
+    assert "newer" in raw["_search_tokens"]
+    assert "old" not in raw["_search_tokens"]
+
+
+@pytest.mark.asyncio
+async def test_search_inputs_compile_to_search_tokens(utils_beanie_search_tokens):
+    await utils_beanie_search_tokens.insert_one_without_pid(
+        {"pid": 1003, "name": "Quarterly Zebra", "title": "Xylophone"}
+    )
+
+    filter_ = utils_beanie_search_tokens.prepare_filter(
+        inputs={"search": ["ZEB xylo"]},
+        search_field_name="search",
+        fields_names_for_search=("name", "title"),
+    )
+    assert filter_ == {"_search_tokens": {"$all": ["zeb", "xylo"]}}
+
+    fetched_docs = await utils_beanie_search_tokens.fetch_list_by_filter(filter_)
+    assert [doc.pid for doc in fetched_docs] == [1003]
+
+
+@pytest.mark.asyncio
+async def test_backfill_search_tokens(utils_beanie_search_tokens):
+    doc = await SampleDocForSearch(pid=1004, name="Legacy Walrus", title="t").insert()
+    assert "_search_tokens" not in await fetch_raw(doc.id)
+
+    number_of_updated = await utils_beanie_search_tokens.backfill_search_tokens(
+        filter_={"pid": 1004},
+        batch_size=1,
+    )
+    assert number_of_updated == 1
+
+    raw = await fetch_raw(doc.id)
+    assert "walrus" in raw["_search_tokens"]
+
+
+@pytest.mark.asyncio
+async def test_update_many_with_search_tokens_in_batches(utils_beanie_search_tokens):
+    for i in range(1005, 1010):
+        await utils_beanie_search_tokens.insert_one_without_pid(
+            {"pid": i, "name": "Batched Token", "title": "Before"}
+        )
+
+    update_result = await utils_beanie_search_tokens.update_many_with_search_tokens(
+        filter_={"pid": {"$gte": 1005, "$lt": 1010}},
+        update={"$set": {"title": "Afterwards"}},
+        batch_size=2,
+    )
+    assert update_result.matched_count == 5
+
+    async for raw in SampleDocForSearch.get_motor_collection().find(
+        {"pid": {"$gte": 1005, "$lt": 1010}}
+    ):
+        assert "afterwards" in raw["_search_tokens"]
+        assert "before" not in raw["_search_tokens"]
+
+
+@pytest.mark.asyncio
+async def test_search_tokens_on_a_model_declaring_them(utils_beanie_search_tokens_field):
+    doc = await utils_beanie_search_tokens_field.insert_one_without_pid(
+        {"pid": 1010, "name": "Declared Token", "title": "Before"}
+    )
+    assert "declared" in doc.search_tokens
+
+    collection = SampleDocWithSearchTokens.get_motor_collection()
+    assert (await collection.find_one({"_id": doc.id}))["_search_tokens"] == doc.search_tokens
+
+    doc = await utils_beanie_search_tokens_field.update_one_by_id_with_return(
+        doc.id, {"title": "Afterwards"}
+    )
+    raw = await collection.find_one({"_id": doc.id})
+    assert "afterwards" in raw["_search_tokens"]
+    assert "before" not in raw["_search_tokens"]
@@ -0,0 +1,90 @@
+import json
+from datetime import datetime
+
+import pytest
+from bson import Decimal128, ObjectId
+
+from tests.sample_document import SampleDoc
+from tests.fixtures import initialize_beanie, utils_beanie
+from utilsbeanie.constant import EnumOrderBy
+
+
+class BytesWriter:
+    def __init__(self):
+        self.chunks = list()
+
+    async def write(self, chunk: bytes) -> None:
+        self.chunks.append(chunk)
+
+
+@pytest.mark.asyncio
+async def test_stream_list_by_filter_json(utils_beanie):
+    for pid in range(9890, 9895):
+        await SampleDoc(pid=pid, name=f"Stream Test {pid}", value=9890).insert()
+
+    writer = BytesWriter()
+    count = await utils_beanie.stream_list_by_filter(
+        writer,
+        {"value": 9890},
+        order_by={"pid": EnumOrderBy.ASCENDING},
+        chunk_size=100,
+    )
+    assert count == 5
+    assert len(writer.chunks) > 1
+
+    result = json.loads(b"".join(writer.chunks))
+    assert [i["pid"] for i in result] == list(range(9890, 9895))
+    assert all(isinstance(i["_id"], str) for i in result)
+
+
+@pytest.mark.asyncio
+async def test_stream_by_aggregation_pipeline_json_lines(utils_beanie):
+    for pid in range(9895, 9898):
+        await SampleDoc(pid=pid, name=f"Stream Test {pid}", value=9895).insert()
+
+    writer = BytesWriter()
+    count = await utils_beanie.stream_by_aggregation_pipeline(
+        writer,
+        first_filter={"value": 9895},
+        order_by={"pid": EnumOrderBy.DESCENDING},
+        limit=2,
+        json_lines=True,
+    )
+    assert count == 2
+
+    lines = b"".join(writer.chunks).splitlines()
+    assert [json.loads(i)["pid"] for i in lines] == [9897, 9896]
+
+
+@pytest.mark.asyncio
+async def test_write_json_bson_types(utils_beanie):
+    writer = BytesWriter()
+    count = await utils_beanie.write_json(
+        writer,
+        [
+            {
+                "id": ObjectId("64b0c1f4f1a4f5c8b0d5e6f7"),
+                "at": datetime(2024, 1, 2, 3, 4, 5),
+                "amount": Decimal128("1.10"),
+            }
+        ],
+    )
+    assert count == 1
+    assert json.loads(b"".join(writer.chunks)) == [
+        {
+            "id": "64b0c1f4f1a4f5c8b0d5e6f7",
+            "at": "2024-01-02T03:04:05+00:00",
+            "amount": "1.10",
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_write_json_empty(utils_beanie):
+    writer = BytesWriter()
+    assert await utils_beanie.write_json(writer, []) == 0
+    assert b"".join(writer.chunks) == b"[]"
+
+    writer = BytesWriter()
+    assert await utils_beanie.write_json(writer, [], json_lines=True) == 0
+    assert b"".join(writer.chunks) == b""
@@ -0,0 +1,53 @@
+import pytest
+from tests.sample_document import SampleDocForSearch
+from tests.fixtures import initialize_beanie, utils_beanie_text_search
+from utilsbeanie.constant import TEXT_SCORE
+
+
+@pytest.mark.asyncio
+async def test_ensure_text_index(utils_beanie_text_search):
+    await utils_beanie_text_search.ensure_text_index(("name", "title"))
+    assert await utils_beanie_text_search.verify_text_index(("title", "name"))
+    assert not await utils_beanie_text_search.verify_text_index(("name",))
+
+    # only one text index is allowed per collection
+    with pytest.raises(ValueError):
+        await utils_beanie_text_search.ensure_text_index(("name",))
+
+
+@pytest.mark.asyncio
+async def test_prepare_filter_for_aggregation_puts_text_search_in_first_filter(utils_beanie_text_search):
+    first_filter, last_filter = utils_beanie_text_search.prepare_filter_for_aggregation(
+        inputs={"search": ["narwhal tusk"], "related__name": ["x"]},
+        search_field_name="search",
+        fields_names_for_regex=("related.name",),
+        fields_names_for_search=("name", "title"),
+    )
+    assert first_filter == {"$text": {"$search": '"narwhal" "tusk"'}}
+    assert last_filter == {"$or": [{"related.name": {"$regex": "x"}}]}
+
+
+@pytest.mark.asyncio
+async def test_fetch_by_aggregation_pipeline_ordered_by_text_score(utils_beanie_text_search):
+    await utils_beanie_text_search.ensure_text_index(("name", "title"))
+    await SampleDocForSearch(pid=2000, name="Narwhal", title="Other").insert()
+    await SampleDocForSearch(pid=2001, name="Narwhal", title="Narwhal Narwhal").insert()
+    await SampleDocForSearch(pid=2002, name="Walrus", title="Other").insert()
+
+    first_filter, last_filter = utils_beanie_text_search.prepare_filter_for_aggregation(
+        inputs={"search": ["NARWHAL"]},
+        search_field_name="search",
+        fields_names_for_search=("name", "title"),
+    )
+    result = await utils_beanie_text_search.fetch_by_aggregation_pipeline(
+        aggregation_pipeline=utils_beanie_text_search.build_aggregation_pipeline(
+            attributes=None,
+            final_projection={"_id": 0, "pid": 1},
+        ),
+        first_filter=first_filter,
+        last_filter=last_filter,
+        order_by={TEXT_SCORE: "D"},
+        current_page=1,
+        page_size=10,
+    )
+    assert [i["pid"] for i in result] == [2001, 2000]
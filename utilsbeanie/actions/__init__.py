@@ -1,9 +1,24 @@
 from .delete_mixin import DeleteMixin
+from .distinct_values_mixin import DistinctValuesMixin
 from .exist_mixin import ExistMixin
 from .fetch_by_aggregation_pipeline_mixin import FetchByAggregationPipelineMixin
 from .fetch_by_group_by_aggregation_pipeline_mixin import FetchByGroupByAggregationPipelineMixin
+from .fetch_by_approximate_group_by_mixin import FetchByApproximateGroupByMixin
+from .fetch_by_application_join_mixin import FetchByApplicationJoinMixin
+from .fetch_by_planned_join_mixin import FetchByPlannedJoinMixin
+from .fetch_columns_mixin import FetchColumnsMixin
+from .fetch_facet_counts_mixin import FetchFacetCountsMixin
 from .fetch_simple_mixin import FetchSimpleMixin
+from .group_by_cache_mixin import GroupByCacheMixin
 from .insert_mixin import InsertMixin
+from .migration_mixin import MigrationMixin
+from .parallel_scan_mixin import ParallelScanMixin
+from .partition_mixin import PartitionMixin
+from .reference_cache_mixin import ReferenceCacheMixin
+from .rollup_mixin import RollupMixin
+from .search_token_mixin import SearchTokenMixin
+from .stream_json_mixin import StreamJsonMixin
+from .text_search_mixin import TextSearchMixin
 from .update_by_obj_mixin import UpdateByObjMixin
 from .update_no_return_mixin import UpdateNoReturnMixin
 from .update_with_return_mixin import UpdateWithReturnMixin
\ No newline at end of file
@@ -1,6 +1,10 @@
+from datetime import datetime
 from typing import (
     Generic,
     Dict,
+    List,
+    Tuple,
+    Optional,
     Protocol,
     runtime_checkable,
     TypeVar,
@@ -16,6 +20,17 @@ from beanie import (
 class DeleteMixinProtocol(Protocol):
     document: Document
 
+    async def fetch_group_by_buckets_times(
+        self,
+        filter_: Dict,
+        inputs_list: Optional[List[Dict]] = None,
+    ) -> List[Tuple[str, datetime, datetime]]: ...
+
+    def invalidate_group_by_buckets_by_times(
+        self,
+        times: List[Tuple[str, datetime, datetime]],
+    ) -> int: ...
+
 
 T = TypeVar("T", bound=DeleteMixinProtocol)
 
@@ -25,22 +40,34 @@ class DeleteMixin(Generic[T]):
         self: T,
         filter_: Dict,
     ) -> None:
-        return await self.document.find(filter_).delete()
+        times = await self.fetch_group_by_buckets_times(filter_)
+        result = await self.document.find(filter_).delete()
+        self.invalidate_group_by_buckets_by_times(times)
+        return result
 
     async def delete_one_by_filter(
         self: T,
         filter_: Dict,
     ) -> None:
-        return await self.document.find_one(filter_).delete()
+        times = await self.fetch_group_by_buckets_times(filter_)
+        result = await self.document.find_one(filter_).delete()
+        self.invalidate_group_by_buckets_by_times(times)
+        return result
 
     async def delete_one_by_id(
         self: T,
         id_: PydanticObjectId,
     ) -> None:
-        return await self.document.find_one({"_id": id_}).delete()
+        times = await self.fetch_group_by_buckets_times({"_id": id_})
+        result = await self.document.find_one({"_id": id_}).delete()
+        self.invalidate_group_by_buckets_by_times(times)
+        return result
 
     async def delete_one_by_pid(
         self: T,
         pid: str,
     ) -> None:
-        return await self.document.find_one({"pid": pid}).delete()
+        times = await self.fetch_group_by_buckets_times({"pid": pid})
+        result = await self.document.find_one({"pid": pid}).delete()
+        self.invalidate_group_by_buckets_by_times(times)
+        return result
@@ -0,0 +1,223 @@
+from asyncio import Lock
+from re import escape
+from time import monotonic
+from typing import (
+    Any,
+    List,
+    Dict,
+    Type,
+    Mapping,
+    Optional,
+    Generic,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+)
+
+from beanie import Document
+
+from ..utility.aggregation_mixin import make_hashable
+
+@runtime_checkable
+class DistinctValuesMixinProtocol(Protocol):
+    document: Type[Document]
+    field_separator: str = "__"
+    distinct_values_max_cardinality: int = 1000
+    distinct_values_reconcile_interval: float = 600
+    distinct_values_catalogs: Dict[tuple, Dict[str, Any]]
+    partition_field_name: str | None = None
+
+    @staticmethod
+    def get_value_by_path(obj: Dict, path: str) -> Any: ...
+
+    @staticmethod
+    def _as_list(value: Any) -> List[Any]: ...
+
+    @classmethod
+    def _prepare_sort_key(cls, value: Any) -> tuple: ...
+
+    async def fetch_partition_names_by_filter(self, filter_: Dict | None) -> List[str]: ...
+
+    async def aggregate_partitions(
+        self,
+        names: List[str],
+        first_filter: Dict | None = None,
+        branch_pipeline: Optional[List[Dict]] = None,
+        aggregation_pipeline: Optional[List[Dict]] = None,
+        raw_document_class: Type[Mapping] = dict,
+        **pymongo_kwargs,
+    ) -> List[Mapping]: ...
+
+
+T = TypeVar("T", bound=DistinctValuesMixinProtocol)
+
+
+class DistinctValuesMixin(Generic[T]):
+    """
+    Distinct values of a field (e.g. for the dropdowns of `fields_names_for_in`)
+    kept in memory per (document, field) once fetched, in
+    `distinct_values_catalogs`. Inserts and updates through `UtilsBeanie`
+    objects sharing it add their values; values that disappear (updates
+    away from them, deletes) are dropped by the reconciliation every
+    `distinct_values_reconcile_interval` seconds. A field with more than
+    `distinct_values_max_cardinality` values is not kept but searched by prefix.
+    """
+
+    async def fetch_distinct_values(
+        self: T,
+        field_name: str,
+        prefix: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        `{"values": [...], "is_prefix_mode": bool}`, values sorted like
+        MongoDB sorts them; with `prefix`, only strings starting with it.
+        In prefix mode at most `limit` (or the maximum cardinality) values are
+        read from the collection.
+        """
+        field_name = field_name.replace(self.field_separator, ".")
+        key = (self.document, field_name)
+        catalog = self.distinct_values_catalogs.get(key)
+        if catalog is None:
+            catalog = {
+                "document": self.document,
+                "field_name": field_name,
+                "max_cardinality": self.distinct_values_max_cardinality,
+                "reconcile_interval": self.distinct_values_reconcile_interval,
+                "lock": Lock(),
+                "values": None,
+                "is_prefix_mode": False,
+                "reconciled_at": None,
+            }
+            self.distinct_values_catalogs[key] = catalog
+
+        async with catalog["lock"]:
+            if (
+                catalog["reconciled_at"] is None
+                or monotonic() - catalog["reconciled_at"] >= catalog["reconcile_interval"]
+            ):
+                await self.reconcile_distinct_values(field_name)
+
+        if catalog["is_prefix_mode"]:
+            values = await self.fetch_distinct_values_by_prefix(
+                field_name=field_name,
+                prefix=prefix,
+                limit=limit or catalog["max_cardinality"],
+            )
+
+        else:
+            values = sorted(catalog["values"].values(), key=self._prepare_sort_key)
+            if prefix is not None:
+                values = [i for i in values if isinstance(i, str) and i.startswith(prefix)]
+            if limit:
+                values = values[:limit]
+
+        return {"values": values, "is_prefix_mode": catalog["is_prefix_mode"]}
+
+    async def fetch_distinct_values_by_prefix(
+        self: T,
+        field_name: str,
+        prefix: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Any]:
+        field_name = field_name.replace(self.field_separator, ".")
+        aggregation_pipeline = list()
+        if prefix is not None:
+            # anchored, so an index on the field is read as a range
+            aggregation_pipeline.append(
+                {"$match": {field_name: {"$regex": f"^{escape(prefix)}"}}}
+            )
+
+        aggregation_pipeline.extend(
+            [
+                {"$unwind": f"${field_name}"},
+                {"$group": {"_id": f"${field_name}"}},
+                {"$sort": {"_id": 1}},
+            ]
+        )
+        if limit:
+            aggregation_pipeline.append({"$limit": limit})
+
+        return [
+            i["_id"]
+            for i in await self._aggregate_distinct_values(aggregation_pipeline)
+            if prefix is None or (isinstance(i["_id"], str) and i["_id"].startswith(prefix))
+        ]
+
+    async def reconcile_distinct_values(self: T, field_name: str) -> bool:
+        """Reload the catalog of `field_name` from the collection; False when it switched to prefix mode."""
+        field_name = field_name.replace(self.field_separator, ".")
+        catalog = self.distinct_values_catalogs[(self.document, field_name)]
+
+        values = await self._aggregate_distinct_values(
+            [
+                {"$unwind": f"${field_name}"},
+                {"$group": {"_id": f"${field_name}"}},
+                {"$limit": catalog["max_cardinality"] + 1},
+            ]
+        )
+
+        catalog["reconciled_at"] = monotonic()
+        if len(values) > catalog["max_cardinality"]:
+            catalog["values"] = None
+            catalog["is_prefix_mode"] = True
+            return False
+
+        catalog["values"] = {make_hashable(i["_id"]): i["_id"] for i in values}
+        catalog["is_prefix_mode"] = False
+        return True
+
+    def add_distinct_values_by_objs(self: T, objs: List[Document]) -> None:
+        catalogs = self._get_distinct_values_catalogs()
+        if not catalogs:
+            return
+
+        objs_values = [obj.model_dump(by_alias=True) for obj in objs]
+        for catalog in catalogs:
+            for values in objs_values:
+                self._add_distinct_values(
+                    catalog,
+                    self.get_value_by_path(values, catalog["field_name"]),
+                )
+
+    def add_distinct_values_by_inputs(self: T, inputs: Dict) -> None:
+        """For updates that `$set` `inputs` without reading the documents back."""
+        for catalog in self._get_distinct_values_catalogs():
+            field_name = catalog["field_name"]
+            if field_name in inputs:
+                self._add_distinct_values(catalog, inputs[field_name])
+            else:
+                self._add_distinct_values(catalog, self.get_value_by_path(inputs, field_name))
+
+    async def _aggregate_distinct_values(self: T, aggregation_pipeline: List[Dict]) -> List[Mapping]:
+        """`aggregation_pipeline` over the collection, or over every partition when partitioned."""
+        if self.partition_field_name is not None:
+            return await self.aggregate_partitions(
+                await self.fetch_partition_names_by_filter(None),
+                aggregation_pipeline=aggregation_pipeline,
+            )
+
+        return await self.document.get_motor_collection().aggregate(
+            aggregation_pipeline
+        ).to_list(length=None)
+
+    def _get_distinct_values_catalogs(self: T) -> List[Dict[str, Any]]:
+        return [
+            i
+            for i in self.distinct_values_catalogs.values()
+            if i["document"] is self.document and i["values"] is not None
+        ]
+
+    def _add_distinct_values(self: T, catalog: Dict[str, Any], value: Any) -> None:
+        if value is None or catalog["values"] is None:
+            return
+
+        for i in self._as_list(value):
+            try:
+                catalog["values"].setdefault(make_hashable(i), i)
+            except TypeError:
+                continue
+
+        if len(catalog["values"]) > catalog["max_cardinality"]:
+            catalog["values"] = None
+            catalog["is_prefix_mode"] = True
@@ -1,5 +1,6 @@
 from typing import (
     List,
+    Mapping,
     Dict,
     Type,
     Optional,
@@ -14,6 +15,7 @@ from beanie import (
     SortDirection,
 )
 
+from beanie.odm.utils.projection import get_projection
 from pydantic import BaseModel
 
 from ..constant import EnumOrderBy
@@ -21,6 +23,10 @@ from ..constant import EnumOrderBy
 @runtime_checkable
 class FetchByAggregationPipelineMixinProtocol(Protocol):
     document: Document
+    optimize_aggregation_pipelines: bool = True
+    print_aggregation_pipeline_diff: bool = False
+    defer_lookups: bool = True
+    partition_field_name: str | None = None
 
     @staticmethod
     def convert_order_by_to_sort(
@@ -43,25 +49,64 @@ class FetchByAggregationPipelineMixinProtocol(Protocol):
         limit: Optional[int] = None,
     ) -> list[dict]: ...
 
+    @staticmethod
+    def convert_sort_for_aggregation(
+        sort: List | Dict | None = None,
+    ) -> Dict | None: ...
+
+    def optimize_aggregation_pipeline(
+        self,
+        aggregation_pipeline: List[Dict],
+        print_diff: bool = False,
+        defer_lookups: bool = False,
+    ) -> List[Dict]: ...
+
+    @classmethod
+    def prune_count_pipeline(cls, aggregation_pipeline: List[Dict]) -> List[Dict]: ...
+
+    def get_raw_collection(self, document_class: Type[Mapping] = dict): ...
+
+    async def fetch_by_aggregation_pipeline_from_partitions(
+        self,
+        aggregation_pipeline: Optional[List[Dict]] = None,
+        first_filter: dict = None,
+        last_filter: dict = None,
+        sort: dict[str, SortDirection] = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        current_page: int = None,
+        page_size: int = None,
+        raw: bool = False,
+        raw_document_class: Type[Mapping] = dict,
+        **pymongo_kwargs,
+    ) -> List[Type[BaseModel] | Mapping]: ...
+
+    async def fetch_count_from_partitions(
+        self,
+        filter_: Dict | None = None,
+        aggregation_pipeline: Optional[List[Dict]] = None,
+        **pymongo_kwargs,
+    ) -> int: ...
+
 
 T = TypeVar("T", bound=FetchByAggregationPipelineMixinProtocol)
 
 
 class FetchByAggregationPipelineMixin(Generic[T]):
-    async def fetch_by_aggregation_pipeline(
+    def prepare_aggregation_pipeline(
         self: T,
         aggregation_pipeline: Optional[List[Dict]] = None,
         first_filter: dict = None,
         last_filter: dict = None,
         sort: dict[str, SortDirection] = None,
         order_by: Dict[str, EnumOrderBy] | None = None,
-        projection_model: Optional[Type[BaseModel]] = None,
         skip: Optional[int] = None,
         limit: Optional[int] = None,
         current_page: int = None,
         page_size: int = None,
-    ) -> List[Type[BaseModel] | Dict]:
-
+    ) -> List[Dict]:
         skip_limit_list = self.prepare_skip_limit_for_aggregation(
             current_page=current_page,
             page_size=page_size,
@@ -69,7 +114,9 @@ class FetchByAggregationPipelineMixin(Generic[T]):
             limit=limit,
         )
 
-        sort = self.convert_order_by_to_sort(order_by=order_by) or sort
+        sort = self.convert_sort_for_aggregation(
+            self.convert_order_by_to_sort(order_by=order_by) or sort
+        )
 
         _aggregation_pipeline = list()
 
@@ -88,13 +135,66 @@ class FetchByAggregationPipelineMixin(Generic[T]):
         if skip_limit_list:
             _aggregation_pipeline.extend(skip_limit_list)
 
-        return (
-            await self.document.find({})
-            .aggregate(
-                aggregation_pipeline=_aggregation_pipeline,
+        if self.optimize_aggregation_pipelines:
+            _aggregation_pipeline = self.optimize_aggregation_pipeline(
+                _aggregation_pipeline,
+                print_diff=self.print_aggregation_pipeline_diff,
+                defer_lookups=self.defer_lookups,
+            )
+
+        return _aggregation_pipeline
+
+    async def fetch_by_aggregation_pipeline(
+        self: T,
+        aggregation_pipeline: Optional[List[Dict]] = None,
+        first_filter: dict = None,
+        last_filter: dict = None,
+        sort: dict[str, SortDirection] = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        current_page: int = None,
+        page_size: int = None,
+        raw: bool = False,
+        raw_document_class: Type[Mapping] = dict,
+        **pymongo_kwargs,
+    ) -> List[Type[BaseModel] | Mapping]:
+        if self.partition_field_name is not None:
+            return await self.fetch_by_aggregation_pipeline_from_partitions(
+                aggregation_pipeline=aggregation_pipeline,
+                first_filter=first_filter,
+                last_filter=last_filter,
+                sort=sort,
+                order_by=order_by,
                 projection_model=projection_model,
+                skip=skip,
+                limit=limit,
+                current_page=current_page,
+                page_size=page_size,
+                raw=raw,
+                raw_document_class=raw_document_class,
+                **pymongo_kwargs,
             )
-            .to_list()
+
+        _aggregation_pipeline = self.prepare_aggregation_pipeline(
+            aggregation_pipeline=aggregation_pipeline,
+            first_filter=first_filter,
+            last_filter=last_filter,
+            sort=sort,
+            order_by=order_by,
+            skip=skip,
+            limit=limit,
+            current_page=current_page,
+            page_size=page_size,
+        )
+
+        return await self._aggregate(
+            _aggregation_pipeline,
+            projection_model=projection_model,
+            raw=raw,
+            raw_document_class=raw_document_class,
+            **pymongo_kwargs,
         )
 
     async def fetch_by_aggregation_pipeline_with_pagination(
@@ -109,10 +209,47 @@ class FetchByAggregationPipelineMixin(Generic[T]):
         projection_model: Optional[Type[BaseModel]] = None,
         skip: Optional[int] = None,
         limit: Optional[int] = None,
+        raw: bool = False,
+        raw_document_class: Type[Mapping] = dict,
+        **pymongo_kwargs,
     ) -> Dict:
+        if self.partition_field_name is not None:
+            result = await self.fetch_by_aggregation_pipeline_from_partitions(
+                aggregation_pipeline=aggregation_pipeline,
+                first_filter=first_filter,
+                last_filter=last_filter,
+                sort=sort,
+                order_by=order_by,
+                projection_model=projection_model,
+                skip=skip,
+                limit=limit,
+                current_page=current_page,
+                page_size=page_size,
+                raw=raw,
+                raw_document_class=raw_document_class,
+                **pymongo_kwargs,
+            )
+            count = await self.fetch_count_from_partitions(
+                first_filter,
+                aggregation_pipeline=[
+                    *(aggregation_pipeline or []),
+                    *([{"$match": last_filter}] if last_filter else []),
+                ],
+                **pymongo_kwargs,
+            )
 
-
-        sort = self.convert_order_by_to_sort(order_by=order_by) or sort
+            return {
+                "pagination": {
+                    "total": count,
+                    "current": current_page,
+                    "page_size": limit or page_size or count,
+                },
+                "data": result,
+            }
+
+        sort = self.convert_sort_for_aggregation(
+            self.convert_order_by_to_sort(order_by=order_by) or sort
+        )
 
         skip_limit_list = self.prepare_skip_limit_for_aggregation(
             current_page=current_page,
@@ -144,18 +281,28 @@ class FetchByAggregationPipelineMixin(Generic[T]):
 
         _aggregation_pipeline_for_count.append({"$count": "count"})
 
-        result = (
-            await self.document.find({})
-            .aggregate(
-                aggregation_pipeline=_aggregation_pipeline_for_result,
-                projection_model=projection_model,
+        if self.optimize_aggregation_pipelines:
+            _aggregation_pipeline_for_result = self.optimize_aggregation_pipeline(
+                _aggregation_pipeline_for_result,
+                print_diff=self.print_aggregation_pipeline_diff,
+                defer_lookups=self.defer_lookups,
             )
-            .to_list()
+            _aggregation_pipeline_for_count = self.optimize_aggregation_pipeline(
+                self.prune_count_pipeline(_aggregation_pipeline_for_count),
+                print_diff=self.print_aggregation_pipeline_diff,
+            )
+
+        result = await self._aggregate(
+            _aggregation_pipeline_for_result,
+            projection_model=projection_model,
+            raw=raw,
+            raw_document_class=raw_document_class,
+            **pymongo_kwargs,
         )
 
         count = (
             await self.document.find({})
-            .aggregate(_aggregation_pipeline_for_count)
+            .aggregate(_aggregation_pipeline_for_count, **pymongo_kwargs)
             .to_list()
         )
         count = 0 if not count else count[0]["count"]
@@ -169,3 +316,44 @@ class FetchByAggregationPipelineMixin(Generic[T]):
             "data": result,
         }
 
+    async def _aggregate(
+        self: T,
+        aggregation_pipeline: List[Dict],
+        projection_model: Optional[Type[BaseModel]] = None,
+        raw: bool = False,
+        raw_document_class: Type[Mapping] = dict,
+        **pymongo_kwargs,
+    ) -> List[Type[BaseModel] | Mapping]:
+        if not raw:
+            return (
+                await self.document.find({})
+                .aggregate(
+                    aggregation_pipeline=aggregation_pipeline,
+                    projection_model=projection_model,
+                    **pymongo_kwargs,
+                )
+                .to_list()
+            )
+
+        return await self.create_raw_aggregation_cursor(
+            aggregation_pipeline,
+            projection_model=projection_model,
+            raw_document_class=raw_document_class,
+            **pymongo_kwargs,
+        ).to_list(length=None)
+
+    def create_raw_aggregation_cursor(
+        self: T,
+        aggregation_pipeline: List[Dict],
+        projection_model: Optional[Type[BaseModel]] = None,
+        raw_document_class: Type[Mapping] = dict,
+        **pymongo_kwargs,
+    ):
+        """The rows as the driver decodes them, with the projection the model would apply."""
+        projection = get_projection(projection_model) if projection_model else None
+        if projection:
+            aggregation_pipeline = [*aggregation_pipeline, {"$project": projection}]
+
+        return self.get_raw_collection(raw_document_class).aggregate(
+            aggregation_pipeline, **pymongo_kwargs
+        )
@@ -0,0 +1,337 @@
+from asyncio import gather
+from typing import (
+    Any,
+    List,
+    Dict,
+    Type,
+    Literal,
+    Optional,
+    Generic,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+)
+
+from beanie import (
+    Document,
+    SortDirection,
+)
+from pydantic import BaseModel
+
+from ..constant import EnumOrderBy
+
+
+@runtime_checkable
+class FetchByApplicationJoinMixinProtocol(Protocol):
+    document: Document
+
+    def convert_order_by_to_sort(
+        self,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+    ) -> List: ...
+
+    @staticmethod
+    def convert_sort_for_aggregation(
+        sort: List | Dict | None = None,
+    ) -> Dict | None: ...
+
+    @staticmethod
+    def prepare_skip_limit_for_aggregation(
+        current_page: Optional[int] = None,
+        page_size: Optional[int] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict]: ...
+
+    @staticmethod
+    def prepare_projection_fields(
+        projection: Type[BaseModel] | Dict[str | Literal[0, 1], Any] | None
+    ) -> Dict[str | Literal[0, 1], Any]: ...
+
+    def prepare_lookup_attribute(
+        self,
+        attribute: tuple[str, Type[BaseModel]] | dict[str, Any],
+    ) -> dict[str, Any]: ...
+
+    @staticmethod
+    def get_value_by_path(obj: Dict, path: str) -> Any: ...
+
+    async def fetch_count(self, filter_: Dict) -> int: ...
+
+    async def fetch_reference_objs(
+        self,
+        lookup: Dict[str, Any],
+        keys: List[Any],
+    ) -> Optional[Dict[Any, List[Dict]]]: ...
+
+
+T = TypeVar("T", bound=FetchByApplicationJoinMixinProtocol)
+
+
+class FetchByApplicationJoinMixin(Generic[T]):
+    """
+    The same result as `fetch_by_aggregation_pipeline(build_aggregation_pipeline(...))`
+    but the lookups run in the application: the base page is fetched first,
+    then one `$in` query per foreign collection, concurrently, and the `*_obj`
+    fields are stitched in Python. For small pages against large foreign
+    collections it avoids a `$lookup` sub-pipeline per row and lets foreign
+    reads go to secondaries (`foreign_read_preference`).
+    Filters and sort can only read base fields, and an unwound lookup must be
+    `to_one`: `$unwind` makes one row per match of a to-many lookup, which
+    only the server join does.
+    """
+
+    async def fetch_by_application_join(
+        self: T,
+        attributes: tuple[tuple[str, Type[BaseModel]], ...] | tuple[dict[str, Any], ...],
+        final_projection: Type[BaseModel] | dict[str, Literal[0, 1]] = None,
+        first_filter: dict = None,
+        sort: dict[str, SortDirection] = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        current_page: int = None,
+        page_size: int = None,
+        foreign_read_preference: Optional[Any] = None,
+        **pymongo_kwargs,
+    ) -> List[Type[BaseModel] | Dict]:
+        lookups = [self.prepare_lookup_attribute(i) for i in attributes]
+        if any(i["unwind"] and not i["to_one"] for i in lookups):
+            raise ValueError("unwound lookups joined in the application must be `to_one`")
+
+        final_projection_fields = self.prepare_projection_fields(
+            projection=final_projection
+        )
+        lookups_as = {i["lookup_as"] for i in lookups}
+        base_projection, temporary_fields_names = self._prepare_projection_with_fields(
+            projection={
+                key: value
+                for key, value in final_projection_fields.items()
+                if key.split(".")[0] not in lookups_as
+            },
+            fields_names=[i["lookup_local_field"] for i in lookups],
+            is_inclusion=self._is_inclusion_projection(final_projection_fields),
+        )
+
+        aggregation_pipeline = list()
+        if first_filter:
+            aggregation_pipeline.append({"$match": first_filter})
+
+        sort = self.convert_sort_for_aggregation(
+            self.convert_order_by_to_sort(order_by=order_by) or sort
+        )
+        if sort:
+            aggregation_pipeline.append({"$sort": sort})
+
+        aggregation_pipeline.extend(
+            self.prepare_skip_limit_for_aggregation(
+                current_page=current_page,
+                page_size=page_size,
+                skip=skip,
+                limit=limit,
+            )
+        )
+        if base_projection:
+            aggregation_pipeline.append({"$project": base_projection})
+
+        objs = (
+            await self.document.get_motor_collection()
+            .aggregate(aggregation_pipeline, **pymongo_kwargs)
+            .to_list(length=None)
+        )
+
+        if objs:
+            await self.join_in_application(
+                objs=objs,
+                lookups=lookups,
+                foreign_read_preference=foreign_read_preference,
+            )
+
+        for obj in objs:
+            for field_name in temporary_fields_names:
+                self._pop_path(obj, field_name)
+
+        if projection_model:
+            return [projection_model.model_validate(i) for i in objs]
+
+        return objs
+
+    async def fetch_by_application_join_with_pagination(
+        self: T,
+        attributes: tuple[tuple[str, Type[BaseModel]], ...] | tuple[dict[str, Any], ...],
+        final_projection: Type[BaseModel] | dict[str, Literal[0, 1]] = None,
+        first_filter: dict = None,
+        sort: dict[str, SortDirection] = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        current_page: int = 1,
+        page_size: int = 10,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        foreign_read_preference: Optional[Any] = None,
+        **pymongo_kwargs,
+    ) -> Dict:
+        result, count = await gather(
+            self.fetch_by_application_join(
+                attributes=attributes,
+                final_projection=final_projection,
+                first_filter=first_filter,
+                sort=sort,
+                order_by=order_by,
+                projection_model=projection_model,
+                skip=skip,
+                limit=limit,
+                current_page=current_page,
+                page_size=page_size,
+                foreign_read_preference=foreign_read_preference,
+                **pymongo_kwargs,
+            ),
+            self.fetch_count(first_filter or {}),
+        )
+
+        return {
+            "pagination": {
+                "total": count,
+                "current": current_page,
+                "page_size": limit or page_size or count,
+            },
+            "data": result,
+        }
+
+    async def join_in_application(
+        self: T,
+        objs: List[Dict],
+        lookups: List[Dict[str, Any]],
+        foreign_read_preference: Optional[Any] = None,
+    ) -> None:
+        """Set the `lookup_as` field of every obj in place, like `$lookup` (+ `$unwind`) would."""
+        foreign_objs_list = await gather(
+            *[
+                self.fetch_foreign_objs(
+                    lookup=lookup,
+                    keys=self._collect_local_keys(objs, lookup["lookup_local_field"]),
+                    foreign_read_preference=foreign_read_preference,
+                )
+                for lookup in lookups
+            ]
+        )
+
+        for lookup, foreign_objs in zip(lookups, foreign_objs_list):
+            for obj in objs:
+                matched = list()
+                for key in self._as_list(
+                    self.get_value_by_path(obj, lookup["lookup_local_field"])
+                ):
+                    matched.extend(foreign_objs.get(key, []))
+
+                if not lookup["unwind"]:
+                    obj[lookup["lookup_as"]] = [dict(i) for i in matched]
+
+                elif matched:
+                    # a to-one reference; like `preserveNullAndEmptyArrays`, the
+                    # field is left out when nothing matched.
+                    obj[lookup["lookup_as"]] = dict(matched[0])
+
+    async def fetch_foreign_objs(
+        self: T,
+        lookup: Dict[str, Any],
+        keys: List[Any],
+        foreign_read_preference: Optional[Any] = None,
+    ) -> Dict[Any, List[Dict]]:
+        """
+        Foreign objs grouped by their `lookup_foreign_field` value, from memory
+        when `lookup_from` is a registered reference collection.
+        """
+        if not keys:
+            return {}
+
+        cached = await self.fetch_reference_objs(lookup=lookup, keys=keys)
+        if cached is not None:
+            return cached
+
+        collection = self.document.get_motor_collection().database.get_collection(
+            lookup["lookup_from"],
+            read_preference=foreign_read_preference,
+        )
+
+        foreign_field = lookup["lookup_foreign_field"]
+        projection, temporary_fields_names = self._prepare_projection_with_fields(
+            projection=lookup["projection_fields"],
+            fields_names=[foreign_field],
+            is_inclusion=self._is_inclusion_projection(lookup["projection_fields"]),
+        )
+
+        grouped = dict()
+        async for foreign_obj in collection.find(
+            {foreign_field: {"$in": keys}},
+            projection=projection,
+        ):
+            for key in self._as_list(self.get_value_by_path(foreign_obj, foreign_field)):
+                grouped.setdefault(key, list()).append(foreign_obj)
+
+            for field_name in temporary_fields_names:
+                self._pop_path(foreign_obj, field_name)
+
+        return grouped
+
+    @staticmethod
+    def _as_list(value: Any) -> List[Any]:
+        if value is None:
+            # `$lookup` matches a missing local field with null foreign fields
+            return [None]
+
+        if isinstance(value, list):
+            return value
+
+        return [value]
+
+    def _collect_local_keys(self: T, objs: List[Dict], local_field: str) -> List[Any]:
+        keys = list()
+        for obj in objs:
+            for key in self._as_list(self.get_value_by_path(obj, local_field)):
+                if key not in keys:
+                    keys.append(key)
+
+        return keys
+
+    @staticmethod
+    def _pop_path(obj: Dict, path: str) -> None:
+        *parents, last = path.split(".")
+        for i in parents:
+            obj = obj.get(i)
+            if not isinstance(obj, dict):
+                return
+
+        obj.pop(last, None)
+
+    @staticmethod
+    def _prepare_projection_with_fields(
+        projection: Dict,
+        fields_names: List[str],
+        is_inclusion: bool,
+    ) -> tuple[Dict, List[str]]:
+        """
+        `projection` extended so it returns `fields_names`, and the names that
+        were added only for that (to be removed by `_pop_path` afterwards).
+        """
+        projection = dict(projection)
+        temporary_fields_names = list()
+        for field_name in fields_names:
+            if is_inclusion and not any(
+                field_name == i or field_name.startswith(f"{i}.") for i in projection
+            ):
+                projection[field_name] = 1
+                temporary_fields_names.append(field_name)
+
+            elif not is_inclusion and field_name in projection:
+                del projection[field_name]
+                temporary_fields_names.append(field_name)
+
+        return projection, temporary_fields_names
+
+    @staticmethod
+    def _is_inclusion_projection(projection: Dict) -> bool:
+        return any(
+            value not in (0, False) for key, value in projection.items() if key != "_id"
+        )
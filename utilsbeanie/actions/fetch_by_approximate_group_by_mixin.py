@@ -0,0 +1,186 @@
+from typing import (
+    Any,
+    List,
+    Dict,
+    Type,
+    Tuple,
+    Optional,
+    Generic,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+)
+
+from beanie import (
+    Document,
+    SortDirection,
+)
+from pydantic import BaseModel
+
+from ..constant import (
+    EnumOrderBy,
+    EnumMatchMode,
+)
+
+
+@runtime_checkable
+class FetchByApproximateGroupByMixinProtocol(Protocol):
+    document: Document
+    partition_field_name: str | None = None
+
+    def prepare_filter_for_group_by_aggregation(
+        self,
+        inputs: Dict[str, Any],
+        fields_names_for_regex: Tuple[str, ...] = tuple(),
+        fields_names_for_range: Tuple[str, ...] = tuple(),
+        fields_names_for_in: Tuple[str, ...] = tuple(),
+        search_field_name: str = None,
+        fields_names_for_search: Tuple[str, ...] = tuple(),
+        fields_match_modes: Dict[str, EnumMatchMode] | None = None,
+    ) -> tuple[dict, dict, dict]: ...
+
+    @staticmethod
+    def prepare_sample_size(
+        population: int,
+        sample_size: int | None = None,
+        error_budget: float | None = None,
+        confidence: float = 0.95,
+    ) -> int: ...
+
+    def build_approximate_group_by_pipeline(
+        self,
+        group_by_on: list[str],
+        population: int,
+        sample_size: int,
+        metrics: Dict[str, Tuple] | None = None,
+        confidence: float = 0.95,
+    ) -> List[Dict]: ...
+
+    async def fetch_by_aggregation_pipeline(
+        self,
+        aggregation_pipeline: Optional[List[Dict]] = None,
+        first_filter: dict = None,
+        last_filter: dict = None,
+        sort: dict[str, SortDirection] = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        current_page: int = None,
+        page_size: int = None,
+        **pymongo_kwargs,
+    ) -> List[Type[BaseModel] | Dict]: ...
+
+    async def fetch_count_from_partitions(
+        self,
+        filter_: Dict | None = None,
+        aggregation_pipeline: Optional[List[Dict]] = None,
+        **pymongo_kwargs,
+    ) -> int: ...
+
+
+T = TypeVar("T", bound=FetchByApproximateGroupByMixinProtocol)
+
+
+class FetchByApproximateGroupByMixin(Generic[T]):
+    async def fetch_by_approximate_group_by_aggregation_pipeline(
+        self: T,
+        aggregation_pipeline: list[dict],
+        inputs: dict,
+        group_by_on: list[str],
+        metrics: dict[str, tuple] | None = None,
+        sample_size: Optional[int] = None,
+        error_budget: Optional[float] = None,
+        confidence: float = 0.95,
+        population: Optional[int] = None,
+        search_field_name: str = "search",
+        fields_names_for_regex: tuple[str, ...] = tuple(),
+        fields_names_for_range: tuple[str, ...] = tuple(),
+        fields_names_for_in: tuple[str, ...] = tuple(),
+        fields_names_for_search: tuple[str, ...] = tuple(),
+        fields_match_modes: dict[str, EnumMatchMode] | None = None,
+        order_by: dict[str, EnumOrderBy] | None = None,
+        sort: dict[str, SortDirection] = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        current_page: int = None,
+        page_size: int = None,
+        **pymongo_kwargs,
+    ) -> dict:
+        """
+        `fetch_by_group_by_aggregation_pipeline` estimated from a `$sample` of
+        the documents matching `first_filter`, see `prepare_sample_size` and
+        `build_approximate_group_by_pipeline`. `population` is the number of
+        those documents; counted when not given (estimated without filters).
+        When the sample would hold every document the result is exact.
+        """
+        first_filter, middle_filter, last_filter = (
+            self.prepare_filter_for_group_by_aggregation(
+                inputs=inputs,
+                search_field_name=search_field_name,
+                fields_names_for_regex=fields_names_for_regex,
+                fields_names_for_range=fields_names_for_range,
+                fields_names_for_in=fields_names_for_in,
+                fields_names_for_search=fields_names_for_search,
+                fields_match_modes=fields_match_modes,
+            )
+        )
+
+        if population is None and self.partition_field_name is not None:
+            population = await self.fetch_count_from_partitions(first_filter)
+
+        elif population is None:
+            collection = self.document.get_motor_collection()
+            if first_filter:
+                population = await collection.count_documents(first_filter)
+            else:
+                population = await collection.estimated_document_count()
+
+        sample_size = self.prepare_sample_size(
+            population=population,
+            sample_size=sample_size,
+            error_budget=error_budget,
+            confidence=confidence,
+        )
+        sampling = {
+            "population": population,
+            "sample_size": sample_size,
+            "confidence": confidence,
+            "is_exact": sample_size >= population,
+        }
+        if not sample_size:
+            return {"sampling": sampling, "data": []}
+
+        _aggregation_pipeline = list()
+        if not sampling["is_exact"]:
+            _aggregation_pipeline.append({"$sample": {"size": sample_size}})
+
+        _aggregation_pipeline.extend(aggregation_pipeline)
+        if middle_filter:
+            _aggregation_pipeline.append({"$match": middle_filter})
+
+        _aggregation_pipeline.extend(
+            self.build_approximate_group_by_pipeline(
+                group_by_on=group_by_on,
+                population=population,
+                sample_size=sample_size,
+                metrics=metrics,
+                confidence=confidence,
+            )
+        )
+
+        result = await self.fetch_by_aggregation_pipeline(
+            aggregation_pipeline=_aggregation_pipeline,
+            first_filter=first_filter,
+            last_filter=last_filter,
+            order_by=order_by,
+            sort=sort,
+            projection_model=projection_model,
+            skip=skip,
+            limit=limit,
+            current_page=current_page,
+            page_size=page_size,
+            **pymongo_kwargs,
+        )
+        return {"sampling": sampling, "data": result}
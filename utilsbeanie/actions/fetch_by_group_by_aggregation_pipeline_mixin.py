@@ -19,6 +19,7 @@ from pydantic import BaseModel
 
 from ..constant import (
     EnumOrderBy,
+    EnumMatchMode,
     DATETIME_BY_X_FORMAT,
 )
 
@@ -27,6 +28,54 @@ from ..constant import (
 class PrepareGroupByThenFetchMixinProtocol(Protocol):
     document: Document
     field_separator: str = "__"
+    use_rollups: bool = True
+    use_group_by_bucket_cache: bool = False
+
+    def find_covering_rollup(
+        self,
+        aggregation_pipeline: List[Dict] | None,
+        first_filter: Dict | None,
+        middle_filter: Dict | None,
+        group_by_on: list[str],
+        metrics: Dict[str, Tuple] | None = None,
+    ) -> Dict[str, Any] | None: ...
+
+    async def fetch_group_by_from_rollup(
+        self,
+        rollup: Dict[str, Any],
+        group_by_on: list[str],
+        metrics: Dict[str, Tuple] | None = None,
+        first_filter: dict = None,
+        last_filter: dict = None,
+        sort: Dict | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        current_page: int = None,
+        page_size: int = None,
+        with_pagination: bool = False,
+        **pymongo_kwargs,
+    ) -> List[Type[BaseModel] | Dict] | Dict: ...
+
+    def find_group_by_bucket_field(self, group_by_on: list[str]) -> tuple[str, str] | None: ...
+
+    async def fetch_group_by_with_bucket_cache(
+        self,
+        aggregation_pipeline: List[Dict],
+        group_by_on: list[str],
+        metrics: Dict[str, Tuple] | None = None,
+        first_filter: dict = None,
+        middle_filter: dict = None,
+        last_filter: dict = None,
+        sort: Dict | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        current_page: int = None,
+        page_size: int = None,
+        with_pagination: bool = False,
+        **pymongo_kwargs,
+    ) -> List[Type[BaseModel] | Dict] | Dict: ...
 
     async def fetch_by_aggregation_pipeline(
         self,
@@ -40,6 +89,7 @@ class PrepareGroupByThenFetchMixinProtocol(Protocol):
         limit: Optional[int] = None,
         current_page: int = None,
         page_size: int = None,
+        **pymongo_kwargs,
     ) -> List[Type[BaseModel] | Dict]: ...
 
     def prepare_filter_for_group_by_aggregation(
@@ -50,9 +100,33 @@ class PrepareGroupByThenFetchMixinProtocol(Protocol):
         fields_names_for_in: Tuple[str, ...] = tuple(),
         search_field_name: str = None,
         fields_names_for_search: Tuple[str, ...] = tuple(),
+        fields_match_modes: Dict[str, EnumMatchMode] | None = None,
     ) -> tuple[dict, dict, dict]: ...
 
-    def create_group_by_pipeline(self, group_by_on: list[str]) -> List[Dict]: ...
+    def build_group_by_pipeline(
+        self,
+        group_by_on: list[str],
+        metrics: Dict[str, Tuple] | None = None,
+    ) -> List[Dict]: ...
+
+    def build_group_by_facet_stage(
+        self,
+        groupings: Dict[str, list[str]],
+        last_filter: Dict | None = None,
+        sort: Dict | None = None,
+        limit: int | None = None,
+        metrics: Dict[str, Tuple] | None = None,
+    ) -> Dict: ...
+
+    @staticmethod
+    def convert_sort_for_aggregation(
+        sort: List | Dict | None = None,
+    ) -> Dict | None: ...
+
+    def convert_order_by_to_sort(
+        self,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+    ) -> List: ...
 
     async def fetch_by_aggregation_pipeline_with_pagination(
         self,
@@ -66,6 +140,7 @@ class PrepareGroupByThenFetchMixinProtocol(Protocol):
         projection_model: Optional[Type[BaseModel]] = None,
         skip: Optional[int] = None,
         limit: Optional[int] = None,
+        **pymongo_kwargs,
     ) -> Dict: ...
 
 
@@ -84,6 +159,7 @@ class FetchByGroupByAggregationPipelineMixin(Generic[T]):
         fields_names_for_range: tuple[str, ...] = tuple(),
         fields_names_for_in: tuple[str, ...] = tuple(),
         fields_names_for_search: tuple[str, ...] = tuple(),
+        fields_match_modes: dict[str, EnumMatchMode] | None = None,
         order_by: dict[str, EnumOrderBy] | None = None,
         sort: dict[str, SortDirection] = None,
         projection_model: Optional[Type[BaseModel]] = None,
@@ -91,6 +167,8 @@ class FetchByGroupByAggregationPipelineMixin(Generic[T]):
         limit: Optional[int] = None,
         current_page: int = None,
         page_size: int = None,
+        metrics: dict[str, tuple] | None = None,
+        **pymongo_kwargs,
     ) -> dict:
         first_filter, middle_filter, last_filter = (
             self.prepare_filter_for_group_by_aggregation(
@@ -100,15 +178,70 @@ class FetchByGroupByAggregationPipelineMixin(Generic[T]):
                 fields_names_for_range=fields_names_for_range,
                 fields_names_for_in=fields_names_for_in,
                 fields_names_for_search=fields_names_for_search,
+                fields_match_modes=fields_match_modes,
             )
         )
 
-        return await self.fetch_by_aggregation_pipeline(
-            aggregation_pipeline=[
+        rollup = None
+        if self.use_rollups:
+            rollup = self.find_covering_rollup(
+                aggregation_pipeline=aggregation_pipeline,
+                first_filter=first_filter,
+                middle_filter=middle_filter,
+                group_by_on=group_by_on,
+                metrics=metrics,
+            )
+        if rollup is not None:
+            return await self.fetch_group_by_from_rollup(
+                rollup=rollup,
+                group_by_on=group_by_on,
+                metrics=metrics,
+                first_filter=first_filter,
+                last_filter=last_filter,
+                sort=self.convert_sort_for_aggregation(
+                    self.convert_order_by_to_sort(order_by=order_by) or sort
+                ),
+                projection_model=projection_model,
+                skip=skip,
+                limit=limit,
+                current_page=current_page,
+                page_size=page_size,
+                **pymongo_kwargs,
+            )
+
+        if self.use_group_by_bucket_cache and self.find_group_by_bucket_field(group_by_on):
+            return await self.fetch_group_by_with_bucket_cache(
+                aggregation_pipeline=aggregation_pipeline,
+                group_by_on=group_by_on,
+                metrics=metrics,
+                first_filter=first_filter,
+                middle_filter=middle_filter,
+                last_filter=last_filter,
+                sort=self.convert_sort_for_aggregation(
+                    self.convert_order_by_to_sort(order_by=order_by) or sort
+                ),
+                projection_model=projection_model,
+                skip=skip,
+                limit=limit,
+                current_page=current_page,
+                page_size=page_size,
+                **pymongo_kwargs,
+            )
+
+        if middle_filter:
+            aggregation_pipeline = [
                 *aggregation_pipeline,
                 {"$match": middle_filter},
-                *self.create_group_by_pipeline(group_by_on=group_by_on),
-            ],
+                *self.build_group_by_pipeline(group_by_on=group_by_on, metrics=metrics),
+            ]
+        else:
+            aggregation_pipeline = [
+                *aggregation_pipeline,
+                *self.build_group_by_pipeline(group_by_on=group_by_on, metrics=metrics),
+            ]
+
+        return await self.fetch_by_aggregation_pipeline(
+            aggregation_pipeline=aggregation_pipeline,
             first_filter=first_filter,
             last_filter=last_filter,
             order_by=order_by,
@@ -118,6 +251,7 @@ class FetchByGroupByAggregationPipelineMixin(Generic[T]):
             limit=limit,
             current_page=current_page,
             page_size=page_size,
+            **pymongo_kwargs,
         )
 
     async def fetch_by_group_by_aggregation_pipeline_with_pagination(
@@ -132,11 +266,14 @@ class FetchByGroupByAggregationPipelineMixin(Generic[T]):
         fields_names_for_range: tuple[str, ...] = tuple(),
         fields_names_for_in: tuple[str, ...] = tuple(),
         fields_names_for_search: tuple[str, ...] = tuple(),
+        fields_match_modes: dict[str, EnumMatchMode] | None = None,
         order_by: dict[str, EnumOrderBy] | None = None,
         sort: dict[str, SortDirection] = None,
         projection_model: Optional[Type[BaseModel]] = None,
         skip: Optional[int] = None,
         limit: Optional[int] = None,
+        metrics: dict[str, tuple] | None = None,
+        **pymongo_kwargs,
     ) -> dict:
         first_filter, middle_filter, last_filter = (
             self.prepare_filter_for_group_by_aggregation(
@@ -146,19 +283,68 @@ class FetchByGroupByAggregationPipelineMixin(Generic[T]):
                 fields_names_for_range=fields_names_for_range,
                 fields_names_for_in=fields_names_for_in,
                 fields_names_for_search=fields_names_for_search,
+                fields_match_modes=fields_match_modes,
             )
         )
 
+        rollup = None
+        if self.use_rollups:
+            rollup = self.find_covering_rollup(
+                aggregation_pipeline=aggregation,
+                first_filter=first_filter,
+                middle_filter=middle_filter,
+                group_by_on=group_by_on,
+                metrics=metrics,
+            )
+        if rollup is not None:
+            return await self.fetch_group_by_from_rollup(
+                rollup=rollup,
+                group_by_on=group_by_on,
+                metrics=metrics,
+                first_filter=first_filter,
+                last_filter=last_filter,
+                sort=self.convert_sort_for_aggregation(
+                    self.convert_order_by_to_sort(order_by=order_by) or sort
+                ),
+                projection_model=projection_model,
+                skip=skip,
+                limit=limit,
+                current_page=current_page,
+                page_size=page_size,
+                with_pagination=True,
+                **pymongo_kwargs,
+            )
+
+        if self.use_group_by_bucket_cache and self.find_group_by_bucket_field(group_by_on):
+            return await self.fetch_group_by_with_bucket_cache(
+                aggregation_pipeline=aggregation,
+                group_by_on=group_by_on,
+                metrics=metrics,
+                first_filter=first_filter,
+                middle_filter=middle_filter,
+                last_filter=last_filter,
+                sort=self.convert_sort_for_aggregation(
+                    self.convert_order_by_to_sort(order_by=order_by) or sort
+                ),
+                projection_model=projection_model,
+                skip=skip,
+                limit=limit,
+                current_page=current_page,
+                page_size=page_size,
+                with_pagination=True,
+                **pymongo_kwargs,
+            )
+
         if middle_filter:
             aggregation = [
                 *aggregation,
                 {"$match": middle_filter},
-                *self.create_group_by_pipeline(group_by_on=group_by_on),
+                *self.build_group_by_pipeline(group_by_on=group_by_on, metrics=metrics),
             ]
         else:
             aggregation = [
                 *aggregation,
-                *self.create_group_by_pipeline(group_by_on=group_by_on),
+                *self.build_group_by_pipeline(group_by_on=group_by_on, metrics=metrics),
             ]
 
         return await self.fetch_by_aggregation_pipeline_with_pagination(
@@ -172,5 +358,69 @@ class FetchByGroupByAggregationPipelineMixin(Generic[T]):
             limit=limit,
             sort=sort,
             projection_model=projection_model,
+            **pymongo_kwargs,
+        )
+
+    async def fetch_group_by_many(
+        self: T,
+        aggregation_pipeline: list[dict],
+        inputs: dict,
+        groupings: dict[str, list[str]] | list[list[str]],
+        search_field_name: str = "search",
+        fields_names_for_regex: tuple[str, ...] = tuple(),
+        fields_names_for_range: tuple[str, ...] = tuple(),
+        fields_names_for_in: tuple[str, ...] = tuple(),
+        fields_names_for_search: tuple[str, ...] = tuple(),
+        fields_match_modes: dict[str, EnumMatchMode] | None = None,
+        order_by: dict[str, EnumOrderBy] | None = None,
+        sort: dict[str, SortDirection] = None,
+        limit: Optional[int] = None,
+        metrics: dict[str, tuple] | None = None,
+        **pymongo_kwargs,
+    ) -> dict[str, list[dict]]:
+        """
+        Several `group_by_on` combinations over one scan: the filters and
+        `aggregation_pipeline` run once and every grouping is a branch of a
+        `$facet`. `groupings` is keyed by the name to return each result
+        under; a list is keyed by `",".join(group_by_on)`.
+        `sort` and `limit` apply to every branch. All the groups together
+        must fit in one 16MB document.
+        """
+        if not isinstance(groupings, dict):
+            groupings = {",".join(i): i for i in groupings}
+
+        first_filter, middle_filter, last_filter = (
+            self.prepare_filter_for_group_by_aggregation(
+                inputs=inputs,
+                search_field_name=search_field_name,
+                fields_names_for_regex=fields_names_for_regex,
+                fields_names_for_range=fields_names_for_range,
+                fields_names_for_in=fields_names_for_in,
+                fields_names_for_search=fields_names_for_search,
+                fields_match_modes=fields_match_modes,
+            )
+        )
+
+        aggregation_pipeline = list(aggregation_pipeline)
+        if middle_filter:
+            aggregation_pipeline.append({"$match": middle_filter})
+
+        aggregation_pipeline.append(
+            self.build_group_by_facet_stage(
+                groupings=groupings,
+                last_filter=last_filter,
+                sort=self.convert_sort_for_aggregation(
+                    self.convert_order_by_to_sort(order_by=order_by) or sort
+                ),
+                limit=limit,
+                metrics=metrics,
+            )
+        )
+
+        result = await self.fetch_by_aggregation_pipeline(
+            aggregation_pipeline=aggregation_pipeline,
+            first_filter=first_filter,
+            **pymongo_kwargs,
         )
 
+        return result[0] if result else {name: [] for name in groupings}
@@ -0,0 +1,368 @@
+from asyncio import gather
+from time import (
+    monotonic,
+    perf_counter,
+)
+from typing import (
+    Any,
+    List,
+    Dict,
+    Type,
+    Literal,
+    Optional,
+    Generic,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+)
+
+from beanie import (
+    Document,
+    SortDirection,
+)
+from pydantic import BaseModel
+
+from ..constant import (
+    EnumOrderBy,
+    EnumJoinStrategy,
+)
+
+
+@runtime_checkable
+class FetchByPlannedJoinMixinProtocol(Protocol):
+    document: Document
+    optimize_aggregation_pipelines: bool = True
+    print_aggregation_pipeline_diff: bool = False
+    reference_collections: Dict[str, Dict[str, Any]]
+    join_planner_collections_stats: Dict[str, Dict[str, Any]]
+    join_planner_stats_ttl: float = 300
+
+    def convert_order_by_to_sort(
+        self,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+    ) -> List: ...
+
+    @staticmethod
+    def convert_sort_for_aggregation(
+        sort: List | Dict | None = None,
+    ) -> Dict | None: ...
+
+    @staticmethod
+    def prepare_skip_limit_for_aggregation(
+        current_page: Optional[int] = None,
+        page_size: Optional[int] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict]: ...
+
+    @staticmethod
+    def prepare_projection_fields(
+        projection: Type[BaseModel] | Dict[str | Literal[0, 1], Any] | None
+    ) -> Dict[str | Literal[0, 1], Any]: ...
+
+    def prepare_lookup_attribute(
+        self,
+        attribute: tuple[str, Type[BaseModel]] | dict[str, Any],
+    ) -> dict[str, Any]: ...
+
+    @staticmethod
+    def build_lookup_stages(lookup: dict[str, Any]) -> list[dict]: ...
+
+    def optimize_aggregation_pipeline(
+        self,
+        aggregation_pipeline: List[Dict],
+        print_diff: bool = False,
+        defer_lookups: bool = False,
+    ) -> List[Dict]: ...
+
+    @classmethod
+    def prune_count_pipeline(cls, aggregation_pipeline: List[Dict]) -> List[Dict]: ...
+
+    def prepare_join_query_shape(
+        self,
+        lookups: List[Dict[str, Any]],
+        first_filter: Dict | None,
+        last_filter: Dict | None,
+        sort: Dict | None,
+        page_size: int | None,
+    ) -> str: ...
+
+    def plan_join_strategies(
+        self,
+        lookups: List[Dict[str, Any]],
+        last_filter: Dict | None,
+        sort: Dict | None,
+        page_size: int | None,
+        collections_stats: Dict[str, Dict[str, Any]],
+    ) -> Dict[str, Dict[str, Any]]: ...
+
+    def choose_join_plan(
+        self,
+        shape: str,
+        decisions: Dict[str, Dict[str, Any]],
+    ) -> Dict[str, Dict[str, Any]]: ...
+
+    def record_join_outcome(
+        self,
+        shape: str,
+        decisions: Dict[str, Dict[str, Any]],
+        duration: float,
+        number_of_rows: int,
+    ) -> None: ...
+
+    async def join_in_application(
+        self,
+        objs: List[Dict],
+        lookups: List[Dict[str, Any]],
+        foreign_read_preference: Optional[Any] = None,
+    ) -> None: ...
+
+    @staticmethod
+    def _pop_path(obj: Dict, path: str) -> None: ...
+
+    @staticmethod
+    def _prepare_projection_with_fields(
+        projection: Dict,
+        fields_names: List[str],
+        is_inclusion: bool,
+    ) -> tuple[Dict, List[str]]: ...
+
+    @staticmethod
+    def _is_inclusion_projection(projection: Dict) -> bool: ...
+
+
+T = TypeVar("T", bound=FetchByPlannedJoinMixinProtocol)
+
+
+class FetchByPlannedJoinMixin(Generic[T]):
+    """
+    `fetch_by_aggregation_pipeline(build_aggregation_pipeline(...))` where every
+    lookup runs as a server `$lookup`, a deferred `$lookup` or an
+    application-side join, as `plan_join_strategies` and `choose_join_plan`
+    decide. Each execution is timed and recorded per query shape, see
+    `get_join_planner_report`.
+    """
+
+    async def fetch_by_planned_join(
+        self: T,
+        attributes: tuple[tuple[str, Type[BaseModel]], ...] | tuple[dict[str, Any], ...],
+        final_projection: Type[BaseModel] | dict[str, Literal[0, 1]] = None,
+        first_filter: dict = None,
+        last_filter: dict = None,
+        sort: dict[str, SortDirection] = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        current_page: int = None,
+        page_size: int = None,
+        foreign_read_preference: Optional[Any] = None,
+        **pymongo_kwargs,
+    ) -> List[Type[BaseModel] | Dict]:
+        lookups = [self.prepare_lookup_attribute(i) for i in attributes]
+        sort = self.convert_sort_for_aggregation(
+            self.convert_order_by_to_sort(order_by=order_by) or sort
+        )
+        skip_limit_list = self.prepare_skip_limit_for_aggregation(
+            current_page=current_page,
+            page_size=page_size,
+            skip=skip,
+            limit=limit,
+        )
+        rows_limit = next((i["$limit"] for i in skip_limit_list if "$limit" in i), None)
+
+        shape = self.prepare_join_query_shape(
+            lookups=lookups,
+            first_filter=first_filter,
+            last_filter=last_filter,
+            sort=sort,
+            page_size=rows_limit,
+        )
+        collections_stats = dict(
+            zip(
+                [i["lookup_as"] for i in lookups],
+                await gather(*[self.fetch_join_collection_stats(i) for i in lookups]),
+            )
+        )
+        decisions = self.choose_join_plan(
+            shape=shape,
+            decisions=self.plan_join_strategies(
+                lookups=lookups,
+                last_filter=last_filter,
+                sort=sort,
+                page_size=rows_limit,
+                collections_stats=collections_stats,
+            ),
+        )
+
+        def lookups_by(strategy: EnumJoinStrategy) -> List[Dict[str, Any]]:
+            return [i for i in lookups if decisions[i["lookup_as"]]["strategy"] == strategy]
+
+        application_lookups = lookups_by(EnumJoinStrategy.APPLICATION)
+        final_projection_fields = self.prepare_projection_fields(projection=final_projection)
+        application_lookups_as = {i["lookup_as"] for i in application_lookups}
+        projection, temporary_fields_names = self._prepare_projection_with_fields(
+            projection={
+                key: value
+                for key, value in final_projection_fields.items()
+                if key.split(".")[0] not in application_lookups_as
+            },
+            fields_names=[i["lookup_local_field"] for i in application_lookups],
+            is_inclusion=self._is_inclusion_projection(final_projection_fields),
+        )
+
+        aggregation_pipeline = list()
+        if first_filter:
+            aggregation_pipeline.append({"$match": first_filter})
+
+        for lookup in lookups_by(EnumJoinStrategy.SERVER):
+            aggregation_pipeline.extend(self.build_lookup_stages(lookup))
+
+        if last_filter:
+            aggregation_pipeline.append({"$match": last_filter})
+
+        if sort:
+            aggregation_pipeline.append({"$sort": sort})
+
+        aggregation_pipeline.extend(skip_limit_list)
+
+        for lookup in lookups_by(EnumJoinStrategy.DEFERRED):
+            aggregation_pipeline.extend(self.build_lookup_stages(lookup))
+
+        if projection:
+            aggregation_pipeline.append({"$project": projection})
+
+        if self.optimize_aggregation_pipelines:
+            aggregation_pipeline = self.optimize_aggregation_pipeline(
+                aggregation_pipeline,
+                print_diff=self.print_aggregation_pipeline_diff,
+            )
+
+        started_at = perf_counter()
+        objs = (
+            await self.document.get_motor_collection()
+            .aggregate(aggregation_pipeline, **pymongo_kwargs)
+            .to_list(length=None)
+        )
+
+        if objs and application_lookups:
+            await self.join_in_application(
+                objs=objs,
+                lookups=application_lookups,
+                foreign_read_preference=foreign_read_preference,
+            )
+
+        self.record_join_outcome(
+            shape=shape,
+            decisions=decisions,
+            duration=(perf_counter() - started_at) * 1000,
+            number_of_rows=len(objs),
+        )
+
+        for obj in objs:
+            for field_name in temporary_fields_names:
+                self._pop_path(obj, field_name)
+
+        if projection_model:
+            return [projection_model.model_validate(i) for i in objs]
+
+        return objs
+
+    async def fetch_by_planned_join_with_pagination(
+        self: T,
+        attributes: tuple[tuple[str, Type[BaseModel]], ...] | tuple[dict[str, Any], ...],
+        final_projection: Type[BaseModel] | dict[str, Literal[0, 1]] = None,
+        first_filter: dict = None,
+        last_filter: dict = None,
+        sort: dict[str, SortDirection] = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        current_page: int = 1,
+        page_size: int = 10,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        foreign_read_preference: Optional[Any] = None,
+        **pymongo_kwargs,
+    ) -> Dict:
+        aggregation_pipeline_for_count = list()
+        if first_filter:
+            aggregation_pipeline_for_count.append({"$match": first_filter})
+
+        for attribute in attributes:
+            aggregation_pipeline_for_count.extend(
+                self.build_lookup_stages(self.prepare_lookup_attribute(attribute))
+            )
+
+        if last_filter:
+            aggregation_pipeline_for_count.append({"$match": last_filter})
+
+        aggregation_pipeline_for_count.append({"$count": "count"})
+        if self.optimize_aggregation_pipelines:
+            aggregation_pipeline_for_count = self.optimize_aggregation_pipeline(
+                self.prune_count_pipeline(aggregation_pipeline_for_count),
+                print_diff=self.print_aggregation_pipeline_diff,
+            )
+
+        result, count = await gather(
+            self.fetch_by_planned_join(
+                attributes=attributes,
+                final_projection=final_projection,
+                first_filter=first_filter,
+                last_filter=last_filter,
+                sort=sort,
+                order_by=order_by,
+                projection_model=projection_model,
+                skip=skip,
+                limit=limit,
+                current_page=current_page,
+                page_size=page_size,
+                foreign_read_preference=foreign_read_preference,
+                **pymongo_kwargs,
+            ),
+            self.document.get_motor_collection()
+            .aggregate(aggregation_pipeline_for_count, **pymongo_kwargs)
+            .to_list(length=None),
+        )
+        count = 0 if not count else count[0]["count"]
+
+        return {
+            "pagination": {
+                "total": count,
+                "current": current_page,
+                "page_size": limit or page_size or count,
+            },
+            "data": result,
+        }
+
+    async def fetch_join_collection_stats(self: T, lookup: Dict[str, Any]) -> Dict[str, Any]:
+        """Size of the foreign collection and whether the foreign field leads an index, cached for `join_planner_stats_ttl` seconds."""
+        reference = self.reference_collections.get(lookup["lookup_from"])
+        is_reference = (
+            reference is not None
+            and reference["foreign_field"] == lookup["lookup_foreign_field"]
+            # a collection rejected for the memory budget falls back to queries
+            and not (reference["loaded_at"] is not None and reference["objs"] is None)
+        )
+
+        key = f"{lookup['lookup_from']}.{lookup['lookup_foreign_field']}"
+        stats = self.join_planner_collections_stats.get(key)
+        if stats is None or monotonic() - stats["fetched_at"] >= self.join_planner_stats_ttl:
+            collection = self.document.get_motor_collection().database.get_collection(
+                lookup["lookup_from"]
+            )
+            count, indexes = await gather(
+                collection.estimated_document_count(),
+                collection.index_information(),
+            )
+            stats = {
+                "count": count,
+                "is_indexed": lookup["lookup_foreign_field"] == "_id"
+                or any(
+                    list(i["key"])[0][0] == lookup["lookup_foreign_field"]
+                    for i in indexes.values()
+                ),
+                "fetched_at": monotonic(),
+            }
+            self.join_planner_collections_stats[key] = stats
+
+        return {**stats, "is_reference": is_reference}
@@ -0,0 +1,174 @@
+from typing import (
+    Any,
+    List,
+    Dict,
+    Tuple,
+    Union,
+    Mapping,
+    Optional,
+    Type,
+    Generic,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+)
+
+from beanie import (
+    Document,
+    SortDirection,
+)
+from beanie.odm.documents import AsyncIOMotorClientSession
+
+from ..constant import EnumOrderBy
+
+try:
+    import numpy
+except ImportError:  # optional, only `fetch_columns` needs it
+    numpy = None
+
+
+@runtime_checkable
+class FetchColumnsMixinProtocol(Protocol):
+    document: Document
+    field_separator: str = "__"
+    partition_field_name: str | None = None
+
+    @staticmethod
+    def convert_order_by_to_sort(
+        order_by: Dict[str, EnumOrderBy] | None = None,
+    ) -> List: ...
+
+    @staticmethod
+    def prepare_skip_limit(
+        current_page: Optional[int] = None,
+        page_size: Optional[int] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> dict: ...
+
+    @staticmethod
+    def get_value_by_path(obj: Dict, path: str) -> Any: ...
+
+    def get_raw_collection(self, document_class: Type[Mapping] = dict): ...
+
+    def prepare_columns_projection(self, fields: Tuple[str, ...]) -> Dict[str, int]: ...
+
+    def prepare_columns_dtypes(
+        self,
+        fields: Tuple[str, ...],
+        dtypes: Dict[str, Any] | None = None,
+    ) -> Dict[str, Any]: ...
+
+
+T = TypeVar("T", bound=FetchColumnsMixinProtocol)
+
+
+class FetchColumnsMixin(Generic[T]):
+    async def fetch_columns(
+        self: T,
+        filter_: Dict,
+        fields: Tuple[str, ...],
+        dtypes: Dict[str, Any] | None = None,
+        dictionary_encoded: Tuple[str, ...] = tuple(),
+        structured: bool = False,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        sort: Union[None, List[Tuple[str, SortDirection]]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        session: Optional[AsyncIOMotorClientSession] = None,
+        initial_capacity: int = 1024,
+        **pymongo_kwargs,
+    ) -> Dict[str, Any]:
+        """
+        The `fields` of the matching documents as NumPy arrays, filled from
+        the driver's batches without models: `{"length", "columns",
+        "dictionaries"}`. `columns` maps each field to an array of its
+        `dtypes` entry (inferred from the annotations when missing, see
+        `prepare_columns_dtypes`), or is one structured array when
+        `structured`. Missing values are NaN, NaT, None or ""; integer and
+        boolean columns do not allow them. A `dictionary_encoded` field is an
+        int32 array of codes (-1 when missing) into `dictionaries[field]`.
+        """
+        if self.partition_field_name is not None:
+            raise ValueError("`fetch_columns` reads the document's own collection, not its partitions")
+        if numpy is None:
+            raise ImportError("`fetch_columns` needs NumPy: pip install numpy")
+
+        dtypes = self.prepare_columns_dtypes(fields=fields, dtypes=dtypes)
+        paths = {i: i.replace(self.field_separator, ".") for i in fields}
+        capacity = max(min(initial_capacity, limit or initial_capacity), 1)
+
+        columns = dict()
+        dictionaries = dict()
+        for field_name in fields:
+            if field_name in dictionary_encoded:
+                columns[field_name] = numpy.empty(capacity, dtype="int32")
+                dictionaries[field_name] = dict()
+                continue
+
+            dtype = numpy.dtype(dtypes[field_name])
+            # fixed-width strings get their width once every value is read
+            columns[field_name] = numpy.empty(
+                capacity,
+                dtype=object if dtype.kind in "SU" else dtype,
+            )
+
+        cursor = self.get_raw_collection().find(
+            filter_,
+            projection=self.prepare_columns_projection(fields),
+            sort=self.convert_order_by_to_sort(order_by=order_by) or sort,
+            session=session,
+            **self.prepare_skip_limit(skip=skip, limit=limit),
+            **pymongo_kwargs,
+        )
+
+        length = 0
+        async for document in cursor:
+            if length == capacity:
+                capacity *= 2
+                for column in columns.values():
+                    column.resize(capacity, refcheck=False)
+
+            for field_name, path in paths.items():
+                value = self.get_value_by_path(document, path)
+                column = columns[field_name]
+                if field_name in dictionaries:
+                    column[length] = (
+                        -1
+                        if value is None
+                        else dictionaries[field_name].setdefault(
+                            value, len(dictionaries[field_name])
+                        )
+                    )
+
+                elif value is None and column.dtype.kind in "biu":
+                    raise ValueError(
+                        f"{field_name!r} is missing in a document, "
+                        f"read it as a float or object column instead of {column.dtype}"
+                    )
+
+                else:
+                    column[length] = value
+
+            length += 1
+
+        for field_name, column in columns.items():
+            column.resize(length, refcheck=False)
+            if field_name not in dictionaries and numpy.dtype(dtypes[field_name]).kind in "SU":
+                column[numpy.equal(column, None)] = ""
+                columns[field_name] = column.astype(dtypes[field_name])
+
+        dictionaries = {
+            i: numpy.array(list(values), dtype=object) for i, values in dictionaries.items()
+        }
+
+        if structured:
+            array = numpy.empty(
+                length,
+                dtype=[(i, column.dtype) for i, column in columns.items()],
+            )
+            for field_name, column in columns.items():
+                array[field_name] = column
+            columns = array
+
+        return {"length": length, "columns": columns, "dictionaries": dictionaries}
@@ -0,0 +1,116 @@
+from typing import (
+    Any,
+    List,
+    Dict,
+    Type,
+    Tuple,
+    Mapping,
+    Optional,
+    Generic,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+)
+
+from beanie import Document
+
+from ..constant import EnumMatchMode
+
+
+@runtime_checkable
+class FetchFacetCountsMixinProtocol(Protocol):
+    document: Document
+    partition_field_name: str | None = None
+
+    def build_facet_counts_pipeline(
+        self,
+        inputs: Dict[str, Any],
+        fields_names_for_regex: Tuple[str, ...] = tuple(),
+        fields_names_for_range: Tuple[str, ...] = tuple(),
+        fields_names_for_in: Tuple[str, ...] = tuple(),
+        search_field_name: str = None,
+        fields_names_for_search: Tuple[str, ...] = tuple(),
+        fields_match_modes: Dict[str, EnumMatchMode] | None = None,
+        ranges_boundaries: Dict[str, List] | None = None,
+        number_of_buckets: int = 10,
+        values_limit: int | None = None,
+    ) -> List[Dict]: ...
+
+    def prepare_facet_counts(
+        self,
+        result: Dict[str, List[Dict]],
+        fields_names_for_range: Tuple[str, ...] = tuple(),
+        fields_names_for_in: Tuple[str, ...] = tuple(),
+        ranges_boundaries: Dict[str, List] | None = None,
+    ) -> Dict[str, Any]: ...
+
+    async def fetch_partition_names_by_filter(self, filter_: Dict | None) -> List[str]: ...
+
+    async def aggregate_partitions(
+        self,
+        names: List[str],
+        first_filter: Dict | None = None,
+        branch_pipeline: Optional[List[Dict]] = None,
+        aggregation_pipeline: Optional[List[Dict]] = None,
+        raw_document_class: Type[Mapping] = dict,
+        **pymongo_kwargs,
+    ) -> List[Mapping]: ...
+
+
+T = TypeVar("T", bound=FetchFacetCountsMixinProtocol)
+
+
+class FetchFacetCountsMixin(Generic[T]):
+    async def fetch_facet_counts(
+        self: T,
+        inputs: Dict[str, Any],
+        fields_names_for_regex: Tuple[str, ...] = tuple(),
+        fields_names_for_range: Tuple[str, ...] = tuple(),
+        fields_names_for_in: Tuple[str, ...] = tuple(),
+        search_field_name: str = None,
+        fields_names_for_search: Tuple[str, ...] = tuple(),
+        fields_match_modes: Dict[str, EnumMatchMode] | None = None,
+        ranges_boundaries: Dict[str, List] | None = None,
+        number_of_buckets: int = 10,
+        values_limit: int | None = None,
+        **pymongo_kwargs,
+    ) -> Dict[str, Any]:
+        """
+        For filter UIs: how many documents each value of the in-fields and
+        each range of the range-fields would match, in one aggregation. A
+        field's counts ignore its own input (drill-down), so the other
+        options of a dropdown keep their counts once one is chosen; `total`
+        applies every input. See `build_facet_counts_pipeline`.
+        """
+        aggregation_pipeline = self.build_facet_counts_pipeline(
+            inputs=inputs,
+            fields_names_for_regex=fields_names_for_regex,
+            fields_names_for_range=fields_names_for_range,
+            fields_names_for_in=fields_names_for_in,
+            search_field_name=search_field_name,
+            fields_names_for_search=fields_names_for_search,
+            fields_match_modes=fields_match_modes,
+            ranges_boundaries=ranges_boundaries,
+            number_of_buckets=number_of_buckets,
+            values_limit=values_limit,
+        )
+        if self.partition_field_name is not None:
+            result = await self.aggregate_partitions(
+                await self.fetch_partition_names_by_filter(None),
+                aggregation_pipeline=aggregation_pipeline,
+                **pymongo_kwargs,
+            )
+
+        else:
+            result = (
+                await self.document.get_motor_collection()
+                .aggregate(aggregation_pipeline, **pymongo_kwargs)
+                .to_list(length=None)
+            )
+
+        return self.prepare_facet_counts(
+            result=result[0] if result else {},
+            fields_names_for_range=fields_names_for_range,
+            fields_names_for_in=fields_names_for_in,
+            ranges_boundaries=ranges_boundaries,
+        )
@@ -1,6 +1,7 @@
 from typing import (
     Any,
     List,
+    Mapping,
     Dict,
     Type,
     Optional,
@@ -25,6 +26,7 @@ from ..constant import EnumOrderBy
 @runtime_checkable
 class FetchSimpleMixinProtocol(Protocol):
     document: Document
+    partition_field_name: str | None = None
 
     @staticmethod
     def convert_order_by_to_sort(
@@ -59,6 +61,45 @@ class FetchSimpleMixinProtocol(Protocol):
         **pymongo_kwargs,
     ): ...
 
+    def create_raw_fetch_list_by_filter_cursor(
+        self,
+        filter_: Dict,
+        current_page: int = None,
+        page_size: int = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        sort: Union[None, List[Tuple[str, SortDirection]]] = None,
+        session: Optional[AsyncIOMotorClientSession] = None,
+        raw_document_class: Type[Mapping] = dict,
+        **pymongo_kwargs,
+    ): ...
+
+    async def fetch_list_by_filter_from_partitions(
+        self,
+        filter_: Dict,
+        current_page: int = None,
+        page_size: int = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        sort: Union[None, List[Tuple[str, SortDirection]]] = None,
+        session: Optional[AsyncIOMotorClientSession] = None,
+        lazy_parse: bool = False,
+        raw: bool = False,
+        raw_document_class: Type[Mapping] = dict,
+        **pymongo_kwargs,
+    ) -> List[Document | Mapping]: ...
+
+    async def fetch_count_from_partitions(
+        self,
+        filter_: Dict | None = None,
+        aggregation_pipeline: Optional[List[Dict]] = None,
+        **pymongo_kwargs,
+    ) -> int: ...
+
 
 T = TypeVar("T", bound=FetchSimpleMixinProtocol)
 
@@ -162,8 +203,46 @@ class FetchSimpleMixin(Generic[T]):
         lazy_parse: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        raw: bool = False,
+        raw_document_class: Type[Mapping] = dict,
         **pymongo_kwargs,
-    ) -> List[Document | Dict]:
+    ) -> List[Document | Mapping]:
+        """
+        With `raw`, the documents as the driver decodes them (`raw_document_class`),
+        skipping model validation; for read-only listings of many documents.
+        """
+        if self.partition_field_name is not None:
+            return await self.fetch_list_by_filter_from_partitions(
+                filter_,
+                current_page=current_page,
+                page_size=page_size,
+                order_by=order_by,
+                projection_model=projection_model,
+                skip=skip,
+                limit=limit,
+                sort=sort,
+                session=session,
+                lazy_parse=lazy_parse,
+                raw=raw,
+                raw_document_class=raw_document_class,
+                **pymongo_kwargs,
+            )
+
+        if raw:
+            return await self.create_raw_fetch_list_by_filter_cursor(
+                filter_,
+                current_page=current_page,
+                page_size=page_size,
+                order_by=order_by,
+                projection_model=projection_model,
+                skip=skip,
+                limit=limit,
+                sort=sort,
+                session=session,
+                raw_document_class=raw_document_class,
+                **pymongo_kwargs,
+            ).to_list(length=None)
+
         return await self.create_fetch_list_by_filter_query(
             filter_,
             projection_model=projection_model,
@@ -199,8 +278,60 @@ class FetchSimpleMixin(Generic[T]):
         lazy_parse: bool = False,
         nesting_depth: Optional[int] = None,
         nesting_depths_per_field: Optional[Dict[str, int]] = None,
+        raw: bool = False,
+        raw_document_class: Type[Mapping] = dict,
         **pymongo_kwargs,
     ) -> dict:
+        if self.partition_field_name is not None:
+            result = await self.fetch_list_by_filter_from_partitions(
+                filter_,
+                current_page=current_page,
+                page_size=page_size,
+                order_by=order_by,
+                projection_model=projection_model,
+                sort=sort,
+                session=session,
+                lazy_parse=lazy_parse,
+                raw=raw,
+                raw_document_class=raw_document_class,
+                **pymongo_kwargs,
+            )
+            count = await self.fetch_count_from_partitions(filter_, session=session)
+
+            return {
+                "pagination": {
+                    "total": count,
+                    "current": current_page,
+                    "page_size": page_size or count,
+                },
+                "data": result,
+            }
+
+        if raw:
+            result = await self.create_raw_fetch_list_by_filter_cursor(
+                filter_,
+                current_page=current_page,
+                page_size=page_size,
+                order_by=order_by,
+                projection_model=projection_model,
+                sort=sort,
+                session=session,
+                raw_document_class=raw_document_class,
+                **pymongo_kwargs,
+            ).to_list(length=None)
+            count = await self.document.get_motor_collection().count_documents(
+                filter_, session=session
+            )
+
+            return {
+                "pagination": {
+                    "total": count,
+                    "current": current_page,
+                    "page_size": page_size or count,
+                },
+                "data": result,
+            }
+
         query = self.create_fetch_list_by_filter_query(
             filter_,
             projection_model=projection_model,
@@ -235,4 +366,7 @@ class FetchSimpleMixin(Generic[T]):
         self: T,
         filter_: Dict,
     ) -> int:
+        if self.partition_field_name is not None:
+            return await self.fetch_count_from_partitions(filter_)
+
         return await self.document.find(filter_).count()
@@ -0,0 +1,375 @@
+from asyncio import Lock
+from copy import deepcopy
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from typing import (
+    Any,
+    List,
+    Dict,
+    Type,
+    Tuple,
+    Optional,
+    Generic,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+)
+
+from beanie import Document
+from pydantic import BaseModel
+
+from ..utility.aggregation_mixin import make_hashable
+
+# the `$min` of the time field in every group, to tell which bucket it is in
+BUCKET_START_FIELD = "_bucket_start"
+
+
+@runtime_checkable
+class GroupByCacheMixinProtocol(Protocol):
+    document: Document
+    use_date_trunc: bool = False
+    group_by_timezone: str = "UTC"
+    group_by_start_of_week: str = "monday"
+    group_by_buckets_cache: Dict[Any, Dict[str, Any]]
+    group_by_bucket_cache_lag: float = 0
+    group_by_bucket_cache_max_entries: int = 256
+
+    def find_group_by_bucket_field(self, group_by_on: list[str]) -> tuple[str, str] | None: ...
+
+    def next_bucket_start(
+        self,
+        start: datetime,
+        unit: str,
+        timezone: str = "UTC",
+        start_of_week: str = "monday",
+    ) -> datetime: ...
+
+    def sort_objs(self, objs: List[Dict], sort: Dict | None) -> List[Dict]: ...
+
+    @staticmethod
+    def truncate_datetime(
+        value: datetime,
+        unit: str,
+        timezone: str = "UTC",
+        start_of_week: str = "monday",
+    ) -> datetime: ...
+
+    @staticmethod
+    def get_value_by_path(obj: Dict, path: str) -> Any: ...
+
+    def build_group_by_pipeline(
+        self,
+        group_by_on: list[str],
+        metrics: Dict[str, Tuple] | None = None,
+    ) -> List[Dict]: ...
+
+    @staticmethod
+    def prepare_skip_limit_for_aggregation(
+        current_page: Optional[int] = None,
+        page_size: Optional[int] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict]: ...
+
+    async def fetch_by_aggregation_pipeline(
+        self,
+        aggregation_pipeline: Optional[List[Dict]] = None,
+        first_filter: dict = None,
+        last_filter: dict = None,
+        **pymongo_kwargs,
+    ) -> List[Type[BaseModel] | Dict]: ...
+
+
+T = TypeVar("T", bound=GroupByCacheMixinProtocol)
+
+
+class GroupByCacheMixin(Generic[T]):
+    """
+    Group-by results of time buckets that are over (closed) kept in memory per
+    bucket; each call only aggregates the open buckets, the documents without
+    a time and the ranges invalidated since. Inserts, updates, deletes and
+    migrations through this object invalidate the buckets of the times they
+    touch themselves; writes of other processes need
+    `invalidate_group_by_buckets`.
+    """
+
+    async def fetch_group_by_with_bucket_cache(
+        self: T,
+        aggregation_pipeline: List[Dict],
+        group_by_on: list[str],
+        metrics: Dict[str, Tuple] | None = None,
+        first_filter: dict = None,
+        middle_filter: dict = None,
+        last_filter: dict = None,
+        sort: Dict | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        current_page: int = None,
+        page_size: int = None,
+        with_pagination: bool = False,
+        **pymongo_kwargs,
+    ) -> List[Type[BaseModel] | Dict] | Dict:
+        """
+        The group-by fetchers' result, `group_by_on` must have a time bucket,
+        see `find_group_by_bucket_field`. A bucket is closed once it ends more
+        than `group_by_bucket_cache_lag` seconds ago.
+        """
+        time_field, unit = self.find_group_by_bucket_field(group_by_on)
+        try:
+            key = make_hashable(
+                (
+                    self.document.get_collection_name(),
+                    aggregation_pipeline,
+                    group_by_on,
+                    metrics,
+                    first_filter,
+                    middle_filter,
+                    last_filter,
+                    self.use_date_trunc,
+                    self.group_by_timezone,
+                    self.group_by_start_of_week,
+                )
+            )
+        except TypeError:
+            # not cacheable, aggregated as a whole every time
+            key = None
+
+        entry = self.group_by_buckets_cache.get(key)
+        if entry is None:
+            entry = {
+                "time_field": time_field,
+                "unit": unit,
+                "timezone": self.group_by_timezone,
+                "start_of_week": self.group_by_start_of_week,
+                "lock": Lock(),
+                "buckets": dict(),
+                "closed_until": None,
+                "gaps": list(),
+            }
+            if key is not None:
+                if len(self.group_by_buckets_cache) >= self.group_by_bucket_cache_max_entries:
+                    del self.group_by_buckets_cache[next(iter(self.group_by_buckets_cache))]
+                self.group_by_buckets_cache[key] = entry
+
+        async with entry["lock"]:
+            boundary = self._prepare_bucket_cache_boundary(entry)
+            if entry["closed_until"] is not None:
+                boundary = max(boundary, entry["closed_until"])
+
+            number_of_gaps = len(entry["gaps"])
+            ranges = list(entry["gaps"])
+            if entry["closed_until"] is not None and entry["closed_until"] < boundary:
+                ranges.append((entry["closed_until"], boundary))
+
+            pipeline = list(aggregation_pipeline)
+            if middle_filter:
+                pipeline.append({"$match": middle_filter})
+            if entry["closed_until"] is not None:
+                pipeline.append(
+                    {
+                        "$match": {
+                            "$or": [
+                                *[{time_field: {"$gte": i, "$lt": j}} for i, j in ranges],
+                                {time_field: {"$gte": boundary}},
+                                {time_field: None},
+                            ]
+                        }
+                    }
+                )
+            # copied first, the grouping may replace the time field by a string
+            pipeline.append({"$addFields": {BUCKET_START_FIELD: f"${time_field}"}})
+            pipeline.extend(
+                self.build_group_by_pipeline(
+                    group_by_on=group_by_on,
+                    metrics={**(metrics or {}), BUCKET_START_FIELD: ("min", BUCKET_START_FIELD)},
+                )
+            )
+
+            objs = await self.fetch_by_aggregation_pipeline(
+                aggregation_pipeline=pipeline,
+                first_filter=first_filter,
+                last_filter=last_filter,
+                **pymongo_kwargs,
+            )
+
+            closed = dict()
+            fresh = list()
+            for obj in objs:
+                start = obj.pop(BUCKET_START_FIELD, None)
+                if isinstance(start, datetime):
+                    start = self.truncate_datetime(
+                        start,
+                        unit,
+                        entry["timezone"],
+                        entry["start_of_week"],
+                    )
+                    if start < boundary:
+                        closed.setdefault(start, list()).append(obj)
+                        continue
+
+                fresh.append(obj)
+
+            # invalidations while the query ran are kept for the next call
+            entry["gaps"] = entry["gaps"][number_of_gaps:]
+            entry["buckets"].update(closed)
+            entry["closed_until"] = boundary
+
+            result = [obj for objs in entry["buckets"].values() for obj in objs]
+
+        result = self.sort_objs([*result, *fresh], sort)
+        count = len(result)
+        for stage in self.prepare_skip_limit_for_aggregation(
+            current_page=current_page,
+            page_size=page_size,
+            skip=skip,
+            limit=limit,
+        ):
+            if "$skip" in stage:
+                result = result[stage["$skip"]:]
+            else:
+                result = result[: stage["$limit"]]
+
+        result = deepcopy(result)
+        if projection_model:
+            result = [projection_model.model_validate(i) for i in result]
+
+        if not with_pagination:
+            return result
+
+        return {
+            "pagination": {
+                "total": count,
+                "current": current_page,
+                "page_size": limit or page_size or count,
+            },
+            "data": result,
+        }
+
+    def invalidate_group_by_buckets(
+        self: T,
+        time_field: str,
+        since: datetime,
+        until: Optional[datetime] = None,
+    ) -> int:
+        """
+        Forget the closed buckets of `time_field` holding any time from `since`
+        through `until` (by default through the last closed bucket); they are
+        aggregated again on their next use. Returns the number of buckets dropped.
+        """
+        time_field = time_field.replace(self.field_separator, ".")
+        since, until = [
+            i.astimezone(timezone.utc).replace(tzinfo=None) if i and i.tzinfo else i
+            for i in (since, until)
+        ]
+
+        number_of_dropped = 0
+        for entry in self.group_by_buckets_cache.values():
+            if entry["time_field"] != time_field:
+                continue
+
+            arguments = (entry["unit"], entry["timezone"], entry["start_of_week"])
+            start = self.truncate_datetime(since, *arguments)
+            end = self._prepare_bucket_cache_boundary(entry)
+            if until is not None:
+                end = min(
+                    end,
+                    self.next_bucket_start(self.truncate_datetime(until, *arguments), *arguments),
+                )
+            if start >= end:
+                continue
+
+            for bucket_start in [i for i in entry["buckets"] if start <= i < end]:
+                del entry["buckets"][bucket_start]
+                number_of_dropped += 1
+            entry["gaps"].append((start, end))
+
+        return number_of_dropped
+
+    def invalidate_group_by_buckets_by_objs(self: T, objs: List[Document]) -> int:
+        if not self.group_by_buckets_cache:
+            return 0
+
+        times_fields = {i["time_field"] for i in self.group_by_buckets_cache.values()}
+        number_of_dropped = 0
+        for obj in objs:
+            values = obj.model_dump(by_alias=True)
+            for time_field in times_fields:
+                value = self.get_value_by_path(values, time_field)
+                if isinstance(value, datetime):
+                    number_of_dropped += self.invalidate_group_by_buckets(
+                        time_field,
+                        since=value,
+                        until=value,
+                    )
+
+        return number_of_dropped
+
+    async def fetch_group_by_buckets_times(
+        self: T,
+        filter_: Dict,
+        inputs_list: Optional[List[Dict]] = None,
+    ) -> List[Tuple[str, datetime, datetime]]:
+        """
+        Per time field of the cache, the range of the times of the documents
+        matching `filter_` and of the times `inputs_list` sets: the buckets a
+        write of them changes. Read before the write, invalidated after it by
+        `invalidate_group_by_buckets_by_times`.
+        """
+        if not self.group_by_buckets_cache:
+            return []
+
+        times_fields = sorted({i["time_field"] for i in self.group_by_buckets_cache.values()})
+        group = {"_id": None}
+        for index, time_field in enumerate(times_fields):
+            # dates only, `$min`/`$max` would compare other types first
+            value = {
+                "$cond": [{"$eq": [{"$type": f"${time_field}"}, "date"]}, f"${time_field}", None]
+            }
+            group[f"min_{index}"] = {"$min": value}
+            group[f"max_{index}"] = {"$max": value}
+
+        result = await self.document.get_motor_collection().aggregate(
+            [{"$match": filter_}, {"$group": group}]
+        ).to_list(length=None)
+
+        times = list()
+        for index, time_field in enumerate(times_fields):
+            values = [result[0][f"min_{index}"], result[0][f"max_{index}"]] if result else []
+            for inputs in inputs_list or []:
+                values.append(
+                    inputs[time_field]
+                    if time_field in inputs
+                    else self.get_value_by_path(inputs, time_field)
+                )
+            values = [
+                i.astimezone(timezone.utc).replace(tzinfo=None) if i.tzinfo else i
+                for i in values
+                if isinstance(i, datetime)
+            ]
+            if values:
+                times.append((time_field, min(values), max(values)))
+
+        return times
+
+    def invalidate_group_by_buckets_by_times(
+        self: T,
+        times: List[Tuple[str, datetime, datetime]],
+    ) -> int:
+        return sum(
+            self.invalidate_group_by_buckets(time_field, since=since, until=until)
+            for time_field, since, until in times
+        )
+
+    def _prepare_bucket_cache_boundary(self: T, entry: Dict[str, Any]) -> datetime:
+        """The start of the oldest open bucket, in naive UTC like the dates pymongo returns."""
+        return self.truncate_datetime(
+            datetime.now(timezone.utc).replace(tzinfo=None)
+            - timedelta(seconds=self.group_by_bucket_cache_lag),
+            entry["unit"],
+            entry["timezone"],
+            entry["start_of_week"],
+        )
@@ -1,5 +1,7 @@
 from typing import (
     Dict,
+    List,
+    Optional,
     Generic,
     Protocol,
     runtime_checkable,
@@ -13,10 +15,22 @@ from pymongo.errors import DuplicateKeyError
 @runtime_checkable
 class InsertMixinProtocol(Protocol):
     document: Document
+    partition_field_name: str | None = None
+    epoch_pid_suffix_digits: int = 4
 
     @staticmethod
     def calculate_epoch_pid(min: int = 1000, max: int = 10000) -> int: ...
 
+    async def insert_obj_with_search_tokens(self, obj: Document) -> Document: ...
+
+    def invalidate_group_by_buckets_by_objs(self, objs: List[Document]) -> int: ...
+
+    def add_distinct_values_by_objs(self, objs: List[Document]) -> None: ...
+
+    async def insert_into_partition(self, obj: Document) -> Document: ...
+
+    async def _insert_obj(self, obj: Document) -> None: ...
+
 
 T = TypeVar("T", bound=InsertMixinProtocol)
 
@@ -27,10 +41,31 @@ class InsertMixin(Generic[T]):
         inputs: Dict,
     ) -> Document:
         obj = self.document(**inputs)
-        await obj.insert()
+        await self._insert_obj(obj)
+        self.invalidate_group_by_buckets_by_objs([obj])
+        self.add_distinct_values_by_objs([obj])
         return obj
 
-    async def insert_one_by_epoch_pid(self: T, inputs: Dict, min=1000, max=10000) -> Document:
+    async def insert_one_by_epoch_pid(
+        self: T,
+        inputs: Dict,
+        min: Optional[int] = None,
+        max: Optional[int] = None,
+    ) -> Document:
+        """
+        `pid` is the epoch seconds followed by a random suffix in [`min`, `max`),
+        by default any of `epoch_pid_suffix_digits` digits; other widths would
+        break the creation time bounds and partition times of the pid.
+        """
+        lowest = 10 ** (self.epoch_pid_suffix_digits - 1)
+        min = lowest if min is None else min
+        max = lowest * 10 if max is None else max
+        if not lowest <= min < max <= lowest * 10:
+            raise ValueError(
+                f"epoch pid suffixes have {self.epoch_pid_suffix_digits} digits, "
+                f"got [{min}, {max})"
+            )
+
         while True:
             try:
                 inputs_with_pid = {
@@ -38,10 +73,18 @@ class InsertMixin(Generic[T]):
                     **inputs,
                 }
                 obj = self.document(**inputs_with_pid)
-                await obj.insert()
+                await self._insert_obj(obj)
+                self.invalidate_group_by_buckets_by_objs([obj])
+                self.add_distinct_values_by_objs([obj])
                 return obj
             except DuplicateKeyError as e:
                 if not getattr(e, "details", None):
                     raise
                 if e.details.get("keyPattern") != {"pid": 1}:
                     raise
+
+    async def _insert_obj(self: T, obj: Document) -> None:
+        if self.partition_field_name is None:
+            await self.insert_obj_with_search_tokens(obj)
+        else:
+            await self.insert_into_partition(obj)
@@ -0,0 +1,217 @@
+from asyncio import sleep
+from datetime import (
+    datetime,
+    timezone,
+)
+from inspect import isawaitable
+from time import monotonic
+from typing import (
+    Any,
+    List,
+    Dict,
+    Tuple,
+    Callable,
+    Optional,
+    Generic,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+)
+
+from beanie import Document
+from pymongo import (
+    ASCENDING,
+    UpdateOne,
+)
+
+MIGRATIONS_COLLECTION = "utilsbeanie_migrations"
+
+
+@runtime_checkable
+class MigrationMixinProtocol(Protocol):
+    document: Document
+    partition_field_name: str | None = None
+
+    async def refresh_search_tokens_by_ids(self, ids: List[Any]) -> int: ...
+
+    def is_search_tokens_affected(self, inputs: Dict) -> bool: ...
+
+    def add_distinct_values_by_inputs(self, inputs: Dict) -> None: ...
+
+    async def fetch_group_by_buckets_times(
+        self,
+        filter_: Dict,
+        inputs_list: Optional[List[Dict]] = None,
+    ) -> List[Tuple[str, datetime, datetime]]: ...
+
+    def invalidate_group_by_buckets_by_times(
+        self,
+        times: List[Tuple[str, datetime, datetime]],
+    ) -> int: ...
+
+
+T = TypeVar("T", bound=MigrationMixinProtocol)
+
+
+class MigrationMixin(Generic[T]):
+    async def run_migration(
+        self: T,
+        name: str,
+        filter_: Dict | None = None,
+        inputs: Dict | None = None,
+        transform: Optional[Callable] = None,
+        projection: Dict | None = None,
+        batch_size: int = 1000,
+        max_documents_per_second: float | None = None,
+        dry_run: bool = False,
+        restart: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        `$set` `inputs` on the documents matching `filter_`, or the inputs
+        `transform(batch)` (awaited when a coroutine) returns for each
+        document of a batch (None to leave one as is), in `_id` ordered
+        batches of `bulk_write`s, at most `max_documents_per_second`.
+
+        The checkpoint and metrics are kept under `name` in the
+        `MIGRATIONS_COLLECTION` after every batch, so running the migration
+        again resumes after the last written batch; `restart` starts over.
+        `dry_run` counts the documents that are left without writing.
+        """
+        if (inputs is None) == (transform is None):
+            raise ValueError("pass either `inputs` or `transform`")
+        if self.partition_field_name is not None:
+            raise ValueError("migrations write the document's own collection, not its partitions")
+
+        collection = self.document.get_motor_collection()
+        migrations = collection.database.get_collection(MIGRATIONS_COLLECTION)
+        filter_ = filter_ or {}
+
+        migration = None if restart else await migrations.find_one({"_id": name})
+        if migration is None:
+            migration = {
+                "_id": name,
+                "collection_name": collection.name,
+                "status": "running",
+                "last_id": None,
+                "processed": 0,
+                "matched": 0,
+                "modified": 0,
+                "batches": 0,
+                "elapsed": 0.0,
+            }
+
+        def batch_filter() -> Dict:
+            if migration["last_id"] is None:
+                return filter_
+            return {"$and": [filter_, {"_id": {"$gt": migration["last_id"]}}]}
+
+        if dry_run:
+            remaining = (
+                0
+                if migration["status"] == "done"
+                else await collection.count_documents(batch_filter())
+            )
+            return {**self._prepare_migration_metrics(migration), "remaining": remaining}
+
+        if migration["status"] == "done":
+            return self._prepare_migration_metrics(migration)
+
+        if transform is None:
+            projection = {"_id": 1}
+
+        started_at = monotonic()
+        elapsed = migration["elapsed"]
+        processed = 0
+        while True:
+            batch = await collection.find(
+                batch_filter(),
+                projection=projection,
+                sort=[("_id", ASCENDING)],
+                limit=batch_size,
+            ).to_list(length=batch_size)
+
+            if not batch:
+                migration["status"] = "done"
+                migration["elapsed"] = elapsed + monotonic() - started_at
+                await self._save_migration(migrations, migration)
+                return self._prepare_migration_metrics(migration)
+
+            if transform is None:
+                batch_inputs = [inputs] * len(batch)
+            else:
+                batch_inputs = transform(batch)
+                if isawaitable(batch_inputs):
+                    batch_inputs = await batch_inputs
+
+            operations = [
+                UpdateOne({"_id": i["_id"]}, {"$set": j})
+                for i, j in zip(batch, batch_inputs)
+                if j
+            ]
+            if operations:
+                times = await self.fetch_group_by_buckets_times(
+                    {"_id": {"$in": [i["_id"] for i, j in zip(batch, batch_inputs) if j]}},
+                    [j for j in batch_inputs if j],
+                )
+                result = await collection.bulk_write(operations, ordered=False)
+                migration["matched"] += result.matched_count
+                migration["modified"] += result.modified_count
+                self.invalidate_group_by_buckets_by_times(times)
+
+            if inputs is not None:
+                self.add_distinct_values_by_inputs(inputs)
+            else:
+                for i in batch_inputs:
+                    if i:
+                        self.add_distinct_values_by_inputs(i)
+
+            await self.refresh_search_tokens_by_ids(
+                [
+                    i["_id"]
+                    for i, j in zip(batch, batch_inputs)
+                    if j and self.is_search_tokens_affected(j)
+                ]
+            )
+
+            migration["last_id"] = batch[-1]["_id"]
+            migration["processed"] += len(batch)
+            migration["batches"] += 1
+            migration["elapsed"] = elapsed + monotonic() - started_at
+            await self._save_migration(migrations, migration)
+
+            processed += len(batch)
+            if max_documents_per_second:
+                delay = processed / max_documents_per_second - (monotonic() - started_at)
+                if delay > 0:
+                    await sleep(delay)
+
+    async def fetch_migration(self: T, name: str) -> Dict[str, Any] | None:
+        migrations = self.document.get_motor_collection().database.get_collection(
+            MIGRATIONS_COLLECTION
+        )
+        migration = await migrations.find_one({"_id": name})
+        return None if migration is None else self._prepare_migration_metrics(migration)
+
+    @staticmethod
+    async def _save_migration(migrations, migration: Dict[str, Any]) -> None:
+        await migrations.replace_one(
+            {"_id": migration["_id"]},
+            {**migration, "updated_at": datetime.now(timezone.utc)},
+            upsert=True,
+        )
+
+    @staticmethod
+    def _prepare_migration_metrics(migration: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "name": migration["_id"],
+            "status": migration["status"],
+            "last_id": migration["last_id"],
+            "processed": migration["processed"],
+            "matched": migration["matched"],
+            "modified": migration["modified"],
+            "batches": migration["batches"],
+            "elapsed": migration["elapsed"],
+            "documents_per_second": (
+                migration["processed"] / migration["elapsed"] if migration["elapsed"] else 0.0
+            ),
+        }
@@ -0,0 +1,191 @@
+from asyncio import (
+    Queue,
+    create_task,
+    gather,
+)
+from inspect import isawaitable
+from typing import (
+    Any,
+    List,
+    Dict,
+    Type,
+    Mapping,
+    Callable,
+    Optional,
+    Generic,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+)
+
+from beanie import Document
+from beanie.odm.documents import AsyncIOMotorClientSession
+
+
+@runtime_checkable
+class ParallelScanMixinProtocol(Protocol):
+    document: Document
+    field_separator: str = "__"
+    partition_field_name: str | None = None
+
+    def get_raw_collection(self, document_class: Type[Mapping] = dict): ...
+
+    @staticmethod
+    def prepare_scan_split_points(samples: List[Any], number_of_partitions: int) -> List[Any]: ...
+
+    @staticmethod
+    def prepare_scan_state(field_name: str, split_points: List[Any]) -> Dict[str, Any]: ...
+
+    @classmethod
+    def prepare_scan_partition_filter(
+        cls,
+        filter_: Dict | None,
+        field_name: str,
+        partition: Dict[str, Any],
+    ) -> Dict: ...
+
+    @staticmethod
+    def prepare_scan_projection(projection: Dict | None, field_name: str) -> Dict | None: ...
+
+    async def fetch_scan_split_points(
+        self,
+        number_of_partitions: int,
+        field_name: str = "_id",
+        samples_per_partition: int = 20,
+    ) -> List[Any]: ...
+
+
+T = TypeVar("T", bound=ParallelScanMixinProtocol)
+
+
+class ParallelScanMixin(Generic[T]):
+    async def fetch_scan_split_points(
+        self: T,
+        number_of_partitions: int,
+        field_name: str = "_id",
+        samples_per_partition: int = 20,
+    ) -> List[Any]:
+        """
+        Split points of `field_name` from a `$sample` of the whole collection
+        (fast, without a filter, on a random index walk) sorted by the index.
+        """
+        if self.partition_field_name is not None:
+            raise ValueError("parallel scans read the document's own collection, not its partitions")
+
+        field_name = field_name.replace(self.field_separator, ".")
+        samples = await self.document.get_motor_collection().aggregate(
+            [
+                {"$sample": {"size": number_of_partitions * samples_per_partition}},
+                {"$match": {field_name: {"$ne": None}}},
+                {"$project": {"_id": 0, "value": f"${field_name}"}},
+                {"$sort": {"value": 1}},
+            ]
+        ).to_list(length=None)
+
+        return self.prepare_scan_split_points(
+            [i["value"] for i in samples],
+            number_of_partitions=number_of_partitions,
+        )
+
+    async def parallel_scan(
+        self: T,
+        callback: Optional[Callable] = None,
+        queue: Optional[Queue] = None,
+        filter_: Dict | None = None,
+        number_of_partitions: int = 4,
+        field_name: str = "_id",
+        projection: Dict | None = None,
+        batch_size: int = 1000,
+        state: Dict[str, Any] | None = None,
+        on_checkpoint: Optional[Callable] = None,
+        session: Optional[AsyncIOMotorClientSession] = None,
+        raw_document_class: Type[Mapping] = dict,
+    ) -> Dict[str, Any]:
+        """
+        Scan the documents matching `filter_` with one cursor per range of
+        `field_name` (indexed, e.g. `_id` or a unique `pid`), concurrently,
+        and deliver `(partition_index, batch)` to `callback` (awaited when a
+        coroutine) or to `queue`, whose `maxsize` bounds the buffered batches.
+        A partition reads on only once its batch is delivered.
+
+        Returns the scan state (see `prepare_scan_state`), also passed to
+        `on_checkpoint` after every batch; a scan started with a saved state
+        resumes after the last delivered batch of each partition.
+        """
+        if (callback is None) == (queue is None):
+            raise ValueError("pass either `callback` or `queue`")
+        if self.partition_field_name is not None:
+            raise ValueError("parallel scans read the document's own collection, not its partitions")
+
+        if state is None:
+            state = self.prepare_scan_state(
+                field_name=field_name,
+                split_points=await self.fetch_scan_split_points(
+                    number_of_partitions=number_of_partitions,
+                    field_name=field_name,
+                ),
+            )
+        field_name = state["field_name"].replace(self.field_separator, ".")
+        collection = self.get_raw_collection(raw_document_class)
+
+        async def deliver(index: int, batch: List, key: str) -> None:
+            if queue is not None:
+                await queue.put((index, batch))
+            else:
+                result = callback(index, batch)
+                if isawaitable(result):
+                    await result
+
+            # any mapping, `RawBSONDocument`s too
+            last = batch[-1]
+            for i in key.split("."):
+                last = last.get(i) if isinstance(last, Mapping) else None
+
+            partition = state["partitions"][index]
+            partition["last"] = last
+            partition["count"] += len(batch)
+            await checkpoint()
+
+        async def checkpoint() -> None:
+            if on_checkpoint is not None:
+                result = on_checkpoint(state)
+                if isawaitable(result):
+                    await result
+
+        async def scan(index: int) -> None:
+            partition = state["partitions"][index]
+            # the documents outside the ranges are read by `_id`
+            key = "_id" if partition.get("split_points") else field_name
+            cursor = collection.find(
+                self.prepare_scan_partition_filter(filter_, field_name, partition),
+                projection=self.prepare_scan_projection(projection, key),
+                sort=[(key, 1)],
+                batch_size=batch_size,
+                session=session,
+            )
+
+            batch = list()
+            async for document in cursor:
+                batch.append(document)
+                if len(batch) == batch_size:
+                    await deliver(index, batch, key)
+                    batch = list()
+
+            if batch:
+                await deliver(index, batch, key)
+
+            partition["is_done"] = True
+            await checkpoint()
+
+        tasks = [
+            create_task(scan(index))
+            for index, partition in enumerate(state["partitions"])
+            if not partition["is_done"]
+        ]
+        try:
+            await gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        return state
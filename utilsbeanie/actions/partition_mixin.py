@@ -0,0 +1,441 @@
+from datetime import datetime
+from time import monotonic
+from typing import (
+    Any,
+    List,
+    Dict,
+    Type,
+    Tuple,
+    Union,
+    Mapping,
+    Optional,
+    Generic,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+)
+
+from beanie import (
+    Document,
+    SortDirection,
+)
+from beanie.odm.documents import AsyncIOMotorClientSession
+from beanie.odm.utils.parsing import parse_obj
+from beanie.odm.utils.projection import get_projection
+from bson import ObjectId
+from pydantic import (
+    BaseModel,
+    TypeAdapter,
+)
+from pymongo import IndexModel
+
+from ..constant import EnumOrderBy
+
+
+@runtime_checkable
+class PartitionMixinProtocol(Protocol):
+    document: Document
+    fields_names_for_search_tokens: Tuple[str, ...] = tuple()
+    search_tokens_field_name: str = "_search_tokens"
+    partition_field_name: str | None = None
+    partition_names_ttl: float = 60
+    partitions: Dict[str, datetime]
+    partitions_refreshed_at: float | None = None
+
+    @staticmethod
+    def get_value_by_path(obj: Dict, path: str) -> Any: ...
+
+    @staticmethod
+    def convert_order_by_to_sort(
+        order_by: Dict[str, EnumOrderBy] | None = None,
+    ) -> List: ...
+
+    @staticmethod
+    def convert_sort_for_aggregation(
+        sort: List | Dict | None = None,
+    ) -> Dict | None: ...
+
+    @staticmethod
+    def prepare_skip_limit(
+        current_page: Optional[int] = None,
+        page_size: Optional[int] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> dict: ...
+
+    def prepare_aggregation_pipeline(
+        self,
+        aggregation_pipeline: Optional[List[Dict]] = None,
+        first_filter: dict = None,
+        last_filter: dict = None,
+        sort: dict[str, SortDirection] = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        current_page: int = None,
+        page_size: int = None,
+    ) -> List[Dict]: ...
+
+    def prepare_search_tokens(self, values: Dict) -> List[str]: ...
+
+    def prepare_partition_time(self, value: Any) -> datetime | None: ...
+
+    def prepare_partition_start(self, time: datetime) -> datetime: ...
+
+    def prepare_next_partition_start(self, start: datetime) -> datetime: ...
+
+    def prepare_partition_name(self, collection_name: str, start: datetime) -> str: ...
+
+    def parse_partition_name(self, collection_name: str, name: str) -> datetime | None: ...
+
+    def prepare_partition_time_range(
+        self,
+        filter_: Dict | None,
+    ) -> Tuple[datetime | None, datetime | None]: ...
+
+    def filter_partition_starts(
+        self,
+        starts: List[datetime],
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> List[datetime]: ...
+
+    async def fetch_partitions(self, refresh: bool = False) -> Dict[str, datetime]: ...
+
+    async def fetch_partition_names_by_filter(self, filter_: Dict | None) -> List[str]: ...
+
+    async def aggregate_partitions(
+        self,
+        names: List[str],
+        first_filter: Dict | None = None,
+        branch_pipeline: Optional[List[Dict]] = None,
+        aggregation_pipeline: Optional[List[Dict]] = None,
+        raw_document_class: Type[Mapping] = dict,
+        **pymongo_kwargs,
+    ) -> List[Mapping]: ...
+
+
+T = TypeVar("T", bound=PartitionMixinProtocol)
+
+
+class PartitionMixin(Generic[T]):
+    """
+    With `partition_field_name` set, the insert mixins write each document
+    to the partition of its time (see `utility.PartitionMixin`), created
+    with the indexes of the document's own collection, and
+    `fetch_list_by_filter`, `fetch_by_aggregation_pipeline` (with their
+    pagination and streaming variants) and `fetch_count` read only the
+    partitions whose time range the filter overlaps, joined by `$unionWith`.
+    The approximate group-by, facet counts and distinct values read every
+    partition; rollups, parallel scans, `fetch_columns` and migrations raise. Other actions address a partition through
+    `get_partition_collection`.
+    """
+
+    def get_partition_collection(self: T, name: str, document_class: Type[Mapping] = dict):
+        collection = self.document.get_motor_collection().database.get_collection(name)
+        if collection.codec_options.document_class is document_class:
+            return collection
+
+        return collection.with_options(
+            codec_options=collection.codec_options.with_options(document_class=document_class)
+        )
+
+    async def fetch_partitions(self: T, refresh: bool = False) -> Dict[str, datetime]:
+        """Partition names and starts, listed again every `partition_names_ttl` seconds."""
+        refreshed_at = self.partitions_refreshed_at
+        if refresh or refreshed_at is None or monotonic() - refreshed_at >= self.partition_names_ttl:
+            collection_name = self.document.get_collection_name()
+            names = await self.document.get_motor_collection().database.list_collection_names(
+                filter={"name": {"$regex": f"^{collection_name}_[0-9]+$"}}
+            )
+            self.partitions.clear()
+            for name in names:
+                start = self.parse_partition_name(collection_name, name)
+                if start is not None:
+                    self.partitions[name] = start
+            self.partitions_refreshed_at = monotonic()
+
+        return dict(self.partitions)
+
+    async def fetch_partition_names_by_filter(self: T, filter_: Dict | None) -> List[str]:
+        """The partitions a document matching `filter_` can be in, oldest first."""
+        partitions = await self.fetch_partitions()
+        since, until = self.prepare_partition_time_range(filter_)
+        starts = set(self.filter_partition_starts(list(partitions.values()), since, until))
+        return sorted((i for i, j in partitions.items() if j in starts), key=partitions.get)
+
+    async def insert_into_partition(
+        self: T,
+        obj: Document,
+        session: Optional[AsyncIOMotorClientSession] = None,
+    ) -> Document:
+        """
+        `insert_one` of `obj.model_dump(by_alias=True)` into the partition of
+        its time. Unlike `obj.insert()`, the document's event actions,
+        `validate_on_save`, revision and link rules do not run.
+        """
+        values = obj.model_dump(by_alias=True)
+        if values.get("_id") is None:
+            values.pop("_id", None)
+            if self.partition_field_name == "_id":
+                values["_id"] = ObjectId()
+
+        time = self.prepare_partition_time(
+            self.get_value_by_path(values, self.partition_field_name)
+        )
+        if time is None:
+            raise ValueError(f"{self.partition_field_name!r} is required to pick a partition")
+
+        if self.fields_names_for_search_tokens:
+            values[self.search_tokens_field_name] = self.prepare_search_tokens(values)
+
+        name = self.prepare_partition_name(
+            self.document.get_collection_name(),
+            self.prepare_partition_start(time),
+        )
+        if name not in self.partitions:
+            await self._create_partition(name)
+
+        result = await self.get_partition_collection(name).insert_one(values, session=session)
+        obj.id = TypeAdapter(type(obj).model_fields["id"].annotation).validate_python(
+            result.inserted_id
+        )
+        return obj
+
+    async def drop_partitions_before(self: T, before: datetime) -> List[str]:
+        """Drop the partitions that end at or before `before`, whole collections at once."""
+        before = self.prepare_partition_time(before)
+        dropped = list()
+        for name, start in (await self.fetch_partitions(refresh=True)).items():
+            if self.prepare_next_partition_start(start) <= before:
+                await self.get_partition_collection(name).drop()
+                self.partitions.pop(name, None)
+                dropped.append(name)
+
+        return sorted(dropped)
+
+    async def aggregate_partitions(
+        self: T,
+        names: List[str],
+        first_filter: Dict | None = None,
+        branch_pipeline: Optional[List[Dict]] = None,
+        aggregation_pipeline: Optional[List[Dict]] = None,
+        raw_document_class: Type[Mapping] = dict,
+        **pymongo_kwargs,
+    ) -> List[Mapping]:
+        """
+        `aggregation_pipeline` over the documents of partitions `names` that
+        match `first_filter`; `branch_pipeline` runs in each partition first
+        (e.g. a `$sort` and `$limit` the union repeats).
+        """
+        if not names:
+            return []
+
+        return await self.create_partitions_cursor(
+            names,
+            first_filter=first_filter,
+            branch_pipeline=branch_pipeline,
+            aggregation_pipeline=aggregation_pipeline,
+            raw_document_class=raw_document_class,
+            **pymongo_kwargs,
+        ).to_list(length=None)
+
+    def create_partitions_cursor(
+        self: T,
+        names: List[str],
+        first_filter: Dict | None = None,
+        branch_pipeline: Optional[List[Dict]] = None,
+        aggregation_pipeline: Optional[List[Dict]] = None,
+        raw_document_class: Type[Mapping] = dict,
+        **pymongo_kwargs,
+    ):
+        """The cursor of `aggregate_partitions`, an empty list when `names` is empty."""
+        if not names:
+            return []
+
+        branch = [{"$match": first_filter}] if first_filter else []
+        branch.extend(branch_pipeline or [])
+        union_pipeline = [
+            *branch,
+            *[{"$unionWith": {"coll": i, "pipeline": branch}} for i in names[1:]],
+            *(aggregation_pipeline or []),
+        ]
+        return self.get_partition_collection(names[0], raw_document_class).aggregate(
+            union_pipeline, **pymongo_kwargs
+        )
+
+    def prepare_partitions_list_pipelines(
+        self: T,
+        current_page: int = None,
+        page_size: int = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        sort: Union[None, List[Tuple[str, SortDirection]]] = None,
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """The branch and union pipelines of `fetch_list_by_filter_from_partitions`."""
+        skip_limit = self.prepare_skip_limit(
+            current_page=current_page,
+            page_size=page_size,
+            skip=skip,
+            limit=limit,
+        )
+        sort = self.convert_sort_for_aggregation(
+            self.convert_order_by_to_sort(order_by=order_by) or sort
+        )
+
+        # each partition sorts and cuts its own candidates for the page
+        branch_pipeline = [{"$sort": sort}] if sort else []
+        if "limit" in skip_limit:
+            branch_pipeline.append({"$limit": skip_limit.get("skip", 0) + skip_limit["limit"]})
+
+        aggregation_pipeline = [{"$sort": sort}] if sort else []
+        if "skip" in skip_limit:
+            aggregation_pipeline.append({"$skip": skip_limit["skip"]})
+        if "limit" in skip_limit:
+            aggregation_pipeline.append({"$limit": skip_limit["limit"]})
+        projection = get_projection(projection_model) if projection_model else None
+        if projection:
+            aggregation_pipeline.append({"$project": projection})
+
+        return branch_pipeline, aggregation_pipeline
+
+    def prepare_partitions_aggregation_pipeline(
+        self: T,
+        aggregation_pipeline: Optional[List[Dict]] = None,
+        last_filter: dict = None,
+        sort: dict[str, SortDirection] = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        current_page: int = None,
+        page_size: int = None,
+    ) -> List[Dict]:
+        """The union pipeline of `fetch_by_aggregation_pipeline_from_partitions`."""
+        _aggregation_pipeline = self.prepare_aggregation_pipeline(
+            aggregation_pipeline=aggregation_pipeline,
+            last_filter=last_filter,
+            sort=sort,
+            order_by=order_by,
+            skip=skip,
+            limit=limit,
+            current_page=current_page,
+            page_size=page_size,
+        )
+        projection = get_projection(projection_model) if projection_model else None
+        if projection:
+            _aggregation_pipeline.append({"$project": projection})
+
+        return _aggregation_pipeline
+
+    async def fetch_list_by_filter_from_partitions(
+        self: T,
+        filter_: Dict,
+        current_page: int = None,
+        page_size: int = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        sort: Union[None, List[Tuple[str, SortDirection]]] = None,
+        session: Optional[AsyncIOMotorClientSession] = None,
+        lazy_parse: bool = False,
+        raw: bool = False,
+        raw_document_class: Type[Mapping] = dict,
+        **pymongo_kwargs,
+    ) -> List[Document | Mapping]:
+        branch_pipeline, aggregation_pipeline = self.prepare_partitions_list_pipelines(
+            current_page=current_page,
+            page_size=page_size,
+            order_by=order_by,
+            projection_model=projection_model,
+            skip=skip,
+            limit=limit,
+            sort=sort,
+        )
+        result = await self.aggregate_partitions(
+            await self.fetch_partition_names_by_filter(filter_),
+            first_filter=filter_,
+            branch_pipeline=branch_pipeline,
+            aggregation_pipeline=aggregation_pipeline,
+            raw_document_class=raw_document_class,
+            session=session,
+            **pymongo_kwargs,
+        )
+        if raw:
+            return result
+
+        model = projection_model or self.document
+        return [parse_obj(model, i, lazy_parse=lazy_parse) for i in result]
+
+    async def fetch_by_aggregation_pipeline_from_partitions(
+        self: T,
+        aggregation_pipeline: Optional[List[Dict]] = None,
+        first_filter: dict = None,
+        last_filter: dict = None,
+        sort: dict[str, SortDirection] = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        current_page: int = None,
+        page_size: int = None,
+        raw: bool = False,
+        raw_document_class: Type[Mapping] = dict,
+        **pymongo_kwargs,
+    ) -> List[Type[BaseModel] | Mapping]:
+        _aggregation_pipeline = self.prepare_partitions_aggregation_pipeline(
+            aggregation_pipeline=aggregation_pipeline,
+            last_filter=last_filter,
+            sort=sort,
+            order_by=order_by,
+            projection_model=projection_model,
+            skip=skip,
+            limit=limit,
+            current_page=current_page,
+            page_size=page_size,
+        )
+        result = await self.aggregate_partitions(
+            await self.fetch_partition_names_by_filter(first_filter),
+            first_filter=first_filter,
+            aggregation_pipeline=_aggregation_pipeline,
+            raw_document_class=raw_document_class,
+            **pymongo_kwargs,
+        )
+        if raw or projection_model is None:
+            return result
+
+        return [parse_obj(projection_model, i) for i in result]
+
+    async def fetch_count_from_partitions(
+        self: T,
+        filter_: Dict | None = None,
+        aggregation_pipeline: Optional[List[Dict]] = None,
+        **pymongo_kwargs,
+    ) -> int:
+        result = await self.aggregate_partitions(
+            await self.fetch_partition_names_by_filter(filter_),
+            first_filter=filter_,
+            aggregation_pipeline=[*(aggregation_pipeline or []), {"$count": "count"}],
+            **pymongo_kwargs,
+        )
+        return result[0]["count"] if result else 0
+
+    async def _create_partition(self: T, name: str) -> None:
+        """Copy the indexes of the document's own collection to partition `name`."""
+        indexes = list()
+        async for index in self.document.get_motor_collection().list_indexes():
+            if index["name"] == "_id_":
+                continue
+            options = {i: j for i, j in index.items() if i not in ("v", "key", "ns")}
+            indexes.append(IndexModel(list(index["key"].items()), **options))
+
+        collection = self.get_partition_collection(name)
+        if indexes:
+            await collection.create_indexes(indexes)
+
+        self.partitions[name] = self.parse_partition_name(
+            self.document.get_collection_name(), name
+        )
@@ -0,0 +1,276 @@
+from asyncio import Lock
+from copy import deepcopy
+from datetime import (
+    datetime,
+    timezone,
+)
+from time import monotonic
+from typing import (
+    Any,
+    List,
+    Dict,
+    Optional,
+    Generic,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+)
+
+from beanie import Document
+from bson import encode
+from pymongo import DESCENDING
+
+from ..constant import EnumReferenceConsistency
+
+
+@runtime_checkable
+class ReferenceCacheMixinProtocol(Protocol):
+    document: Document
+    reference_collections: Dict[str, Dict[str, Any]]
+    reference_cache_max_bytes: int
+
+    @staticmethod
+    def get_value_by_path(obj: Dict, path: str) -> Any: ...
+
+    @staticmethod
+    def _as_list(value: Any) -> List[Any]: ...
+
+    @staticmethod
+    def _is_inclusion_projection(projection: Dict) -> bool: ...
+
+
+T = TypeVar("T", bound=ReferenceCacheMixinProtocol)
+
+_MISSING = object()
+
+
+class ReferenceCacheMixin(Generic[T]):
+    """
+    Small, rarely changing collections (categories, currencies, tenants, ...)
+    held fully in memory, grouped by the foreign field they are joined on.
+    `fetch_by_application_join` resolves lookups into a registered collection
+    from memory instead of querying it.
+    `reference_collections` may be shared by several `UtilsBeanie` objects;
+    `reference_cache_max_bytes` bounds the BSON size of everything it holds.
+    """
+
+    def register_reference_collection(
+        self: T,
+        collection_name: str,
+        foreign_field: str = "pid",
+        projection: Optional[Dict[str, Any]] = None,
+        consistency_mode: EnumReferenceConsistency = EnumReferenceConsistency.INTERVAL,
+        refresh_interval: float = 300,
+        version_field: str = "_id",
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        """
+        With `EnumReferenceConsistency.VERSION`, one small query per use reads
+        the count and the greatest `version_field`; with the default `_id`
+        inserts and deletes are seen but in-place updates are not, so use a
+        field every write sets (e.g. `updated_at`) when documents change.
+        """
+        if projection and self._is_inclusion_projection(projection):
+            projection = {**projection, foreign_field: 1}
+
+        self.reference_collections[collection_name] = {
+            "collection_name": collection_name,
+            "foreign_field": foreign_field,
+            "projection": projection,
+            "consistency_mode": EnumReferenceConsistency(consistency_mode),
+            "refresh_interval": refresh_interval,
+            "version_field": version_field,
+            "max_bytes": max_bytes,
+            "lock": Lock(),
+            "objs": None,
+            "version": None,
+            "loaded_at": None,
+            "stats": {
+                "loads": 0,
+                "rejected_loads": 0,
+                "hits": 0,
+                "fallbacks": 0,
+                "number_of_objs": 0,
+                "size_bytes": 0,
+                "last_loaded_at": None,
+                "last_load_duration": None,
+            },
+        }
+
+    def unregister_reference_collection(self: T, collection_name: str) -> None:
+        self.reference_collections.pop(collection_name, None)
+
+    async def load_reference_collection(self: T, collection_name: str) -> bool:
+        """
+        Read the whole collection into memory. Returns False, and leaves
+        lookups to the server, when it does not fit in the memory budget.
+        """
+        entry = self.reference_collections[collection_name]
+        collection = self.document.get_motor_collection().database.get_collection(
+            collection_name
+        )
+
+        max_bytes = self.reference_cache_max_bytes - sum(
+            i["stats"]["size_bytes"]
+            for i in self.reference_collections.values()
+            if i is not entry
+        )
+        if entry["max_bytes"] is not None:
+            max_bytes = min(max_bytes, entry["max_bytes"])
+
+        started_at = monotonic()
+        version = None
+        if entry["consistency_mode"] == EnumReferenceConsistency.VERSION:
+            # read before the documents, so a write during the load is seen
+            # as a new version on the next use.
+            version = await self.fetch_reference_collection_version(entry)
+
+        objs = dict()
+        number_of_objs = 0
+        size_bytes = 0
+        async for obj in collection.find({}, projection=entry["projection"]):
+            size_bytes += len(encode(obj))
+            if size_bytes > max_bytes:
+                objs = None
+                break
+
+            number_of_objs += 1
+            for key in self._as_list(self.get_value_by_path(obj, entry["foreign_field"])):
+                objs.setdefault(key, list()).append(obj)
+
+        entry["loaded_at"] = monotonic()
+        stats = entry["stats"]
+        stats["last_loaded_at"] = datetime.now(timezone.utc)
+        stats["last_load_duration"] = entry["loaded_at"] - started_at
+
+        if objs is None:
+            entry["objs"] = None
+            entry["version"] = version
+            stats["rejected_loads"] += 1
+            stats["number_of_objs"] = 0
+            stats["size_bytes"] = 0
+            return False
+
+        entry["objs"] = objs
+        entry["version"] = version
+        stats["loads"] += 1
+        stats["number_of_objs"] = number_of_objs
+        stats["size_bytes"] = size_bytes
+        return True
+
+    async def refresh_reference_collections(
+        self: T,
+        collections_names: Optional[List[str]] = None,
+    ) -> Dict[str, bool]:
+        result = dict()
+        for collection_name in collections_names or list(self.reference_collections):
+            async with self.reference_collections[collection_name]["lock"]:
+                result[collection_name] = await self.load_reference_collection(
+                    collection_name
+                )
+
+        return result
+
+    async def fetch_reference_collection_version(self: T, entry: Dict[str, Any]) -> tuple:
+        collection = self.document.get_motor_collection().database.get_collection(
+            entry["collection_name"]
+        )
+        count = await collection.count_documents({})
+        last = await collection.find_one(
+            {},
+            projection={entry["version_field"]: 1},
+            sort=[(entry["version_field"], DESCENDING)],
+        )
+        return count, self.get_value_by_path(last, entry["version_field"]) if last else None
+
+    async def fetch_reference_objs(
+        self: T,
+        lookup: Dict[str, Any],
+        keys: List[Any],
+    ) -> Optional[Dict[Any, List[Dict]]]:
+        """
+        Foreign objs of `keys` grouped like `fetch_foreign_objs`, or None when
+        the lookup can not be resolved from memory.
+        """
+        entry = self.reference_collections.get(lookup["lookup_from"])
+        if entry is None or entry["foreign_field"] != lookup["lookup_foreign_field"]:
+            return None
+
+        async with entry["lock"]:
+            if await self._is_reference_collection_stale(entry):
+                await self.load_reference_collection(entry["collection_name"])
+
+        objs = entry["objs"]
+        if objs is None:
+            entry["stats"]["fallbacks"] += 1
+            return None
+
+        entry["stats"]["hits"] += 1
+        return {
+            key: [self._project_obj(i, lookup["projection_fields"]) for i in objs[key]]
+            for key in keys
+            if key in objs
+        }
+
+    def get_reference_cache_stats(self: T) -> Dict[str, Dict[str, Any]]:
+        return {
+            collection_name: {
+                "consistency_mode": entry["consistency_mode"],
+                "is_loaded": entry["objs"] is not None,
+                **entry["stats"],
+            }
+            for collection_name, entry in self.reference_collections.items()
+        }
+
+    async def _is_reference_collection_stale(self: T, entry: Dict[str, Any]) -> bool:
+        if entry["loaded_at"] is None:
+            return True
+
+        if entry["consistency_mode"] == EnumReferenceConsistency.INTERVAL:
+            return monotonic() - entry["loaded_at"] >= entry["refresh_interval"]
+
+        if entry["consistency_mode"] == EnumReferenceConsistency.VERSION:
+            return entry["version"] != await self.fetch_reference_collection_version(entry)
+
+        return False
+
+    def _project_obj(self: T, obj: Dict, projection: Dict) -> Dict:
+        """A copy of a cached obj, as a `$project` of simple 0/1 paths would return it."""
+        if not projection:
+            return deepcopy(obj)
+
+        if not self._is_inclusion_projection(projection):
+            result = deepcopy(obj)
+            for key, value in projection.items():
+                if value in (0, False):
+                    *parents, last = key.split(".")
+                    parent = result
+                    for i in parents:
+                        parent = parent.get(i) if isinstance(parent, dict) else None
+                    if isinstance(parent, dict):
+                        parent.pop(last, None)
+
+            return result
+
+        result = dict()
+        if projection.get("_id", 1) not in (0, False) and "_id" in obj:
+            result["_id"] = obj["_id"]
+
+        for key, value in projection.items():
+            if key == "_id" or value in (0, False):
+                continue
+
+            *parents, last = key.split(".")
+            source = obj
+            target = result
+            for i in parents:
+                source = source.get(i, _MISSING) if isinstance(source, dict) else _MISSING
+                if not isinstance(source, dict):
+                    break
+                target = target.setdefault(i, dict())
+
+            else:
+                if last in source:
+                    target[last] = deepcopy(source[last])
+
+        return result
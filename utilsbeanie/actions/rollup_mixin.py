@@ -0,0 +1,285 @@
+from asyncio import (
+    gather,
+    Lock,
+)
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from time import monotonic
+from typing import (
+    Any,
+    List,
+    Dict,
+    Type,
+    Tuple,
+    Optional,
+    Generic,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+)
+
+from beanie import Document
+from bson import ObjectId
+from pydantic import BaseModel
+
+from ..constant import DATETIME_BY_X_PART
+
+ROLLUP_WATERMARKS_COLLECTION = "utilsbeanie_rollup_watermarks"
+
+
+@runtime_checkable
+class RollupMixinProtocol(Protocol):
+    document: Document
+    field_separator: str = "__"
+    group_by_timezone: str = "UTC"
+    group_by_start_of_week: str = "monday"
+    partition_field_name: str | None = None
+    rollups: Dict[str, Dict[str, Any]]
+
+    @staticmethod
+    def split_datetime_suffix(field_name: str) -> tuple[str, str | None]: ...
+
+    @staticmethod
+    def parse_datetime_suffix(suffix: str) -> tuple[str, int]: ...
+
+    def build_rollup_pipeline(
+        self,
+        rollup: Dict[str, Any],
+        since: datetime | None = None,
+    ) -> List[Dict]: ...
+
+    def build_rollup_group_by_pipeline(
+        self,
+        group_by_on: list[str],
+        metrics: Dict[str, Tuple] | None = None,
+    ) -> List[Dict]: ...
+
+    @staticmethod
+    def truncate_datetime(
+        value: datetime,
+        unit: str,
+        timezone: str = "UTC",
+        start_of_week: str = "monday",
+    ) -> datetime: ...
+
+    @staticmethod
+    def prepare_skip_limit_for_aggregation(
+        current_page: Optional[int] = None,
+        page_size: Optional[int] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict]: ...
+
+
+T = TypeVar("T", bound=RollupMixinProtocol)
+
+
+class RollupMixin(Generic[T]):
+    """
+    Rollups: group-by results kept in their own collection per time bucket,
+    updated by `$merge` for the buckets that received documents since the
+    last refresh, and used by the group-by fetchers when
+    `find_covering_rollup` finds one that gives the same result.
+    New documents are found by their `_id` (an `ObjectId`) being newer than
+    the watermark minus `lag` seconds, so late inserts with old timestamps
+    are picked up; updates and deletes are not found, `refresh_rollup(since=...)`
+    rebuilds every bucket from `since` after them.
+    """
+
+    def register_rollup(
+        self: T,
+        name: str,
+        time_field: str,
+        time_bucket: str = "_by_year_month_day",
+        group_by_on: Tuple[str, ...] = tuple(),
+        metrics: Dict[str, Tuple] | None = None,
+        collection_name: Optional[str] = None,
+        max_staleness: float = 60,
+        lag: float = 60,
+    ) -> None:
+        """
+        `time_bucket` is a bucket suffix of `DATETIME_BY_X_DATE_TRUNC`;
+        `metrics` may use "count", "sum", "avg", "min" and "max". A query is
+        refreshed first when the rollup is older than `max_staleness` seconds.
+        """
+        if time_bucket in DATETIME_BY_X_PART:
+            raise ValueError(f"{time_bucket!r} is a part of the date, not a bucket")
+
+        unit, bin_size = self.parse_datetime_suffix(time_bucket)
+        if bin_size != 1:
+            raise ValueError(f"rollup buckets are single units, got {time_bucket!r}")
+
+        metrics = {key: tuple(value) for key, value in (metrics or {}).items()}
+        for metric_name, (operator, *_) in metrics.items():
+            if operator not in ("count", "sum", "avg", "min", "max"):
+                raise ValueError(f"{operator!r} of {metric_name!r} can not be rolled up")
+
+        time_field = time_field.replace(self.field_separator, ".")
+        keys = [i.replace(self.field_separator, ".") for i in group_by_on]
+        if time_field in keys:
+            raise ValueError(f"{time_field!r} is the time field of the rollup")
+
+        self.rollups[name] = {
+            "name": name,
+            "collection_name": collection_name
+            or f"{self.document.get_collection_name()}_rollup_{name}",
+            "time_field": time_field,
+            "unit": unit,
+            "keys": keys,
+            "metrics": metrics,
+            "timezone": self.group_by_timezone,
+            "start_of_week": self.group_by_start_of_week,
+            "max_staleness": max_staleness,
+            "lag": lag,
+            "lock": Lock(),
+            "refreshed_at": None,
+        }
+
+    async def refresh_rollup(
+        self: T,
+        name: str,
+        since: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        Recompute the buckets from `since` (widened to its bucket start), by
+        default from the oldest bucket of the documents inserted since the
+        watermark; the first refresh builds every bucket. The buckets from
+        `since` are removed first, so the groups left without documents go.
+        """
+        if self.partition_field_name is not None:
+            raise ValueError("rollups read the document's own collection, not its partitions")
+
+        rollup = self.rollups[name]
+        collection = self.document.get_motor_collection()
+        watermarks = collection.database.get_collection(ROLLUP_WATERMARKS_COLLECTION)
+
+        async with rollup["lock"]:
+            last, state = await gather(
+                collection.find_one({}, projection={"_id": 1}, sort=[("_id", -1)]),
+                watermarks.find_one({"_id": rollup["collection_name"]}),
+            )
+            watermark = last["_id"].generation_time if last else None
+
+            is_required = True
+            if since is None and state is not None:
+                oldest = await collection.aggregate(
+                    [
+                        {
+                            "$match": {
+                                "_id": {
+                                    "$gt": ObjectId.from_datetime(
+                                        state["watermark"].replace(tzinfo=timezone.utc)
+                                        - timedelta(seconds=rollup["lag"])
+                                    )
+                                }
+                            }
+                        },
+                        {"$group": {"_id": None, "since": {"$min": f"${rollup['time_field']}"}}},
+                    ]
+                ).to_list(length=None)
+                since = oldest[0]["since"] if oldest else None
+                is_required = since is not None
+
+            if since is not None:
+                since = self.truncate_datetime(
+                    since,
+                    rollup["unit"],
+                    rollup["timezone"],
+                    rollup["start_of_week"],
+                )
+
+            if is_required:
+                await collection.database.get_collection(rollup["collection_name"]).delete_many(
+                    {} if since is None else {rollup["time_field"]: {"$gte": since}}
+                )
+                await collection.aggregate(
+                    self.build_rollup_pipeline(rollup, since=since)
+                ).to_list(length=None)
+
+            if watermark is not None:
+                await watermarks.update_one(
+                    {"_id": rollup["collection_name"]},
+                    {"$set": {"watermark": watermark, "refreshed_at": datetime.now(timezone.utc)}},
+                    upsert=True,
+                )
+            rollup["refreshed_at"] = monotonic()
+
+        return {"since": since, "is_refreshed": is_required, "watermark": watermark}
+
+    async def refresh_rollups(self: T) -> Dict[str, Dict[str, Any]]:
+        return {name: await self.refresh_rollup(name) for name in self.rollups}
+
+    async def fetch_group_by_from_rollup(
+        self: T,
+        rollup: Dict[str, Any],
+        group_by_on: list[str],
+        metrics: Dict[str, Tuple] | None = None,
+        first_filter: dict = None,
+        last_filter: dict = None,
+        sort: Dict | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        current_page: int = None,
+        page_size: int = None,
+        with_pagination: bool = False,
+        **pymongo_kwargs,
+    ) -> List[Type[BaseModel] | Dict] | Dict:
+        """The group-by fetchers' result computed from `rollup`, refreshed first when stale."""
+        if (
+            rollup["refreshed_at"] is None
+            or monotonic() - rollup["refreshed_at"] >= rollup["max_staleness"]
+        ):
+            await self.refresh_rollup(rollup["name"])
+
+        collection = self.document.get_motor_collection().database.get_collection(
+            rollup["collection_name"]
+        )
+
+        aggregation_pipeline = list()
+        if first_filter:
+            aggregation_pipeline.append({"$match": first_filter})
+        aggregation_pipeline.extend(
+            self.build_rollup_group_by_pipeline(group_by_on=group_by_on, metrics=metrics)
+        )
+        if last_filter:
+            aggregation_pipeline.append({"$match": last_filter})
+
+        aggregation_pipeline_for_count = [*aggregation_pipeline, {"$count": "count"}]
+
+        if sort:
+            aggregation_pipeline.append({"$sort": sort})
+        aggregation_pipeline.extend(
+            self.prepare_skip_limit_for_aggregation(
+                current_page=current_page,
+                page_size=page_size,
+                skip=skip,
+                limit=limit,
+            )
+        )
+
+        result = await collection.aggregate(aggregation_pipeline, **pymongo_kwargs).to_list(
+            length=None
+        )
+        if projection_model:
+            result = [projection_model.model_validate(i) for i in result]
+
+        if not with_pagination:
+            return result
+
+        count = await collection.aggregate(
+            aggregation_pipeline_for_count, **pymongo_kwargs
+        ).to_list(length=None)
+        count = 0 if not count else count[0]["count"]
+
+        return {
+            "pagination": {
+                "total": count,
+                "current": current_page,
+                "page_size": limit or page_size or count,
+            },
+            "data": result,
+        }
@@ -0,0 +1,273 @@
+from typing import (
+    Any,
+    List,
+    Dict,
+    Tuple,
+    Optional,
+    Generic,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+)
+
+from beanie import Document
+from beanie.odm.documents import AsyncIOMotorClientSession
+from pymongo import (
+    ASCENDING,
+    UpdateOne,
+)
+from pymongo.results import UpdateResult
+
+
+@runtime_checkable
+class SearchTokenMixinProtocol(Protocol):
+    document: Document
+    fields_names_for_search_tokens: Tuple[str, ...] = tuple()
+    search_tokens_field_name: str = "_search_tokens"
+
+    def prepare_search_tokens(self, values: Dict) -> List[str]: ...
+
+    def prepare_search_tokens_projection(self) -> Dict[str, int]: ...
+
+    def is_search_tokens_affected(self, inputs: Dict) -> bool: ...
+
+
+T = TypeVar("T", bound=SearchTokenMixinProtocol)
+
+
+class SearchTokenMixin(Generic[T]):
+    async def fetch_id_for_search_tokens(
+        self: T,
+        filter_: Dict,
+        inputs: Dict,
+    ) -> Any | None:
+        """
+        Id of the document a single update is about to touch. It is fetched
+        before the update because the filter may stop matching afterwards.
+        """
+        if not self.is_search_tokens_affected(inputs):
+            return None
+
+        obj = await self.document.get_motor_collection().find_one(filter_, projection={"_id": 1})
+        return obj["_id"] if obj else None
+
+    async def update_many_with_search_tokens(
+        self: T,
+        filter_: Dict,
+        update: Dict,
+        batch_size: int = 1000,
+    ) -> UpdateResult:
+        """
+        `update_many` in `_id` ordered batches, the tokens of each batch
+        refreshed right after it, so the ids held stay bounded and a failure
+        leaves at most one batch with stale tokens.
+        """
+        collection = self.document.get_motor_collection()
+        matched_count = 0
+        modified_count = 0
+        last_id = None
+        while True:
+            batch_filter = filter_
+            if last_id is not None:
+                batch_filter = {"$and": [filter_, {"_id": {"$gt": last_id}}]}
+
+            ids = [
+                i["_id"]
+                for i in await collection.find(
+                    batch_filter,
+                    projection={"_id": 1},
+                    sort=[("_id", ASCENDING)],
+                    limit=batch_size,
+                ).to_list(length=batch_size)
+            ]
+            if not ids:
+                return UpdateResult(
+                    {"n": matched_count, "nModified": modified_count, "ok": 1.0},
+                    acknowledged=True,
+                )
+
+            result = await collection.update_many(
+                {"$and": [{"_id": {"$in": ids}}, filter_]},
+                update,
+            )
+            matched_count += result.matched_count
+            modified_count += result.modified_count
+            await self.refresh_search_tokens_by_ids(ids)
+            last_id = ids[-1]
+
+    def set_search_tokens(self: T, obj: Document) -> bool:
+        """
+        Put the tokens of `obj` on the model, so `insert()`/`replace()` write
+        them with the document: into the field aliased `search_tokens_field_name`,
+        or into an extra field when the model allows extra fields. False when
+        the model can hold neither.
+        """
+        tokens = self.prepare_search_tokens(obj.model_dump(by_alias=True))
+        for name, field in type(obj).model_fields.items():
+            if (field.alias or name) == self.search_tokens_field_name:
+                setattr(obj, name, tokens)
+                return True
+
+        if obj.model_config.get("extra") == "allow":
+            obj.__pydantic_extra__[self.search_tokens_field_name] = tokens
+            return True
+
+        return False
+
+    async def insert_obj_with_search_tokens(
+        self: T,
+        obj: Document,
+        session: Optional[AsyncIOMotorClientSession] = None,
+    ) -> Document:
+        """
+        `obj.insert()` with the tokens in the inserted document, see
+        `set_search_tokens`; for a model that can not hold them they are set
+        right after the insert.
+        """
+        if not self.fields_names_for_search_tokens or self.set_search_tokens(obj):
+            return await obj.insert(session=session)
+
+        await obj.insert(session=session)
+        await self.refresh_search_tokens_by_objs([obj])
+        return obj
+
+    async def replace_obj_with_search_tokens(
+        self: T,
+        obj: Document,
+        session: Optional[AsyncIOMotorClientSession] = None,
+    ) -> Document:
+        """`obj.replace()` with the tokens in the replacement, like `insert_obj_with_search_tokens`."""
+        if not self.fields_names_for_search_tokens or self.set_search_tokens(obj):
+            return await obj.replace(session=session)
+
+        await obj.replace(session=session)
+        await self.refresh_search_tokens_by_objs([obj])
+        return obj
+
+    async def refresh_search_tokens_by_filter(
+        self: T,
+        filter_: Dict,
+        batch_size: int = 1000,
+    ) -> int:
+        if not self.fields_names_for_search_tokens:
+            return 0
+
+        collection = self.document.get_motor_collection()
+        cursor = collection.find(
+            filter_,
+            projection=self.prepare_search_tokens_projection(),
+            batch_size=batch_size,
+        )
+
+        number_of_updated = 0
+        operations = list()
+        async for i in cursor:
+            operations.append(
+                UpdateOne(
+                    {"_id": i["_id"]},
+                    {"$set": {self.search_tokens_field_name: self.prepare_search_tokens(i)}},
+                )
+            )
+
+            if len(operations) >= batch_size:
+                await collection.bulk_write(operations, ordered=False)
+                number_of_updated += len(operations)
+                operations = list()
+
+        if operations:
+            await collection.bulk_write(operations, ordered=False)
+            number_of_updated += len(operations)
+
+        return number_of_updated
+
+    async def refresh_search_tokens_by_ids(
+        self: T,
+        ids: List[Any],
+    ) -> int:
+        if not ids:
+            return 0
+
+        return await self.refresh_search_tokens_by_filter({"_id": {"$in": ids}})
+
+    async def refresh_search_tokens_by_objs(
+        self: T,
+        objs: List[Document],
+    ) -> None:
+        """
+        Set the tokens of `objs` again, e.g. after `replace()` of a model that
+        can not hold the tokens, see `set_search_tokens`.
+        """
+        if not self.fields_names_for_search_tokens:
+            return
+
+        operations = [
+            UpdateOne(
+                {"_id": obj.id},
+                {
+                    "$set": {
+                        self.search_tokens_field_name: self.prepare_search_tokens(
+                            obj.model_dump(by_alias=True)
+                        )
+                    }
+                },
+            )
+            for obj in objs
+            if obj is not None
+        ]
+        if operations:
+            await self.document.get_motor_collection().bulk_write(
+                operations, ordered=False
+            )
+
+    async def create_search_tokens_index(self: T) -> str:
+        return await self.document.get_motor_collection().create_index(
+            [(self.search_tokens_field_name, ASCENDING)]
+        )
+
+    async def backfill_search_tokens(
+        self: T,
+        filter_: Dict | None = None,
+        batch_size: int = 1000,
+        create_index: bool = True,
+    ) -> int:
+        """
+        Compute the tokens of documents written before search tokens were
+        enabled. Batches are `_id` ordered, so an interrupted run can be started
+        again with `filter_={"_id": {"$gt": last_id}}`.
+        """
+        if create_index:
+            await self.create_search_tokens_index()
+
+        collection = self.document.get_motor_collection()
+        projection = self.prepare_search_tokens_projection()
+        filter_ = filter_ or {}
+
+        number_of_updated = 0
+        last_id = None
+        while True:
+            batch_filter = filter_
+            if last_id is not None:
+                batch_filter = {"$and": [filter_, {"_id": {"$gt": last_id}}]}
+
+            batch = await collection.find(
+                batch_filter,
+                projection=projection,
+                sort=[("_id", ASCENDING)],
+                limit=batch_size,
+            ).to_list(length=batch_size)
+
+            if not batch:
+                return number_of_updated
+
+            await collection.bulk_write(
+                [
+                    UpdateOne(
+                        {"_id": i["_id"]},
+                        {"$set": {self.search_tokens_field_name: self.prepare_search_tokens(i)}},
+                    )
+                    for i in batch
+                ],
+                ordered=False,
+            )
+            number_of_updated += len(batch)
+            last_id = batch[-1]["_id"]
@@ -0,0 +1,318 @@
+from inspect import isawaitable
+from typing import (
+    Any,
+    List,
+    Dict,
+    Type,
+    Tuple,
+    Union,
+    Mapping,
+    Optional,
+    Iterable,
+    AsyncIterable,
+    AsyncIterator,
+    Generic,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+)
+
+from beanie import (
+    Document,
+    SortDirection,
+)
+from beanie.odm.documents import AsyncIOMotorClientSession
+from pydantic import BaseModel
+
+from ..constant import EnumOrderBy
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+@runtime_checkable
+class StreamJsonMixinProtocol(Protocol):
+    document: Document
+    partition_field_name: str | None = None
+
+    @staticmethod
+    def encode_json_document(document: Any) -> bytes: ...
+
+    def create_raw_fetch_list_by_filter_cursor(
+        self,
+        filter_: Dict,
+        current_page: int = None,
+        page_size: int = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        sort: Union[None, List[Tuple[str, SortDirection]]] = None,
+        session: Optional[AsyncIOMotorClientSession] = None,
+        raw_document_class: Type[Mapping] = dict,
+        **pymongo_kwargs,
+    ): ...
+
+    def prepare_aggregation_pipeline(
+        self,
+        aggregation_pipeline: Optional[List[Dict]] = None,
+        first_filter: dict = None,
+        last_filter: dict = None,
+        sort: dict[str, SortDirection] = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        current_page: int = None,
+        page_size: int = None,
+    ) -> List[Dict]: ...
+
+    def create_raw_aggregation_cursor(
+        self,
+        aggregation_pipeline: List[Dict],
+        projection_model: Optional[Type[BaseModel]] = None,
+        raw_document_class: Type[Mapping] = dict,
+        **pymongo_kwargs,
+    ): ...
+
+    async def fetch_partition_names_by_filter(self, filter_: Dict | None) -> List[str]: ...
+
+    def create_partitions_cursor(
+        self,
+        names: List[str],
+        first_filter: Dict | None = None,
+        branch_pipeline: Optional[List[Dict]] = None,
+        aggregation_pipeline: Optional[List[Dict]] = None,
+        raw_document_class: Type[Mapping] = dict,
+        **pymongo_kwargs,
+    ): ...
+
+    def prepare_partitions_list_pipelines(
+        self,
+        current_page: int = None,
+        page_size: int = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        sort: Union[None, List[Tuple[str, SortDirection]]] = None,
+    ) -> Tuple[List[Dict], List[Dict]]: ...
+
+    def prepare_partitions_aggregation_pipeline(
+        self,
+        aggregation_pipeline: Optional[List[Dict]] = None,
+        last_filter: dict = None,
+        sort: dict[str, SortDirection] = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        current_page: int = None,
+        page_size: int = None,
+    ) -> List[Dict]: ...
+
+    async def write_json(
+        self,
+        writer: Any,
+        documents: Iterable | AsyncIterable,
+        json_lines: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int: ...
+
+
+T = TypeVar("T", bound=StreamJsonMixinProtocol)
+
+
+class StreamJsonMixin(Generic[T]):
+    """
+    Results encoded to JSON (an array) or NDJSON (`json_lines`, one document
+    per line) in chunks of about `chunk_size` bytes as the cursor advances,
+    without models and without holding the result in memory.
+    """
+
+    async def iterate_json_chunks(
+        self: T,
+        documents: Iterable | AsyncIterable,
+        json_lines: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """The chunks of `documents` (a cursor or any iterable), e.g. for a streaming response."""
+        if not isinstance(documents, AsyncIterable):
+            documents = _iterate(documents)
+
+        separator = b"\n" if json_lines else b","
+        chunk = bytearray() if json_lines else bytearray(b"[")
+        is_first = True
+        async for document in documents:
+            if not json_lines and not is_first:
+                chunk += separator
+            chunk += self.encode_json_document(document)
+            if json_lines:
+                chunk += separator
+            is_first = False
+
+            if len(chunk) >= chunk_size:
+                yield bytes(chunk)
+                chunk.clear()
+
+        if not json_lines:
+            chunk += b"]"
+        if chunk:
+            yield bytes(chunk)
+
+    async def write_json(
+        self: T,
+        writer: Any,
+        documents: Iterable | AsyncIterable,
+        json_lines: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """
+        Write the chunks of `documents` to `writer` (its `write` may be a
+        coroutine; a `drain`, as on `asyncio.StreamWriter`, is awaited after
+        each chunk) and return the number of documents written.
+        """
+        count = 0
+
+        async def counted() -> AsyncIterator:
+            nonlocal count
+            async for document in (
+                documents if isinstance(documents, AsyncIterable) else _iterate(documents)
+            ):
+                count += 1
+                yield document
+
+        drain = getattr(writer, "drain", None)
+        async for chunk in self.iterate_json_chunks(
+            counted(),
+            json_lines=json_lines,
+            chunk_size=chunk_size,
+        ):
+            result = writer.write(chunk)
+            if isawaitable(result):
+                await result
+            if drain is not None:
+                await drain()
+
+        return count
+
+    async def stream_list_by_filter(
+        self: T,
+        writer: Any,
+        filter_: Dict,
+        current_page: int = None,
+        page_size: int = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        sort: Union[None, List[Tuple[str, SortDirection]]] = None,
+        session: Optional[AsyncIOMotorClientSession] = None,
+        json_lines: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        **pymongo_kwargs,
+    ) -> int:
+        """`fetch_list_by_filter(..., raw=True)` written to `writer`, see `write_json`."""
+        if self.partition_field_name is not None:
+            branch_pipeline, aggregation_pipeline = self.prepare_partitions_list_pipelines(
+                current_page=current_page,
+                page_size=page_size,
+                order_by=order_by,
+                projection_model=projection_model,
+                skip=skip,
+                limit=limit,
+                sort=sort,
+            )
+            cursor = self.create_partitions_cursor(
+                await self.fetch_partition_names_by_filter(filter_),
+                first_filter=filter_,
+                branch_pipeline=branch_pipeline,
+                aggregation_pipeline=aggregation_pipeline,
+                session=session,
+                **pymongo_kwargs,
+            )
+        else:
+            cursor = self.create_raw_fetch_list_by_filter_cursor(
+                filter_,
+                current_page=current_page,
+                page_size=page_size,
+                order_by=order_by,
+                projection_model=projection_model,
+                skip=skip,
+                limit=limit,
+                sort=sort,
+                session=session,
+                **pymongo_kwargs,
+            )
+        return await self.write_json(
+            writer,
+            cursor,
+            json_lines=json_lines,
+            chunk_size=chunk_size,
+        )
+
+    async def stream_by_aggregation_pipeline(
+        self: T,
+        writer: Any,
+        aggregation_pipeline: Optional[List[Dict]] = None,
+        first_filter: dict = None,
+        last_filter: dict = None,
+        sort: dict[str, SortDirection] = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        current_page: int = None,
+        page_size: int = None,
+        json_lines: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        **pymongo_kwargs,
+    ) -> int:
+        """
+        `fetch_by_aggregation_pipeline(..., raw=True)` written to `writer`, see
+        `write_json`. Group-by pipelines stream the same way; an already
+        fetched result (e.g. of `fetch_by_group_by_aggregation_pipeline`) can
+        be passed to `write_json` as is.
+        """
+        if self.partition_field_name is not None:
+            cursor = self.create_partitions_cursor(
+                await self.fetch_partition_names_by_filter(first_filter),
+                first_filter=first_filter,
+                aggregation_pipeline=self.prepare_partitions_aggregation_pipeline(
+                    aggregation_pipeline=aggregation_pipeline,
+                    last_filter=last_filter,
+                    sort=sort,
+                    order_by=order_by,
+                    projection_model=projection_model,
+                    skip=skip,
+                    limit=limit,
+                    current_page=current_page,
+                    page_size=page_size,
+                ),
+                **pymongo_kwargs,
+            )
+        else:
+            cursor = self.create_raw_aggregation_cursor(
+                self.prepare_aggregation_pipeline(
+                    aggregation_pipeline=aggregation_pipeline,
+                    first_filter=first_filter,
+                    last_filter=last_filter,
+                    sort=sort,
+                    order_by=order_by,
+                    skip=skip,
+                    limit=limit,
+                    current_page=current_page,
+                    page_size=page_size,
+                ),
+                projection_model=projection_model,
+                **pymongo_kwargs,
+            )
+        return await self.write_json(
+            writer,
+            cursor,
+            json_lines=json_lines,
+            chunk_size=chunk_size,
+        )
+
+
+async def _iterate(documents: Iterable) -> AsyncIterator:
+    for document in documents:
+        yield document
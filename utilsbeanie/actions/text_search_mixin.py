@@ -0,0 +1,66 @@
+from typing import (
+    Dict,
+    Tuple,
+    Generic,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+)
+
+from beanie import Document
+from pymongo import TEXT
+
+
+@runtime_checkable
+class TextSearchMixinProtocol(Protocol):
+    document: Document
+
+
+T = TypeVar("T", bound=TextSearchMixinProtocol)
+
+
+class TextSearchMixin(Generic[T]):
+    async def fetch_text_index(self: T) -> Dict | None:
+        """MongoDB allows a single text index per collection."""
+        async for index in self.document.get_motor_collection().list_indexes():
+            if index["key"].get("_fts") == "text":
+                return index
+
+        return None
+
+    async def verify_text_index(
+        self: T,
+        fields_names_for_search: Tuple[str, ...],
+    ) -> bool:
+        index = await self.fetch_text_index()
+        if index is None:
+            return False
+
+        return set(index.get("weights", {}).keys()) == set(fields_names_for_search)
+
+    async def ensure_text_index(
+        self: T,
+        fields_names_for_search: Tuple[str, ...],
+        weights: Dict[str, int] | None = None,
+        default_language: str = "none",
+    ) -> str:
+        """
+        `default_language="none"` keeps the regex search semantics: no stemming
+        and no stop words.
+        """
+        index = await self.fetch_text_index()
+        if index is not None:
+            if await self.verify_text_index(fields_names_for_search):
+                return index["name"]
+
+            raise ValueError(
+                f"{self.document.get_collection_name()} already has the text index "
+                f"{index['name']} over {sorted(index.get('weights', {}).keys())}, "
+                f"not over {sorted(fields_names_for_search)}."
+            )
+
+        return await self.document.get_motor_collection().create_index(
+            [(field_name, TEXT) for field_name in fields_names_for_search],
+            weights=weights,
+            default_language=default_language,
+        )
@@ -1,33 +1,56 @@
 from typing import (
     Type,
     List,
+    Generic,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
 )
 
 from beanie import Document
 
 
-class UpdateByObjMixin:
-    @staticmethod
+@runtime_checkable
+class UpdateByObjMixinProtocol(Protocol):
+    async def replace_obj_with_search_tokens(self, obj: Document) -> Document: ...
+
+    def add_distinct_values_by_objs(self, objs: List[Document]) -> None: ...
+
+    def invalidate_group_by_buckets_by_objs(self, objs: List[Document]) -> int: ...
+
+
+T = TypeVar("T", bound=UpdateByObjMixinProtocol)
+
+
+class UpdateByObjMixin(Generic[T]):
     async def update_list_by_obj(
+        self: T,
         objs: List[Type[Document]],
         inputs: dict,
     ) -> List[Type[Document]]:
+        old_objs = [obj.model_copy() for obj in objs]
         for obj in objs:
             for attr, value in inputs.items():
                 setattr(obj, attr, value)
 
-            await obj.replace()
+            await self.replace_obj_with_search_tokens(obj)
+
+        self.invalidate_group_by_buckets_by_objs([*old_objs, *objs])
+        self.add_distinct_values_by_objs(objs)
 
         return objs
 
-    @staticmethod
     async def update_one_by_obj(
+        self: T,
         obj: Type[Document] | Document,
         inputs: dict,
     ) -> Type[Document]:
+        old_obj = obj.model_copy()
         for attr, value in inputs.items():
             setattr(obj, attr, value)
 
-        await obj.replace()
+        await self.replace_obj_with_search_tokens(obj)
+        self.invalidate_group_by_buckets_by_objs([old_obj, obj])
+        self.add_distinct_values_by_objs([obj])
 
         return obj
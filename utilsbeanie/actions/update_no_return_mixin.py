@@ -1,5 +1,14 @@
+from datetime import datetime
 from typing import (
+    Any,
     Dict,
+    List,
+    Tuple,
+    Optional,
+    Generic,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
 )
 
 from beanie import (
@@ -9,37 +18,100 @@ from beanie import (
 )
 
 
-class UpdateNoReturnMixin:
+@runtime_checkable
+class UpdateNoReturnMixinProtocol(Protocol):
+    document: Document
 
-    async def update_list_by_filter_no_return(
+    async def fetch_id_for_search_tokens(self, filter_: Dict, inputs: Dict) -> Any | None: ...
+
+    async def update_many_with_search_tokens(
         self,
         filter_: Dict,
+        update: Dict,
+        batch_size: int = 1000,
+    ) -> Any: ...
+
+    async def refresh_search_tokens_by_ids(self, ids: List[Any]) -> int: ...
+
+    def is_search_tokens_affected(self, inputs: Dict) -> bool: ...
+
+    def add_distinct_values_by_inputs(self, inputs: Dict) -> None: ...
+
+    async def fetch_group_by_buckets_times(
+        self,
+        filter_: Dict,
+        inputs_list: Optional[List[Dict]] = None,
+    ) -> List[Tuple[str, datetime, datetime]]: ...
+
+    def invalidate_group_by_buckets_by_times(
+        self,
+        times: List[Tuple[str, datetime, datetime]],
+    ) -> int: ...
+
+
+T = TypeVar("T", bound=UpdateNoReturnMixinProtocol)
+
+
+class UpdateNoReturnMixin(Generic[T]):
+
+    async def update_list_by_filter_no_return(
+        self: T,
+        filter_: Dict,
         inputs: dict,
     ) -> Document:
         """This function do not return the updated obj. Only update result will be returned!"""
-        return await self.document.find(filter_).update({"$set": inputs})
+        times = await self.fetch_group_by_buckets_times(filter_, [inputs])
+        if self.is_search_tokens_affected(inputs):
+            result = await self.update_many_with_search_tokens(filter_, {"$set": inputs})
+        else:
+            result = await self.document.find(filter_).update({"$set": inputs})
+        self.invalidate_group_by_buckets_by_times(times)
+        self.add_distinct_values_by_inputs(inputs)
+        return result
 
     async def update_one_by_filter_no_return(
-        self,
+        self: T,
         filter_: Dict,
         inputs: dict,
     ) -> Document:
         """This function do not return the updated obj. Only update result will be returned!"""
-        return await self.document.find_one(filter_).update({"$set": inputs})
+        id_ = await self.fetch_id_for_search_tokens(filter_, inputs)
+        if id_ is not None:
+            # pin the update to the document whose tokens will be refreshed.
+            filter_ = {"_id": id_}
+
+        times = await self.fetch_group_by_buckets_times(filter_, [inputs])
+        result = await self.document.find_one(filter_).update({"$set": inputs})
+        await self.refresh_search_tokens_by_ids([] if id_ is None else [id_])
+        self.invalidate_group_by_buckets_by_times(times)
+        self.add_distinct_values_by_inputs(inputs)
+        return result
 
     async def update_one_by_id_no_return(
-        self,
+        self: T,
         id_: PydanticObjectId,
         inputs: dict,
     ) -> UpdateResponse:
         """This function do not return the updated obj. Only update result will be returned!"""
-        return await self.document.find_one({"_id": id_}).update({"$set": inputs})
+        times = await self.fetch_group_by_buckets_times({"_id": id_}, [inputs])
+        result = await self.document.find_one({"_id": id_}).update({"$set": inputs})
+        if self.is_search_tokens_affected(inputs):
+            await self.refresh_search_tokens_by_ids([id_])
+        self.invalidate_group_by_buckets_by_times(times)
+        self.add_distinct_values_by_inputs(inputs)
+        return result
     
     async def update_one_by_pid_no_return(
-        self,
+        self: T,
         pid: int | str,
         inputs: dict,
     ) -> UpdateResponse:
         """This function do not return the updated obj. Only update result will be returned!"""
-        return await self.document.find_one({"pid": pid}).update({"$set": inputs})
+        id_ = await self.fetch_id_for_search_tokens({"pid": pid}, inputs)
+        times = await self.fetch_group_by_buckets_times({"pid": pid}, [inputs])
+        result = await self.document.find_one({"pid": pid}).update({"$set": inputs})
+        await self.refresh_search_tokens_by_ids([] if id_ is None else [id_])
+        self.invalidate_group_by_buckets_by_times(times)
+        self.add_distinct_values_by_inputs(inputs)
+        return result
     
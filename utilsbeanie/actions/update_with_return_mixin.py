@@ -102,6 +102,12 @@ class UpdateWithReturnMixinProtocol(Protocol):
         **pymongo_kwargs,
     ) -> List[Document | Dict]: ...
 
+    async def replace_obj_with_search_tokens(self, obj: Document) -> Document: ...
+
+    def add_distinct_values_by_objs(self, objs: List[Document]) -> None: ...
+
+    def invalidate_group_by_buckets_by_objs(self, objs: List[Document]) -> int: ...
+
 
 T = TypeVar("T", bound=UpdateWithReturnMixinProtocol)
 
@@ -141,10 +147,13 @@ class UpdateWithReturnMixin(Generic[T]):
             **pymongo_kwargs,
         )
 
+        old_obj = obj.model_copy()
         for attr, value in inputs.items():
             setattr(obj, attr, value)
 
-        await obj.replace()
+        await self.replace_obj_with_search_tokens(obj)
+        self.invalidate_group_by_buckets_by_objs([old_obj, obj])
+        self.add_distinct_values_by_objs([obj])
 
         return obj
 
@@ -171,10 +180,13 @@ class UpdateWithReturnMixin(Generic[T]):
             **pymongo_kwargs,
         )
 
+        old_obj = obj.model_copy()
         for attr, value in inputs.items():
             setattr(obj, attr, value)
 
-        await obj.replace()
+        await self.replace_obj_with_search_tokens(obj)
+        self.invalidate_group_by_buckets_by_objs([old_obj, obj])
+        self.add_distinct_values_by_objs([obj])
         return obj
 
     async def update_one_by_pid_with_return(
@@ -204,10 +216,13 @@ class UpdateWithReturnMixin(Generic[T]):
             **pymongo_kwargs,
         )
 
+        old_obj = obj.model_copy()
         for attr, value in inputs.items():
             setattr(obj, attr, value)
 
-        await obj.replace()
+        await self.replace_obj_with_search_tokens(obj)
+        self.invalidate_group_by_buckets_by_objs([old_obj, obj])
+        self.add_distinct_values_by_objs([obj])
         return obj
 
     async def update_list_by_filter_with_return(
@@ -249,10 +264,14 @@ class UpdateWithReturnMixin(Generic[T]):
             **pymongo_kwargs,
         )
 
+        old_objs = [obj.model_copy() for obj in objs]
         for obj in objs:
             for attr, value in inputs.items():
                 setattr(obj, attr, value)
 
-            await obj.replace()
+            await self.replace_obj_with_search_tokens(obj)
+
+        self.invalidate_group_by_buckets_by_objs([*old_objs, *objs])
+        self.add_distinct_values_by_objs(objs)
 
         return objs
@@ -0,0 +1,67 @@
+"""
+Fill the search tokens field of documents written before search tokens were
+enabled for their collection.
+
+    python -m utilsbeanie.backfill_search_tokens \
+        --host localhost --port 27017 --database my_db \
+        --document my_project.models.Article \
+        --fields title body --edge-ngram-min-length 2
+"""
+from argparse import ArgumentParser
+from asyncio import run
+from importlib import import_module
+
+from utilsbeanie.engine import Engin
+from utilsbeanie.utilsbeanie import UtilsBeanie
+
+
+def parse_arguments():
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", default=27017)
+    parser.add_argument("--database", required=True)
+    parser.add_argument("--username", default=None)
+    parser.add_argument("--password", default=None)
+    parser.add_argument("--authdb", default=None)
+    parser.add_argument("--document", required=True, help="dotted path of the beanie Document")
+    parser.add_argument("--fields", nargs="+", required=True)
+    parser.add_argument("--search-tokens-field-name", default="_search_tokens")
+    parser.add_argument("--edge-ngram-min-length", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    return parser.parse_args()
+
+
+async def main() -> None:
+    arguments = parse_arguments()
+
+    module_path, class_name = arguments.document.rsplit(".", 1)
+    document = getattr(import_module(module_path), class_name)
+
+    connection_string, database = Engin.create_connection_string(
+        host=arguments.host,
+        port=arguments.port,
+        database=arguments.database,
+        username=arguments.username,
+        password=arguments.password,
+        authdb=arguments.authdb,
+    )
+    await Engin.init_beanie(
+        connection_string=connection_string,
+        database=database,
+        list_of_documents_pathes=[document],
+    )
+
+    utils_beanie = UtilsBeanie(
+        document=document,
+        fields_names_for_search_tokens=tuple(arguments.fields),
+        search_tokens_field_name=arguments.search_tokens_field_name,
+        search_tokens_edge_ngram_min_length=arguments.edge_ngram_min_length,
+    )
+    number_of_updated = await utils_beanie.backfill_search_tokens(
+        batch_size=arguments.batch_size,
+    )
+    print(f"search tokens written for {number_of_updated} documents", flush=True)
+
+
+if __name__ == "__main__":
+    run(main())
@@ -11,6 +11,35 @@ class EnumOrderBy(str, Enum):
     D = "D"
 
 
+class EnumMatchMode(str, Enum):
+    CONTAINS = "contains"
+    PREFIX = "prefix"
+    EXACT_CI = "exact_ci"
+
+
+class EnumReferenceConsistency(str, Enum):
+    # reloaded once `refresh_interval` seconds have passed since the last load
+    INTERVAL = "interval"
+    # reloaded when the count or the greatest `version_field` of the collection changed
+    VERSION = "version"
+    # loaded once, reloaded only by `refresh_reference_collections`
+    MANUAL = "manual"
+
+
+class EnumJoinStrategy(str, Enum):
+    # `$lookup` before the page stages
+    SERVER = "server"
+    # `$lookup` after `$skip`/`$limit`, only the rows of the page are joined
+    DEFERRED = "deferred"
+    # one `$in` query per lookup after the page is fetched, see `join_in_application`
+    APPLICATION = "application"
+
+
+# Collation to pass as `collation=` to queries using `EnumMatchMode.EXACT_CI`
+# fields. The field needs an index created with the same collation.
+CASE_INSENSITIVE_COLLATION = {"locale": "en", "strength": 2}
+
+
 DATETIME_BY_X_FORMAT = {
     "_by_year": "%Y",
     "_by_month": "%m",
@@ -25,5 +54,45 @@ DATETIME_BY_X_FORMAT = {
     "_by_year_month_day_hour_minute_second": "%Y-%m-%d %H:%M:%S",
 }
 
+# `$dateTrunc` buckets, used for every suffix when `use_date_trunc` is set and
+# always for the suffixes `DATETIME_BY_X_FORMAT` has no format for. Any
+# `_by_<n>_<unit>s` suffix (e.g. `_by_15_minutes`) is a bucket of n units.
+DATETIME_BY_X_DATE_TRUNC = {
+    "_by_year": {"unit": "year", "binSize": 1},
+    "_by_quarter": {"unit": "quarter", "binSize": 1},
+    "_by_week": {"unit": "week", "binSize": 1},
+    "_by_year_month": {"unit": "month", "binSize": 1},
+    "_by_year_month_day": {"unit": "day", "binSize": 1},
+    "_by_year_month_day_hour": {"unit": "hour", "binSize": 1},
+    "_by_year_month_day_hour_minute": {"unit": "minute", "binSize": 1},
+    "_by_year_month_day_hour_minute_second": {"unit": "second", "binSize": 1},
+}
+
+# suffixes of `DATETIME_BY_X_FORMAT` that are a part of the date rather than a
+# bucket; with `use_date_trunc` they group on these (integer) operators.
+DATETIME_BY_X_PART = {
+    "_by_month": "$month",
+    "_by_day": "$dayOfMonth",
+    "_by_hour": "$hour",
+    "_by_minute": "$minute",
+    "_by_second": "$second",
+}
+
+DATE_TRUNC_UNITS = ("year", "quarter", "month", "week", "day", "hour", "minute", "second")
+
+# `metrics` operators of `build_group_by_pipeline` that map to one accumulator;
+# "distinct", "top" and "bottom" are compiled by `prepare_group_by_accumulators`.
+GROUP_BY_ACCUMULATORS = {
+    "sum": "$sum",
+    "avg": "$avg",
+    "min": "$min",
+    "max": "$max",
+    "first": "$first",
+    "last": "$last",
+}
+
+# `order_by` key that sorts by the relevance of a `$text` search.
+TEXT_SCORE = "text_score"
+
 ASCENDING = SortDirection.ASCENDING.value
 DESCENDING = SortDirection.DESCENDING.value
\ No newline at end of file
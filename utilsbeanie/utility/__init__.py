@@ -5,4 +5,16 @@ from .insert_mixin import InsertMixin
 from .filter_for_aggregation_mixin import FilterForAggregationMixin
 from .filter_for_group_by_aggregation_mixin import FilterForGroupByAggregationMixin
 from .filter_mixin import FilterMixin
+from .creation_time_mixin import CreationTimeMixin
+from .search_token_mixin import SearchTokenMixin
+from .pipeline_optimizer_mixin import PipelineOptimizerMixin
+from .join_planner_mixin import JoinPlannerMixin
+from .rollup_mixin import RollupMixin
+from .group_by_cache_mixin import GroupByCacheMixin
+from .approximate_group_by_mixin import ApproximateGroupByMixin
+from .facet_counts_mixin import FacetCountsMixin
+from .json_encoder_mixin import JsonEncoderMixin
+from .columns_mixin import ColumnsMixin
+from .parallel_scan_mixin import ParallelScanMixin
+from .partition_mixin import PartitionMixin
 from utilsbeanie.utility.helper_mixin import HelperMixin
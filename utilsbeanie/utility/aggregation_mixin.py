@@ -1,6 +1,7 @@
 from typing import (
     Any,
     Dict,
+    Hashable,
     Type,
     Literal,
     Protocol,
@@ -9,16 +10,69 @@ from typing import (
     Generic,
 )
 
+from beanie import Document
 from pydantic import BaseModel
 
 
 @runtime_checkable
 class AggregationMixinProtocol(Protocol):
+    document: Document
     field_separator: str = "__"
 
 
 T = TypeVar("T", bound=AggregationMixinProtocol)
 
+PIPELINE_TEMPLATES_MAX_SIZE = 1024
+
+_pipeline_templates: Dict[Hashable, tuple] = dict()
+_projection_templates: Dict[Type[BaseModel], "FrozenDict"] = dict()
+
+
+class FrozenDict(dict):
+    """
+    A read-only dict shared between callers. It is still a `dict`, so BSON
+    encodes it as is; `dict(...)`, `copy` and `deepcopy` return plain dicts.
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("shared pipeline templates are read-only, copy it first")
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = __ior__ = _read_only
+
+    def __reduce_ex__(self, protocol):
+        return dict, (dict(self),)
+
+
+def freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(i)) for key, i in value.items())
+
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(i) for i in value)
+
+    return value
+
+
+def make_hashable(value: Any) -> Hashable:
+    """A key for `value` made of tuples; raises `TypeError` for values that can not be one."""
+    if isinstance(value, dict):
+        return dict, tuple([(key, make_hashable(i)) for key, i in value.items()])
+
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        if not isinstance(value, (list, tuple)):
+            raise
+
+    return tuple, tuple([make_hashable(i) for i in value])
+
+
+def clear_pipeline_templates() -> None:
+    _pipeline_templates.clear()
+    _projection_templates.clear()
+
 
 class AggregationMixin(Generic[T]):
     
@@ -28,58 +82,115 @@ class AggregationMixin(Generic[T]):
             tuple[tuple[str, Type[BaseModel]], ...] | None | tuple[dict[str, Any], ...]
         ),
         final_projection: Type[BaseModel] | dict[str, Literal[0, 1]] = None,
+    ) -> list[dict]:
+        """
+        Memoized per (document, attributes, final_projection). The list is new
+        on every call but its stages are shared `FrozenDict`s: copy a stage
+        before changing it.
+        """
+        try:
+            key = (
+                getattr(self, "document", None),
+                make_hashable(attributes),
+                make_hashable(final_projection),
+            )
+        except TypeError:
+            return self._build_aggregation_pipeline(attributes, final_projection)
+
+        template = _pipeline_templates.get(key)
+        if template is None:
+            template = freeze(self._build_aggregation_pipeline(attributes, final_projection))
+            if len(_pipeline_templates) >= PIPELINE_TEMPLATES_MAX_SIZE:
+                del _pipeline_templates[next(iter(_pipeline_templates))]
+            _pipeline_templates[key] = template
+
+        return list(template)
+
+    def _build_aggregation_pipeline(
+        self,
+        attributes: (
+            tuple[tuple[str, Type[BaseModel]], ...] | None | tuple[dict[str, Any], ...]
+        ),
+        final_projection: Type[BaseModel] | dict[str, Literal[0, 1]] = None,
     ) -> list[dict]:
         aggregation_pipeline = list()
 
         if attributes:
             for attribute_i in attributes:
-                if isinstance(attribute_i, dict):
-                    lookup_from = attribute_i["lookup_from"]
-                    lookup_local_field = attribute_i["lookup_local_field"]
-                    lookup_foreign_field = attribute_i["lookup_foreign_field"]
-                    lookup_as = attribute_i["lookup_as"]
-                    projection_fields = self.prepare_projection_fields(
-                        projection=attribute_i["projection_model"],
-                    )
-                    unwind = attribute_i.get("unwind", True)
-
-                elif isinstance(attribute_i, tuple):
-                    lookup_from = attribute_i[0]
-                    lookup_local_field = f"{attribute_i[0]}_pid"
-                    lookup_foreign_field = "pid"
-                    lookup_as = f"{attribute_i[0]}_obj"
-                    projection_fields = self.prepare_projection_fields(
-                        projection=attribute_i[1]
-                    )
-                    unwind = True
-
-                aggregation_pipeline.append(
-                    {
-                        "$lookup": {
-                            "from": lookup_from,
-                            "localField": lookup_local_field,
-                            "foreignField": lookup_foreign_field,
-                            "as": lookup_as,
-                            "pipeline": [{"$project": projection_fields}],
-                        }
-                    },
+                aggregation_pipeline.extend(
+                    self.build_lookup_stages(self.prepare_lookup_attribute(attribute_i))
                 )
 
-                if unwind:
-                    aggregation_pipeline.append(
-                        {
-                            "$unwind": {
-                                "path": f"${lookup_as}",
-                                "preserveNullAndEmptyArrays": True,
-                            }
-                        }
-                    )
-
         aggregation_pipeline.append(
             {"$project": self.prepare_projection_fields(projection=final_projection)}
         )
         return aggregation_pipeline
 
+    @staticmethod
+    def build_lookup_stages(lookup: dict[str, Any]) -> list[dict]:
+        """
+        `$lookup` (+ `$unwind`) stages of one `prepare_lookup_attribute` result.
+        A `to_one` lookup ends its pipeline with `{"$limit": 1}`, which marks
+        it as one the optimizer may defer or prune.
+        """
+        pipeline = [{"$project": lookup["projection_fields"]}]
+        if lookup.get("to_one"):
+            pipeline.append({"$limit": 1})
+
+        stages = [
+            {
+                "$lookup": {
+                    "from": lookup["lookup_from"],
+                    "localField": lookup["lookup_local_field"],
+                    "foreignField": lookup["lookup_foreign_field"],
+                    "as": lookup["lookup_as"],
+                    "pipeline": pipeline,
+                }
+            },
+        ]
+
+        if lookup["unwind"]:
+            stages.append(
+                {
+                    "$unwind": {
+                        "path": f"${lookup['lookup_as']}",
+                        "preserveNullAndEmptyArrays": True,
+                    }
+                }
+            )
+
+        return stages
+
+    def prepare_lookup_attribute(
+        self,
+        attribute: tuple[str, Type[BaseModel]] | dict[str, Any],
+    ) -> dict[str, Any]:
+        """Normalize one `attributes` item of `build_aggregation_pipeline`."""
+        if isinstance(attribute, dict):
+            return {
+                "lookup_from": attribute["lookup_from"],
+                "lookup_local_field": attribute["lookup_local_field"],
+                "lookup_foreign_field": attribute["lookup_foreign_field"],
+                "lookup_as": attribute["lookup_as"],
+                "projection_fields": self.prepare_projection_fields(
+                    projection=attribute["projection_model"],
+                ),
+                "unwind": attribute.get("unwind", True),
+                "to_one": attribute.get("to_one", False),
+            }
+
+        return {
+            "lookup_from": attribute[0],
+            "lookup_local_field": f"{attribute[0]}_pid",
+            "lookup_foreign_field": "pid",
+            "lookup_as": f"{attribute[0]}_obj",
+            "projection_fields": self.prepare_projection_fields(
+                projection=attribute[1]
+            ),
+            "unwind": True,
+            "to_one": False,
+        }
+
     @staticmethod
     def prepare_projection_fields(
         projection: Type[BaseModel] | Dict[str | Literal[0, 1], Any] | None
@@ -87,6 +198,13 @@ class AggregationMixin(Generic[T]):
         if isinstance(projection, dict):
             return projection
 
-        elif issubclass(projection, BaseModel):
-            return {"_id": 0, **{i: 1 for i in projection.model_fields.keys()}}
+        elif isinstance(projection, type) and issubclass(projection, BaseModel):
+            # memoized per model, shared read-only
+            template = _projection_templates.get(projection)
+            if template is None:
+                template = FrozenDict(
+                    {"_id": 0, **{i: 1 for i in projection.model_fields.keys()}}
+                )
+                _projection_templates[projection] = template
+            return template
         return {"_id": 0}
@@ -0,0 +1,197 @@
+from math import (
+    ceil,
+    sqrt,
+)
+from statistics import NormalDist
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+    Generic,
+)
+
+from ..constant import GROUP_BY_ACCUMULATORS
+
+
+@runtime_checkable
+class ApproximateGroupByMixinProtocol(Protocol):
+    field_separator: str = "__"
+
+    def _prepare_fields(self, group_by_on: list[str]) -> Dict: ...
+
+    def _prepare_field_path(self, field_name: str) -> str: ...
+
+
+T = TypeVar("T", bound=ApproximateGroupByMixinProtocol)
+
+DEFAULT_SAMPLE_SIZE = 10_000
+
+
+class ApproximateGroupByMixin(Generic[T]):
+    @staticmethod
+    def prepare_sample_size(
+        population: int,
+        sample_size: int | None = None,
+        error_budget: float | None = None,
+        confidence: float = 0.95,
+    ) -> int:
+        """
+        `sample_size`, or the size that keeps the margin of error of every
+        group's share of the documents within `error_budget` (e.g. 0.01 for
+        ±1 percentage point) at `confidence`; never more than `population`.
+        """
+        if sample_size is None and error_budget is not None:
+            z = NormalDist().inv_cdf((1 + confidence) / 2)
+            n0 = z**2 / (4 * error_budget**2)
+            sample_size = ceil(n0 / (1 + (n0 - 1) / population)) if population else 0
+
+        return min(sample_size or DEFAULT_SAMPLE_SIZE, population)
+
+    def build_approximate_group_by_pipeline(
+        self: T,
+        group_by_on: list[str],
+        population: int,
+        sample_size: int,
+        metrics: Dict[str, Tuple] | None = None,
+        confidence: float = 0.95,
+    ) -> List[Dict]:
+        """
+        `build_group_by_pipeline` for `sample_size` random documents out of
+        `population`: `count` and "count"/"sum" metrics are scaled to the
+        population and "avg" is the sample mean, each with its confidence
+        interval in `intervals`; "min", "max", "first" and "last" are those of
+        the sample. The intervals assume one grouped row per document.
+        """
+        n, N = sample_size, population
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        ratio = N / n
+        # z * N * the standard error of a mean of one unit per document,
+        # with the finite population correction (0 when every document is read)
+        total_factor = z * N * sqrt((N - n) / max(N - 1, 1) / n)
+
+        def interval(estimate: Any, half_width: Any) -> List:
+            return [
+                {"$max": [0, {"$subtract": [estimate, half_width]}]},
+                {"$add": [estimate, half_width]},
+            ]
+
+        def total_half_width(sum_: str, sum_of_squares: str) -> Dict:
+            # sample variance of the per-document values, 0 outside the group
+            return {
+                "$multiply": [
+                    total_factor,
+                    {
+                        "$sqrt": {
+                            "$max": [
+                                0,
+                                {
+                                    "$divide": [
+                                        {
+                                            "$subtract": [
+                                                sum_of_squares,
+                                                {"$divide": [{"$multiply": [sum_, sum_]}, n]},
+                                            ]
+                                        },
+                                        max(n - 1, 1),
+                                    ]
+                                },
+                            ]
+                        }
+                    },
+                ]
+            }
+
+        group_id = self._prepare_fields(group_by_on)
+        accumulators = {"count": {"$sum": 1}}
+        estimates = {"count": {"$multiply": ["$count", ratio]}}
+        intervals = {"count": interval(estimates["count"], total_half_width("$count", "$count"))}
+        hidden = list()
+        for name, (operator, *arguments) in (metrics or {}).items():
+            if operator == "count":
+                accumulators[name] = {"$sum": 1}
+                estimates[name] = {"$multiply": [f"${name}", ratio]}
+                intervals[name] = interval(
+                    estimates[name],
+                    total_half_width(f"${name}", f"${name}"),
+                )
+
+            elif operator in ("sum", "avg"):
+                path = self._prepare_field_path(arguments[0])
+                accumulators[f"_sum_{name}"] = {"$sum": path}
+                accumulators[f"_sum_of_squares_{name}"] = {
+                    "$sum": {"$cond": [{"$isNumber": path}, {"$multiply": [path, path]}, 0]}
+                }
+                hidden.extend([f"_sum_{name}", f"_sum_of_squares_{name}"])
+
+                if operator == "sum":
+                    estimates[name] = {"$multiply": [f"$_sum_{name}", ratio]}
+                    intervals[name] = interval(
+                        estimates[name],
+                        total_half_width(f"$_sum_{name}", f"$_sum_of_squares_{name}"),
+                    )
+                    continue
+
+                accumulators[f"_count_{name}"] = {
+                    "$sum": {"$cond": [{"$isNumber": path}, 1, 0]}
+                }
+                hidden.append(f"_count_{name}")
+                k = f"$_count_{name}"
+                mean = {"$divide": [f"$_sum_{name}", k]}
+                # z * the standard error of the mean of the group's values
+                half_width = {
+                    "$multiply": [
+                        z,
+                        {
+                            "$sqrt": {
+                                "$max": [
+                                    0,
+                                    {
+                                        "$divide": [
+                                            {
+                                                "$subtract": [
+                                                    f"$_sum_of_squares_{name}",
+                                                    {"$multiply": [f"$_sum_{name}", mean]},
+                                                ]
+                                            },
+                                            {"$multiply": [k, {"$subtract": [k, 1]}]},
+                                        ]
+                                    },
+                                ]
+                            }
+                        },
+                    ]
+                }
+                estimates[name] = {"$cond": [{"$gt": [k, 0]}, mean, None]}
+                intervals[name] = {
+                    "$cond": [
+                        {"$gt": [k, 1]},
+                        [
+                            {"$subtract": [mean, half_width]},
+                            {"$add": [mean, half_width]},
+                        ],
+                        None,
+                    ]
+                }
+
+            elif operator in GROUP_BY_ACCUMULATORS:
+                accumulators[name] = {
+                    GROUP_BY_ACCUMULATORS[operator]: self._prepare_field_path(arguments[0])
+                }
+
+            else:
+                raise ValueError(f"{operator!r} of {name!r} can not be estimated from a sample")
+
+        # intervals read the sample values, so they are set before the estimates
+        aggregation_pipeline = [
+            {"$group": {"_id": group_id, **accumulators}},
+            {"$addFields": {"intervals": intervals}},
+            {"$addFields": estimates},
+        ]
+        if hidden:
+            aggregation_pipeline.append({"$project": {i: 0 for i in hidden}})
+
+        return aggregation_pipeline
@@ -0,0 +1,88 @@
+from datetime import (
+    date,
+    datetime,
+)
+from types import (
+    NoneType,
+    UnionType,
+)
+from typing import (
+    Any,
+    Dict,
+    Tuple,
+    Union,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+    Generic,
+    get_args,
+    get_origin,
+)
+
+from beanie import Document
+
+
+@runtime_checkable
+class ColumnsMixinProtocol(Protocol):
+    document: Document
+    field_separator: str = "__"
+
+
+T = TypeVar("T", bound=ColumnsMixinProtocol)
+
+# NumPy dtypes of annotations; optional integers are read as floats so a
+# missing value can be NaN, anything else as objects.
+COLUMN_DTYPES = {
+    bool: "bool",
+    int: "int64",
+    float: "float64",
+    datetime: "datetime64[ms]",
+    date: "datetime64[D]",
+}
+OPTIONAL_COLUMN_DTYPES = {
+    int: "float64",
+    float: "float64",
+    datetime: "datetime64[ms]",
+    date: "datetime64[D]",
+}
+
+
+class ColumnsMixin(Generic[T]):
+    def prepare_columns_projection(self: T, fields: Tuple[str, ...]) -> Dict[str, int]:
+        paths = [i.replace(self.field_separator, ".") for i in fields]
+        projection = {i: 1 for i in paths}
+        if "_id" not in paths:
+            projection["_id"] = 0
+
+        return projection
+
+    def prepare_columns_dtypes(
+        self: T,
+        fields: Tuple[str, ...],
+        dtypes: Dict[str, Any] | None = None,
+    ) -> Dict[str, Any]:
+        """`dtypes`, else from the annotations of the document's top-level fields."""
+        dtypes = dtypes or {}
+        return {
+            i: dtypes[i] if i in dtypes else self._prepare_column_dtype(i)
+            for i in fields
+        }
+
+    def _prepare_column_dtype(self: T, field_name: str) -> str:
+        field = self.document.model_fields.get(field_name)
+        if field is None:
+            return "object"
+
+        annotation = field.annotation
+        is_optional = False
+        if get_origin(annotation) in (Union, UnionType):
+            arguments = [i for i in get_args(annotation) if i is not NoneType]
+            if len(arguments) != 1:
+                return "object"
+            annotation = arguments[0]
+            is_optional = True
+
+        if is_optional or not field.is_required():
+            return OPTIONAL_COLUMN_DTYPES.get(annotation, "object")
+
+        return COLUMN_DTYPES.get(annotation, "object")
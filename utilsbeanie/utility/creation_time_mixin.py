@@ -0,0 +1,84 @@
+from datetime import (
+    datetime,
+    timezone,
+)
+from math import floor
+from typing import (
+    Dict,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+    Generic,
+)
+
+from bson import ObjectId
+
+
+@runtime_checkable
+class CreationTimeMixinProtocol(Protocol):
+    creation_time_field_name: str | None = None
+    creation_time_key: str = "_id"
+    creation_time_slack: float = 1
+    epoch_pid_suffix_digits: int = 4
+
+
+T = TypeVar("T", bound=CreationTimeMixinProtocol)
+
+
+class CreationTimeMixin(Generic[T]):
+    def prepare_filter_for_creation_time(
+        self: T,
+        fields_names: tuple[str, ...],
+        inputs: dict,
+    ) -> list[dict]:
+        """
+        Bounds of `creation_time_key` (`_id` or an epoch `pid`) covering the
+        range input of `creation_time_field_name`, added next to the range
+        so the primary (or pid) index serves it; the range itself still
+        decides, so results are unchanged as long as each document was
+        created within `creation_time_slack` seconds of its creation field.
+        Not added with `_include_null`.
+        """
+        field_name = self.creation_time_field_name
+        if (
+            field_name is None
+            or field_name not in fields_names
+            or inputs.get(field_name + "_include_null")
+        ):
+            return []
+
+        bounds = self.prepare_creation_time_bounds(
+            from_=inputs.get(field_name + "_from"),
+            to=inputs.get(field_name + "_to"),
+        )
+        return [{self.creation_time_key: bounds}] if bounds else []
+
+    def prepare_creation_time_bounds(
+        self: T,
+        from_: datetime | None = None,
+        to: datetime | None = None,
+    ) -> Dict:
+        """`$gte`/`$lt` of `creation_time_key` for datetimes (naive ones are UTC), else {}."""
+        bounds = dict()
+        if isinstance(from_, datetime):
+            seconds = floor(self._as_utc(from_).timestamp() - self.creation_time_slack)
+            bounds["$gte"] = self._prepare_creation_time_key(seconds)
+
+        if isinstance(to, datetime):
+            seconds = floor(self._as_utc(to).timestamp() + self.creation_time_slack) + 1
+            if self.creation_time_key != "_id":
+                # epoch pids hold the rounded, not the truncated, seconds
+                seconds += 1
+            bounds["$lt"] = self._prepare_creation_time_key(seconds)
+
+        return bounds
+
+    def _prepare_creation_time_key(self: T, seconds: int) -> ObjectId | int:
+        if self.creation_time_key == "_id":
+            return ObjectId.from_datetime(datetime.fromtimestamp(seconds, timezone.utc))
+
+        return seconds * 10**self.epoch_pid_suffix_digits
+
+    @staticmethod
+    def _as_utc(value: datetime) -> datetime:
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
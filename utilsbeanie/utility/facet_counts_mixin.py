@@ -0,0 +1,187 @@
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+    Generic,
+)
+
+from ..constant import EnumMatchMode
+
+
+@runtime_checkable
+class FacetCountsMixinProtocol(Protocol):
+    def prepare_filter(
+        self,
+        inputs: Dict[str, Any],
+        fields_names_for_regex: Tuple[str, ...] = tuple(),
+        fields_names_for_range: Tuple[str, ...] = tuple(),
+        fields_names_for_in: Tuple[str, ...] = tuple(),
+        search_field_name: str = None,
+        fields_names_for_search: Tuple[str, ...] = tuple(),
+        fields_match_modes: Dict[str, EnumMatchMode] | None = None,
+    ) -> dict: ...
+
+    @staticmethod
+    def prepare_filter_for_in_fields(
+        fields_names: tuple[str, ...],
+        inputs: dict,
+    ) -> list[dict]: ...
+
+    @staticmethod
+    def prepare_filter_for_range_fields(
+        fields_names: tuple[str, ...],
+        inputs: dict,
+    ) -> list[dict]: ...
+
+    @staticmethod
+    def join_match_conditions(conditions: List[Dict]) -> Dict: ...
+
+
+T = TypeVar("T", bound=FacetCountsMixinProtocol)
+
+# `$facet` output names may not contain dots, the facets are numbered instead
+FACET_NAME_PREFIX = "facet_"
+
+
+class FacetCountsMixin(Generic[T]):
+    def build_facet_counts_pipeline(
+        self: T,
+        inputs: Dict[str, Any],
+        fields_names_for_regex: Tuple[str, ...] = tuple(),
+        fields_names_for_range: Tuple[str, ...] = tuple(),
+        fields_names_for_in: Tuple[str, ...] = tuple(),
+        search_field_name: str = None,
+        fields_names_for_search: Tuple[str, ...] = tuple(),
+        fields_match_modes: Dict[str, EnumMatchMode] | None = None,
+        ranges_boundaries: Dict[str, List] | None = None,
+        number_of_buckets: int = 10,
+        values_limit: int | None = None,
+    ) -> List[Dict]:
+        """
+        One `$match` of the regex and search filters, then a `$facet` with the
+        value counts of every in-field and a histogram of every range-field
+        (`$bucket` on `ranges_boundaries[field_name]`, else `$bucketAuto` of
+        `number_of_buckets`), each under the filters of the other in- and
+        range-fields only, and the total count under all of them.
+        """
+        ranges_boundaries = ranges_boundaries or {}
+        base_filter = self.prepare_filter(
+            inputs=inputs,
+            fields_names_for_regex=fields_names_for_regex,
+            search_field_name=search_field_name,
+            fields_names_for_search=fields_names_for_search,
+            fields_match_modes=fields_match_modes,
+        )
+
+        fields_names = [*fields_names_for_in, *fields_names_for_range]
+        conditions = {
+            **{
+                i: self.prepare_filter_for_in_fields(fields_names=(i,), inputs=inputs)
+                for i in fields_names_for_in
+            },
+            **{
+                i: self.prepare_filter_for_range_fields(fields_names=(i,), inputs=inputs)
+                for i in fields_names_for_range
+            },
+        }
+
+        def match_except(field_name: str | None) -> List[Dict]:
+            others = [j for i in fields_names if i != field_name for j in conditions[i]]
+            return [{"$match": self.join_match_conditions(others)}] if others else []
+
+        facet = {"total": [*match_except(None), {"$count": "count"}]}
+        for index, field_name in enumerate(fields_names):
+            branch = match_except(field_name)
+            if field_name in fields_names_for_in:
+                branch.extend(
+                    [
+                        {
+                            "$unwind": {
+                                "path": f"${field_name}",
+                                "preserveNullAndEmptyArrays": True,
+                            }
+                        },
+                        {"$group": {"_id": f"${field_name}", "count": {"$sum": 1}}},
+                        {"$sort": {"count": -1, "_id": 1}},
+                    ]
+                )
+                if values_limit:
+                    branch.append({"$limit": values_limit})
+
+            elif field_name in ranges_boundaries:
+                branch.append(
+                    {
+                        "$bucket": {
+                            "groupBy": f"${field_name}",
+                            "boundaries": list(ranges_boundaries[field_name]),
+                            "default": None,
+                            "output": {"count": {"$sum": 1}},
+                        }
+                    }
+                )
+
+            else:
+                branch.append(
+                    {
+                        "$bucketAuto": {
+                            "groupBy": f"${field_name}",
+                            "buckets": number_of_buckets,
+                            "output": {"count": {"$sum": 1}},
+                        }
+                    }
+                )
+
+            facet[f"{FACET_NAME_PREFIX}{index}"] = branch
+
+        aggregation_pipeline = [{"$match": base_filter}] if base_filter else []
+        aggregation_pipeline.append({"$facet": facet})
+        return aggregation_pipeline
+
+    def prepare_facet_counts(
+        self: T,
+        result: Dict[str, List[Dict]],
+        fields_names_for_range: Tuple[str, ...] = tuple(),
+        fields_names_for_in: Tuple[str, ...] = tuple(),
+        ranges_boundaries: Dict[str, List] | None = None,
+    ) -> Dict[str, Any]:
+        """
+        The `$facet` document as `{"total": ..., "facets": {field_name: [...]}}`:
+        `{"value", "count"}` items for in-fields and `{"from", "to", "count"}`
+        for range-fields, `from` inclusive and `to` exclusive except for the
+        last `$bucketAuto` bucket; values outside the boundaries (or null)
+        are counted under `from` and `to` of None.
+        """
+        ranges_boundaries = ranges_boundaries or {}
+        facets = dict()
+        for index, field_name in enumerate([*fields_names_for_in, *fields_names_for_range]):
+            items = result.get(f"{FACET_NAME_PREFIX}{index}", [])
+            if field_name in fields_names_for_in:
+                facets[field_name] = [{"value": i["_id"], "count": i["count"]} for i in items]
+
+            elif field_name in ranges_boundaries:
+                boundaries = list(ranges_boundaries[field_name])
+                facets[field_name] = [
+                    {
+                        "from": i["_id"],
+                        "to": (
+                            None
+                            if i["_id"] is None
+                            else boundaries[boundaries.index(i["_id"]) + 1]
+                        ),
+                        "count": i["count"],
+                    }
+                    for i in items
+                ]
+
+            else:
+                facets[field_name] = [
+                    {"from": i["_id"]["min"], "to": i["_id"]["max"], "count": i["count"]}
+                    for i in items
+                ]
+
+        total = result.get("total")
+        return {"total": total[0]["count"] if total else 0, "facets": facets}
@@ -1,5 +1,6 @@
 from typing import (
     List,
+    Mapping,
     Dict,
     Type,
     Optional,
@@ -16,6 +17,7 @@ from beanie import (
     SortDirection,
 )
 from beanie.odm.documents import AsyncIOMotorClientSession
+from beanie.odm.utils.projection import get_projection
 from pydantic import BaseModel
 
 from ..constant import EnumOrderBy
@@ -82,3 +84,47 @@ class FetchSimpleMixin(Generic[T]):
             nesting_depths_per_field=nesting_depths_per_field,
             **pymongo_kwargs,
         )
+
+    def get_raw_collection(self: T, document_class: Type[Mapping] = dict):
+        """
+        The collection of the document decoding to `document_class`, e.g.
+        `bson.raw_bson.RawBSONDocument` to decode each field on first access.
+        """
+        collection = self.document.get_motor_collection()
+        if collection.codec_options.document_class is document_class:
+            return collection
+
+        return collection.with_options(
+            codec_options=collection.codec_options.with_options(
+                document_class=document_class,
+            )
+        )
+
+    def create_raw_fetch_list_by_filter_cursor(
+        self: T,
+        filter_: Dict,
+        current_page: int = None,
+        page_size: int = None,
+        order_by: Dict[str, EnumOrderBy] | None = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        sort: Union[None, List[Tuple[str, SortDirection]]] = None,
+        session: Optional[AsyncIOMotorClientSession] = None,
+        raw_document_class: Type[Mapping] = dict,
+        **pymongo_kwargs,
+    ):
+        """`create_fetch_list_by_filter_query` straight on the driver, without models."""
+        return self.get_raw_collection(raw_document_class).find(
+            filter_,
+            projection=get_projection(projection_model) if projection_model else None,
+            **self.prepare_skip_limit(
+                current_page=current_page,
+                page_size=page_size,
+                skip=skip,
+                limit=limit,
+            ),
+            sort=self.convert_order_by_to_sort(order_by=order_by) or sort,
+            session=session,
+            **pymongo_kwargs,
+        )
@@ -8,10 +8,13 @@ from typing import (
     Generic,
 )
 
+from ..constant import EnumMatchMode
+
 
 @runtime_checkable
 class FilterForAggregationMixinProtocol(Protocol):
     field_separator: str = "__"
+    use_text_search: bool = False
 
     def prepare_filter(
         self,
@@ -21,6 +24,7 @@ class FilterForAggregationMixinProtocol(Protocol):
         fields_names_for_in: Tuple[str, ...] = tuple(),
         search_field_name: str = None,
         fields_names_for_search: Tuple[str, ...] = tuple(),
+        fields_match_modes: Dict[str, EnumMatchMode] | None = None,
     ) -> dict: ...
 
 
@@ -36,12 +40,17 @@ class FilterForAggregationMixin(Generic[T]):
         fields_names_for_in: Tuple[str, ...] = tuple(),
         search_field_name: str = None,
         fields_names_for_search: Tuple[str, ...] = tuple(),
+        fields_match_modes: Dict[str, EnumMatchMode] | None = None,
     ) -> tuple[dict, dict]:
         first_filter_inputs = dict()
         last_filter_inputs = dict()
         for key, value in inputs.items():
             if value:
-                if key == search_field_name:
+                if key == search_field_name and self.use_text_search:
+                    # $text is only allowed in the first $match of a pipeline
+                    first_filter_inputs[key] = value
+
+                elif key == search_field_name:
                     last_filter_inputs[key] = value
 
                 elif self.field_separator in key:
@@ -65,6 +74,9 @@ class FilterForAggregationMixin(Generic[T]):
             fields_names_for_regex=fields_names_for_regex,
             fields_names_for_range=fields_names_for_range,
             fields_names_for_in=fields_names_for_in,
+            search_field_name=search_field_name,
+            fields_names_for_search=fields_names_for_search,
+            fields_match_modes=fields_match_modes,
         )
 
         last_filter = self.prepare_filter(
@@ -74,6 +86,7 @@ class FilterForAggregationMixin(Generic[T]):
             fields_names_for_in=fields_names_for_in,
             search_field_name=search_field_name,
             fields_names_for_search=fields_names_for_search,
+            fields_match_modes=fields_match_modes,
         )
 
         return first_filter, last_filter
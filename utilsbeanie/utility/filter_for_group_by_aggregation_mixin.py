@@ -8,6 +8,8 @@ from typing import (
     Generic,
 )
 
+from ..constant import EnumMatchMode
+
 @runtime_checkable
 class FilterForAggregationMixinProtocol(Protocol):
     field_separator: str = "__"
@@ -20,6 +22,7 @@ class FilterForAggregationMixinProtocol(Protocol):
         fields_names_for_in: Tuple[str, ...] = tuple(),
         search_field_name: str = None,
         fields_names_for_search: Tuple[str, ...] = tuple(),
+        fields_match_modes: Dict[str, EnumMatchMode] | None = None,
     ) -> dict: ...
 
 
@@ -36,6 +39,7 @@ class FilterForGroupByAggregationMixin(Generic[T]):
         fields_names_for_in: Tuple[str, ...] = tuple(),
         search_field_name: str = None,
         fields_names_for_search: Tuple[str, ...] = tuple(),
+        fields_match_modes: Dict[str, EnumMatchMode] | None = None,
     ) -> tuple[dict, dict, dict]:
         first_filter_inputs = dict()
         middle_filter_inputs = dict()
@@ -60,6 +64,7 @@ class FilterForGroupByAggregationMixin(Generic[T]):
             fields_names_for_in=fields_names_for_in,
             search_field_name=search_field_name,
             fields_names_for_search=fields_names_for_search,
+            fields_match_modes=fields_match_modes,
         )
 
         middle_filter = self.prepare_filter(
@@ -69,6 +74,7 @@ class FilterForGroupByAggregationMixin(Generic[T]):
             fields_names_for_in=fields_names_for_in,
             search_field_name=search_field_name,
             fields_names_for_search=fields_names_for_search,
+            fields_match_modes=fields_match_modes,
         )
 
         last_filter = self.prepare_filter(
@@ -78,6 +84,7 @@ class FilterForGroupByAggregationMixin(Generic[T]):
             fields_names_for_in=fields_names_for_in,
             search_field_name=search_field_name,
             fields_names_for_search=fields_names_for_search,
+            fields_match_modes=fields_match_modes,
         )
 
         return first_filter, middle_filter, last_filter
@@ -9,9 +9,25 @@ from typing import (
     Generic,
 )
 
+from ..constant import EnumMatchMode
+
 
 @runtime_checkable
-class FilterMixinProtocol(Protocol): ...
+class FilterMixinProtocol(Protocol):
+    fields_names_for_search_tokens: Tuple[str, ...] = tuple()
+    use_text_search: bool = False
+
+    def prepare_filter_for_search_tokens(
+        self,
+        search_field_name: str,
+        inputs: dict,
+    ) -> list[dict]: ...
+
+    def prepare_filter_for_creation_time(
+        self,
+        fields_names: tuple[str, ...],
+        inputs: dict,
+    ) -> list[dict]: ...
 
 
 T = TypeVar("T", bound=FilterMixinProtocol)
@@ -19,13 +35,14 @@ T = TypeVar("T", bound=FilterMixinProtocol)
 
 class FilterMixin(Generic[T]):
     def prepare_filter(
-        self,
+        self: T,
         inputs: Dict[str, Any],
         fields_names_for_regex: Tuple[str, ...] = tuple(),
         fields_names_for_range: Tuple[str, ...] = tuple(),
         fields_names_for_in: Tuple[str, ...] = tuple(),
         search_field_name: str = None,
         fields_names_for_search: Tuple[str, ...] = tuple(),
+        fields_match_modes: Dict[str, EnumMatchMode] | None = None,
     ) -> dict:
         filter_ = []
 
@@ -33,6 +50,7 @@ class FilterMixin(Generic[T]):
             self.prepare_filter_for_regex_fields(
                 fields_names=fields_names_for_regex,
                 inputs=inputs,
+                fields_match_modes=fields_match_modes,
             )
         )
 
@@ -43,6 +61,13 @@ class FilterMixin(Generic[T]):
             )
         )
 
+        filter_.extend(
+            self.prepare_filter_for_creation_time(
+                fields_names=fields_names_for_range,
+                inputs=inputs,
+            )
+        )
+
         filter_.extend(
             self.prepare_filter_for_in_fields(
                 fields_names=fields_names_for_in,
@@ -50,12 +75,29 @@ class FilterMixin(Generic[T]):
             )
         )
 
-        if search_field_name:
-            filter_.append(
+        if search_field_name and self.fields_names_for_search_tokens:
+            filter_.extend(
+                self.prepare_filter_for_search_tokens(
+                    search_field_name=search_field_name,
+                    inputs=inputs,
+                )
+            )
+
+        elif search_field_name and self.use_text_search:
+            filter_.extend(
+                self.prepare_filter_for_text_search(
+                    search_field_name=search_field_name,
+                    inputs=inputs,
+                )
+            )
+
+        elif search_field_name:
+            filter_.extend(
                 self.prepare_filter_for_search_field(
                     search_field_name=search_field_name,
                     fields_to_search_on=fields_names_for_search,
                     inputs=inputs,
+                    fields_match_modes=fields_match_modes,
                 )
             )
 
@@ -124,18 +166,55 @@ class FilterMixin(Generic[T]):
         return filter_
 
     @staticmethod
+    def prepare_match_condition(
+        field_name: str,
+        value: str,
+        match_mode: EnumMatchMode = EnumMatchMode.CONTAINS,
+    ) -> dict:
+        """
+        `contains` is an unanchored regex and scans every key.
+        `prefix` is an anchored regex, which MongoDB turns into an index range.
+        `exact_ci` is a plain equality; it is case-insensitive only when the
+        query runs with `CASE_INSENSITIVE_COLLATION` against an index created
+        with the same collation.
+        """
+        if match_mode == EnumMatchMode.PREFIX:
+            return {field_name: {"$regex": f"^{escape(value)}"}}
+
+        if match_mode == EnumMatchMode.EXACT_CI:
+            return {field_name: value}
+
+        return {field_name: {"$regex": escape(value)}}
+
+    @classmethod
     def prepare_filter_for_regex_fields(
+        cls,
         fields_names: tuple[str, ...],
         inputs: dict,
+        fields_match_modes: Dict[str, EnumMatchMode] | None = None,
     ):
+        fields_match_modes = fields_match_modes or {}
+
         filter_ = []
         for field_name in fields_names:
             if inputs.get(field_name):
+                match_mode = fields_match_modes.get(field_name, EnumMatchMode.CONTAINS)
+
                 subfilter = list()
                 for i in set(inputs[field_name]):
+                    if match_mode != EnumMatchMode.CONTAINS:
+                        # the whole value is the key to look up, splitting it
+                        # would turn one index range into several.
+                        subfilter.append(
+                            cls.prepare_match_condition(field_name, i, match_mode)
+                        )
+                        continue
+
                     subsubfilter = list()
                     for j in i.split(" "):
-                        subsubfilter.append({field_name: {"$regex": escape(j)}})
+                        subsubfilter.append(
+                            cls.prepare_match_condition(field_name, j, match_mode)
+                        )
 
                     if len(subsubfilter) > 1:
                         subfilter.append({"$and": subsubfilter})
@@ -147,12 +226,16 @@ class FilterMixin(Generic[T]):
 
         return filter_
 
-    @staticmethod
+    @classmethod
     def prepare_filter_for_search_field(
+        cls,
         search_field_name: str,
         fields_to_search_on: tuple[str, ...],
         inputs: dict,
+        fields_match_modes: Dict[str, EnumMatchMode] | None = None,
     ):
+        fields_match_modes = fields_match_modes or {}
+
         filter_ = []
         # {"$and": [{'title': {"$regex": /g/}}, {'title': {"$regex": /i/}}]}
         if inputs.get(search_field_name):
@@ -166,7 +249,15 @@ class FilterMixin(Generic[T]):
                 for i in split_value:
                     subfilter = list()
                     for field_name in fields_to_search_on:
-                        subfilter.append({field_name: {"$regex": escape(i)}})
+                        subfilter.append(
+                            cls.prepare_match_condition(
+                                field_name,
+                                i,
+                                fields_match_modes.get(
+                                    field_name, EnumMatchMode.CONTAINS
+                                ),
+                            )
+                        )
 
                     if len(subfilter) == 1:
                         search_filter.append(subfilter[0])
@@ -178,3 +269,27 @@ class FilterMixin(Generic[T]):
                     filter_.append({"$and": search_filter})
 
         return filter_
+
+    @staticmethod
+    def prepare_filter_for_text_search(
+        search_field_name: str,
+        inputs: dict,
+    ):
+        """
+        Needs a text index over the searched fields, see `ensure_text_index`.
+        Every term is quoted so that, like the regex search, a document must
+        contain all of them.
+        """
+        filter_ = []
+        if inputs.get(search_field_name):
+
+            split_value = list()
+            for i in inputs[search_field_name]:
+                split_value.extend(i.replace('"', " ").split())
+
+            if split_value:
+                filter_.append(
+                    {"$text": {"$search": " ".join(f'"{i}"' for i in split_value)}}
+                )
+
+        return filter_
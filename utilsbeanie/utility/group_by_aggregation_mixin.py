@@ -1,4 +1,7 @@
+from re import compile
 from typing import (
+    Any,
+    Tuple,
     List,
     Dict,
     Protocol,
@@ -7,68 +10,234 @@ from typing import (
     Generic,
 )
 
-from ..constant import DATETIME_BY_X_FORMAT
+from ..constant import (
+    DATETIME_BY_X_FORMAT,
+    DATETIME_BY_X_DATE_TRUNC,
+    DATETIME_BY_X_PART,
+    DATE_TRUNC_UNITS,
+    GROUP_BY_ACCUMULATORS,
+)
 
 
 @runtime_checkable
 class GroupByAggregationMixinProtocol(Protocol):
     field_separator: str = "__"
+    use_date_trunc: bool = False
+    group_by_timezone: str = "UTC"
+    group_by_start_of_week: str = "monday"
 
 
 T = TypeVar("T", bound=GroupByAggregationMixinProtocol)
 
+# longest first, `_by_year_month_day` must not be taken for `_by_day`
+DATETIME_SUFFIXES = sorted(
+    {*DATETIME_BY_X_FORMAT, *DATETIME_BY_X_DATE_TRUNC},
+    key=len,
+    reverse=True,
+)
+# the finest unit a `DATETIME_BY_X_PART` operator reads
+DATETIME_PART_UNITS = {
+    "$month": "month",
+    "$dayOfMonth": "day",
+    "$hour": "hour",
+    "$minute": "minute",
+    "$second": "second",
+}
+DATETIME_BIN_SUFFIX_PATTERN = compile(rf"_by_([1-9]\d*)_({'|'.join(DATE_TRUNC_UNITS)})s$")
+
 
 class GroupByAggregationMixin(Generic[T]):
     def build_group_by_pipeline(
         self: T,
         group_by_on: list[str],
+        metrics: Dict[str, Tuple] | None = None,
     ) -> List[Dict]:
+        """
+        `metrics` adds accumulators to the `$group` next to `count`, e.g.
+        `{"revenue": ("sum", "amount"), "p_users": ("distinct", "user_pid"),
+        "latest": ("top", "pid", {"created_at": -1}, 3)}`, see
+        `prepare_group_by_accumulators`. Metrics are top-level fields of
+        every group, so `__`-prefixed or suffixed inputs filter on them.
+        """
         aggregation_pipeline = []
-        add_field, group_id = self._prepare_fields(group_by_on)
-
-        if add_field:
-            aggregation_pipeline.append({"$addFields": add_field})
+        group_id = self._prepare_fields(group_by_on)
 
+        accumulators, metrics_fields = self.prepare_group_by_accumulators(metrics)
         aggregation_pipeline.append(
-            {"$group": {"_id": group_id, "count": {"$sum": 1}}},
+            {"$group": {"_id": group_id, "count": {"$sum": 1}, **accumulators}},
         )
 
+        if metrics_fields:
+            aggregation_pipeline.append({"$addFields": metrics_fields})
+
         return aggregation_pipeline
 
-    def _prepare_fields(self, group_by_on: list[str]) -> tuple[Dict, Dict]:
-        add_field = {}
+    def prepare_group_by_accumulators(
+        self: T,
+        metrics: Dict[str, Tuple] | None = None,
+    ) -> tuple[Dict, Dict]:
+        """
+        Accumulators of the `$group`, and the fields to compute after it.
+        `(operator, field)` with an operator of `GROUP_BY_ACCUMULATORS`;
+        `("count",)`; `("distinct", field)`, the number of distinct values;
+        `("top" | "bottom", field, sort_by, n=1)`, the `field` of the first
+        or last n documents of the group by `sort_by` (`$topN`/`$bottomN`,
+        MongoDB 5.2+).
+        """
+        accumulators = dict()
+        metrics_fields = dict()
+        for name, (operator, *arguments) in (metrics or {}).items():
+            if operator == "count":
+                accumulators[name] = {"$sum": 1}
+
+            elif operator in GROUP_BY_ACCUMULATORS:
+                accumulators[name] = {
+                    GROUP_BY_ACCUMULATORS[operator]: self._prepare_field_path(arguments[0])
+                }
+
+            elif operator == "distinct":
+                accumulators[name] = {"$addToSet": self._prepare_field_path(arguments[0])}
+                metrics_fields[name] = {"$size": f"${name}"}
+
+            elif operator in ("top", "bottom"):
+                field_name, sort_by, *n = arguments
+                accumulators[name] = {
+                    f"${operator}N": {
+                        "n": n[0] if n else 1,
+                        "sortBy": {
+                            key.replace(self.field_separator, "."): value
+                            for key, value in sort_by.items()
+                        },
+                        "output": self._prepare_field_path(field_name),
+                    }
+                }
+
+            else:
+                raise ValueError(f"unknown metric operator {operator!r} of {name!r}")
+
+        return accumulators, metrics_fields
+
+    def _prepare_field_path(self: T, field_name: str) -> str:
+        return f"${field_name.replace(self.field_separator, '.')}"
+
+    def build_group_by_facet_stage(
+        self: T,
+        groupings: Dict[str, list[str]],
+        last_filter: Dict | None = None,
+        sort: Dict | None = None,
+        limit: int | None = None,
+        metrics: Dict[str, Tuple] | None = None,
+    ) -> Dict:
+        """One `$facet` branch per grouping, each filtered, sorted and limited the same way."""
+        facet = dict()
+        for name, group_by_on in groupings.items():
+            branch = self.build_group_by_pipeline(group_by_on=group_by_on, metrics=metrics)
+            if last_filter:
+                branch.append({"$match": last_filter})
+            if sort:
+                branch.append({"$sort": sort})
+            if limit:
+                branch.append({"$limit": limit})
+            facet[name] = branch
+
+        return {"$facet": facet}
+
+    def _prepare_fields(self: T, group_by_on: list[str]) -> Dict:
+        """
+        The `$group` `_id`, keyed by the alias in `group_by_on` in both the
+        `$dateToString` and the `$dateTrunc` modes. Every key is computed in
+        it, so the source fields are never replaced and one field can be
+        grouped by several suffixes, e.g. `created_at_by_year` and
+        `created_at_by_month`.
+        """
         group_id = {}
         for field_alias_name in group_by_on:
             field_real_name = field_alias_name.replace(self.field_separator, ".")
+            base_real_name, suffix = self.split_datetime_suffix(field_real_name)
+
+            if suffix is None:
+                group_id[field_alias_name] = f"${field_real_name}"
 
-            if field_real_name.endswith(tuple(DATETIME_BY_X_FORMAT.keys())):
-                field_alias_name, field_real_name = self._process_datetime_field(field_alias_name, field_real_name)
-                if field_alias_name and field_real_name:
-                    add_field[field_alias_name] = {
-                        "$dateToString": {
-                            "format": DATETIME_BY_X_FORMAT[field_real_name],
-                            "date": f"${field_real_name}",
-                        }
+            elif suffix in DATETIME_BY_X_FORMAT and not self.use_date_trunc:
+                group_id[field_alias_name] = {
+                    "$dateToString": {
+                        "format": DATETIME_BY_X_FORMAT[suffix],
+                        "date": f"${base_real_name}",
+                        "timezone": self.group_by_timezone,
                     }
+                }
+
+            else:
+                group_id[field_alias_name] = self.build_datetime_bucket_expression(
+                    field_real_name=base_real_name,
+                    suffix=suffix,
+                )
+
+        return group_id
+
+    @staticmethod
+    def split_datetime_suffix(field_name: str) -> tuple[str, str | None]:
+        """`created_at_by_week` -> (`created_at`, `_by_week`); the suffix is None for other fields."""
+        match = DATETIME_BIN_SUFFIX_PATTERN.search(field_name)
+        if match:
+            return field_name[: match.start()], match.group()
+
+        for suffix in DATETIME_SUFFIXES:
+            if field_name.endswith(suffix) and len(field_name) > len(suffix):
+                return field_name[: -len(suffix)], suffix
+
+        return field_name, None
 
-            group_id[field_alias_name] = f"${field_real_name}"
+    def build_datetime_bucket_expression(
+        self: T,
+        field_real_name: str,
+        suffix: str,
+    ) -> Dict[str, Any]:
+        """
+        A native date (`$dateTrunc`, MongoDB 5.0+) or, for the suffixes of
+        `DATETIME_BY_X_PART`, an integer, in `group_by_timezone`.
+        """
+        if suffix in DATETIME_BY_X_PART:
+            return {
+                DATETIME_BY_X_PART[suffix]: {
+                    "date": f"${field_real_name}",
+                    "timezone": self.group_by_timezone,
+                }
+            }
+
+        unit, bin_size = self.parse_datetime_suffix(suffix)
+        expression = {
+            "date": f"${field_real_name}",
+            "unit": unit,
+            "binSize": bin_size,
+            "timezone": self.group_by_timezone,
+        }
+        if unit == "week":
+            expression["startOfWeek"] = self.group_by_start_of_week
+
+        return {"$dateTrunc": expression}
+
+    @staticmethod
+    def parse_datetime_suffix(suffix: str) -> tuple[str, int]:
+        """
+        The `$dateTrunc` unit and bin size of a bucket suffix; for a date-part
+        suffix, the finest unit it reads and 1.
+        """
+        match = DATETIME_BIN_SUFFIX_PATTERN.fullmatch(suffix)
+        if match:
+            return match.group(2), int(match.group(1))
 
-        return add_field, group_id
+        if suffix in DATETIME_BY_X_PART:
+            return DATETIME_PART_UNITS[DATETIME_BY_X_PART[suffix]], 1
 
-    def _process_datetime_field(self, alias_name: str, real_name: str) -> tuple[str, str]:
-        for datetime_key, datetime_value in DATETIME_BY_X_FORMAT.items():
-            if real_name.endswith(datetime_key):
-                alias_name = alias_name.replace(datetime_key, "")
-                real_name = real_name.replace(datetime_key, "")
-                return alias_name, real_name
-        return alias_name, real_name
+        return DATETIME_BY_X_DATE_TRUNC[suffix]["unit"], DATETIME_BY_X_DATE_TRUNC[suffix]["binSize"]
 
     @staticmethod
     def build_group_by_attributes(attributes_names: tuple[str, ...]) -> list[str]:
         group_by_attributes = list()
         for i in attributes_names:
             if i.endswith("_at"):
-                for j in DATETIME_BY_X_FORMAT.keys():
+                for j in {**DATETIME_BY_X_FORMAT, **DATETIME_BY_X_DATE_TRUNC}.keys():
                     group_by_attributes.append(f"{i}{j}")
 
             else:
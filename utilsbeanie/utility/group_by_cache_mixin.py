@@ -0,0 +1,136 @@
+from datetime import (
+    datetime,
+    timedelta,
+)
+from decimal import Decimal
+from typing import (
+    Any,
+    Dict,
+    List,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+    Generic,
+)
+
+from bson import (
+    Decimal128,
+    ObjectId,
+)
+
+from ..constant import DATETIME_BY_X_PART
+
+
+@runtime_checkable
+class GroupByCacheMixinProtocol(Protocol):
+    field_separator: str = "__"
+    use_date_trunc: bool = False
+
+    @staticmethod
+    def split_datetime_suffix(field_name: str) -> tuple[str, str | None]: ...
+
+    @staticmethod
+    def parse_datetime_suffix(suffix: str) -> tuple[str, int]: ...
+
+    @staticmethod
+    def truncate_datetime(
+        value: datetime,
+        unit: str,
+        timezone: str = "UTC",
+        start_of_week: str = "monday",
+    ) -> datetime: ...
+
+    @staticmethod
+    def get_value_by_path(obj: Dict, path: str) -> Any: ...
+
+
+T = TypeVar("T", bound=GroupByCacheMixinProtocol)
+
+# added to a bucket start, a time inside the next bucket whatever the
+# timezone offset or daylight saving change.
+BUCKET_STEPS = {
+    "second": timedelta(seconds=1.5),
+    "minute": timedelta(seconds=90),
+    "hour": timedelta(minutes=90),
+    "day": timedelta(hours=36),
+    "week": timedelta(days=10),
+    "month": timedelta(days=45),
+    "quarter": timedelta(days=120),
+    "year": timedelta(days=400),
+}
+
+
+class GroupByCacheMixin(Generic[T]):
+    def find_group_by_bucket_field(self: T, group_by_on: list[str]) -> tuple[str, str] | None:
+        """
+        The time field and unit of the first grouping that is a single-unit
+        time bucket (not a date part), or None when the grouping has none.
+        """
+        for field_alias_name in group_by_on:
+            base_real_name, suffix = self.split_datetime_suffix(
+                field_alias_name.replace(self.field_separator, ".")
+            )
+            if suffix is None or suffix in DATETIME_BY_X_PART:
+                continue
+
+            unit, bin_size = self.parse_datetime_suffix(suffix)
+            if bin_size == 1:
+                return base_real_name, unit
+
+        return None
+
+    def next_bucket_start(
+        self: T,
+        start: datetime,
+        unit: str,
+        timezone: str = "UTC",
+        start_of_week: str = "monday",
+    ) -> datetime:
+        return self.truncate_datetime(start + BUCKET_STEPS[unit], unit, timezone, start_of_week)
+
+    def sort_objs(self: T, objs: List[Dict], sort: Dict | None) -> List[Dict]:
+        """`objs` ordered like a `$sort` stage of `sort` would order them."""
+        objs = list(objs)
+        for key, direction in reversed(list((sort or {}).items())):
+            objs.sort(
+                key=lambda i: self._prepare_sort_key(self.get_value_by_path(i, key)),
+                reverse=direction < 0,
+            )
+
+        return objs
+
+    @classmethod
+    def _prepare_sort_key(cls, value: Any) -> tuple:
+        # the BSON comparison order: null, numbers, strings, objects, arrays,
+        # binary data, ObjectId, booleans, dates.
+        if value is None:
+            return (0,)
+
+        if isinstance(value, bool):
+            return (8, value)
+
+        if isinstance(value, Decimal128):
+            value = value.to_decimal()
+
+        if isinstance(value, (int, float, Decimal)):
+            return (1, value)
+
+        if isinstance(value, str):
+            return (2, value)
+
+        if isinstance(value, dict):
+            return (3, tuple((key, cls._prepare_sort_key(i)) for key, i in value.items()))
+
+        if isinstance(value, (list, tuple)):
+            return (4, tuple(cls._prepare_sort_key(i) for i in value))
+
+        if isinstance(value, bytes):
+            return (6, value)
+
+        if isinstance(value, ObjectId):
+            return (7, value.binary)
+
+        if isinstance(value, datetime):
+            return (9, value)
+
+        return (10, str(value))
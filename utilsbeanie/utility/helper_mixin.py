@@ -12,6 +12,7 @@ from ..constant import (
     EnumOrderBy,
     ASCENDING,
     DESCENDING,
+    TEXT_SCORE,
 )
 
 from ..constant import EnumOrderBy
@@ -64,12 +65,12 @@ class HelperMixin(Generic[T]):
             skip_limit_list.append({"$skip": skip})
 
         if limit:
-            skip_limit_list.append({"$skip": limit})
+            skip_limit_list.append({"$limit": limit})
 
         if skip_limit_list:
             return skip_limit_list
 
-        if page_size > 0:
+        if page_size and page_size > 0:
             number_of_document_to_skip = max(current_page - 1, 0) * page_size
             skip_limit_list = [
                 {"$skip": number_of_document_to_skip},
@@ -87,7 +88,24 @@ class HelperMixin(Generic[T]):
 
         list_of_sorting = list()
         for key, value in order_by.items():
+            if key == TEXT_SCORE:
+                # relevance is always ordered best first
+                list_of_sorting.append((key, {"$meta": "textScore"}))
+                continue
+
             order = ASCENDING if value == EnumOrderBy.ASCENDING else DESCENDING
             list_of_sorting.append((key.replace(self.field_separator, "."), order))
 
-        return list_of_sorting
\ No newline at end of file
+        return list_of_sorting
+
+    @staticmethod
+    def convert_sort_for_aggregation(
+        sort: List | Dict | None = None,
+    ) -> Dict | None:
+        if not sort:
+            return None
+
+        if isinstance(sort, dict):
+            return sort
+
+        return dict(sort)
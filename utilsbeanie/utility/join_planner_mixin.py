@@ -0,0 +1,247 @@
+from json import (
+    dumps,
+    loads,
+)
+from typing import (
+    Any,
+    Dict,
+    List,
+    Set,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+    Generic,
+)
+
+from ..constant import EnumJoinStrategy
+
+
+@runtime_checkable
+class JoinPlannerMixinProtocol(Protocol):
+    join_planner_stats: Dict[str, Dict[str, Any]]
+    join_planner_min_samples: int = 3
+
+    @classmethod
+    def collect_match_fields(cls, condition: Dict) -> Set[str] | None: ...
+
+    @classmethod
+    def _is_any_path_overlapped(cls, fields_names: Set[str], paths: List[str]) -> bool: ...
+
+
+T = TypeVar("T", bound=JoinPlannerMixinProtocol)
+
+
+class JoinPlannerMixin(Generic[T]):
+    def prepare_join_query_shape(
+        self: T,
+        lookups: List[Dict[str, Any]],
+        first_filter: Dict | None,
+        last_filter: Dict | None,
+        sort: Dict | None,
+        page_size: int | None,
+    ) -> str:
+        """The fields a query reads, without their values; statistics are kept per shape."""
+
+        def describe(filter_: Dict | None) -> List[str] | str:
+            fields_names = self.collect_match_fields(filter_ or {})
+            return "?" if fields_names is None else sorted(fields_names)
+
+        return dumps(
+            {
+                "lookups": [
+                    [
+                        i["lookup_from"],
+                        i["lookup_local_field"],
+                        i["lookup_foreign_field"],
+                        i["lookup_as"],
+                    ]
+                    for i in lookups
+                ],
+                "first_filter": describe(first_filter),
+                "last_filter": describe(last_filter),
+                "sort": list(sort or {}),
+                "page_size": page_size,
+            },
+            sort_keys=True,
+        )
+
+    def plan_join_strategies(
+        self: T,
+        lookups: List[Dict[str, Any]],
+        last_filter: Dict | None,
+        sort: Dict | None,
+        page_size: int | None,
+        collections_stats: Dict[str, Dict[str, Any]],
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        A strategy and the reason for it, per `lookup_as`, from the statistics
+        of the foreign collections (`collections_stats`, by `lookup_as`):
+        `count`, `is_indexed` and `is_reference`. `is_flippable` marks the
+        decisions `choose_join_plan` may revise from observed latencies.
+        """
+        page_fields_names = self.collect_match_fields(last_filter or {})
+        if page_fields_names is not None:
+            page_fields_names |= set(sort or {})
+
+        decisions = dict()
+        for lookup in lookups:
+            stats = collections_stats[lookup["lookup_as"]]
+            if page_fields_names is None:
+                decision = (EnumJoinStrategy.SERVER, "last_filter can not be analysed", False)
+
+            elif self._is_any_path_overlapped(page_fields_names, [lookup["lookup_as"]]):
+                decision = (EnumJoinStrategy.SERVER, "read by last_filter or sort", False)
+
+            elif lookup["unwind"] and not lookup["to_one"]:
+                decision = (EnumJoinStrategy.SERVER, "one row per match of a to-many lookup", False)
+
+            elif stats["is_reference"]:
+                decision = (EnumJoinStrategy.APPLICATION, "reference collection in memory", False)
+
+            elif not page_size:
+                decision = (EnumJoinStrategy.SERVER, "not paginated", False)
+
+            elif not stats["is_indexed"] and stats["count"] > page_size:
+                decision = (
+                    EnumJoinStrategy.APPLICATION,
+                    f"{lookup['lookup_foreign_field']} is not indexed in "
+                    f"{stats['count']} documents: one $in scan instead of one per row",
+                    True,
+                )
+
+            else:
+                decision = (
+                    EnumJoinStrategy.DEFERRED,
+                    f"joined after the page of {page_size} rows in the same round trip",
+                    True,
+                )
+
+            decisions[lookup["lookup_as"]] = {
+                "strategy": decision[0],
+                "reason": decision[1],
+                "is_flippable": decision[2],
+            }
+
+        return decisions
+
+    def choose_join_plan(
+        self: T,
+        shape: str,
+        decisions: Dict[str, Dict[str, Any]],
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Once the planned combination was measured `join_planner_min_samples`
+        times, the alternative (every flippable lookup switched between
+        deferred and application) is measured as often; afterwards the one
+        with the lower mean duration is used.
+        """
+        flippable = [key for key, value in decisions.items() if value["is_flippable"]]
+        if not flippable:
+            return decisions
+
+        alternative = {
+            key: (
+                {
+                    **value,
+                    "strategy": (
+                        EnumJoinStrategy.APPLICATION
+                        if value["strategy"] == EnumJoinStrategy.DEFERRED
+                        else EnumJoinStrategy.DEFERRED
+                    ),
+                }
+                if key in flippable
+                else value
+            )
+            for key, value in decisions.items()
+        }
+
+        plans = self.join_planner_stats.get(shape, {}).get("plans", {})
+        planned_stats = plans.get(self.prepare_join_plan_key(decisions))
+        alternative_stats = plans.get(self.prepare_join_plan_key(alternative))
+
+        if not planned_stats or planned_stats["count"] < self.join_planner_min_samples:
+            return decisions
+
+        if not alternative_stats or alternative_stats["count"] < self.join_planner_min_samples:
+            return self._with_reason(
+                alternative,
+                flippable,
+                "exploring the alternative of: {reason}",
+            )
+
+        planned_mean = planned_stats["total_duration"] / planned_stats["count"]
+        alternative_mean = alternative_stats["total_duration"] / alternative_stats["count"]
+        if alternative_mean < planned_mean:
+            chosen = alternative
+            observed = f"observed {alternative_mean:.2f} ms against {planned_mean:.2f} ms"
+        else:
+            chosen = decisions
+            observed = f"observed {planned_mean:.2f} ms against {alternative_mean:.2f} ms"
+
+        return self._with_reason(chosen, flippable, f"{observed}; planned because {{reason}}")
+
+    def record_join_outcome(
+        self: T,
+        shape: str,
+        decisions: Dict[str, Dict[str, Any]],
+        duration: float,
+        number_of_rows: int,
+    ) -> None:
+        shape_stats = self.join_planner_stats.setdefault(
+            shape,
+            {"plans": dict(), "last_plan": None, "last_decisions": None},
+        )
+        plan_key = self.prepare_join_plan_key(decisions)
+        plan_stats = shape_stats["plans"].setdefault(
+            plan_key,
+            {"count": 0, "total_duration": 0.0, "last_duration": None, "last_number_of_rows": None},
+        )
+        plan_stats["count"] += 1
+        plan_stats["total_duration"] += duration
+        plan_stats["last_duration"] = duration
+        plan_stats["last_number_of_rows"] = number_of_rows
+
+        shape_stats["last_plan"] = plan_key
+        shape_stats["last_decisions"] = decisions
+
+    def get_join_planner_report(self: T) -> List[Dict[str, Any]]:
+        """Per query shape: the strategy each lookup used last and why, and the duration of every plan tried."""
+        return [
+            {
+                "shape": loads(shape),
+                "last_plan": shape_stats["last_plan"],
+                "decisions": {
+                    key: {"strategy": value["strategy"].value, "reason": value["reason"]}
+                    for key, value in shape_stats["last_decisions"].items()
+                },
+                "plans": {
+                    plan_key: {
+                        "count": plan_stats["count"],
+                        "mean_duration": plan_stats["total_duration"] / plan_stats["count"],
+                        "last_duration": plan_stats["last_duration"],
+                        "last_number_of_rows": plan_stats["last_number_of_rows"],
+                    }
+                    for plan_key, plan_stats in shape_stats["plans"].items()
+                },
+            }
+            for shape, shape_stats in self.join_planner_stats.items()
+        ]
+
+    @staticmethod
+    def prepare_join_plan_key(decisions: Dict[str, Dict[str, Any]]) -> str:
+        return ",".join(f"{key}:{value['strategy'].value}" for key, value in decisions.items())
+
+    @staticmethod
+    def _with_reason(
+        decisions: Dict[str, Dict[str, Any]],
+        keys: List[str],
+        template: str,
+    ) -> Dict[str, Dict[str, Any]]:
+        return {
+            key: (
+                {**value, "reason": template.format(reason=value["reason"])}
+                if key in keys
+                else value
+            )
+            for key, value in decisions.items()
+        }
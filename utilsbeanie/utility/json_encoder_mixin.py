@@ -0,0 +1,88 @@
+from base64 import b64encode
+from datetime import (
+    date,
+    datetime,
+    timezone,
+)
+from decimal import Decimal
+from enum import Enum
+from json import JSONEncoder
+from typing import (
+    Any,
+    Mapping,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+    Generic,
+)
+from uuid import UUID
+
+from bson import (
+    Decimal128,
+    ObjectId,
+)
+from pydantic import BaseModel
+
+
+@runtime_checkable
+class JsonEncoderMixinProtocol(Protocol):
+    pass
+
+
+T = TypeVar("T", bound=JsonEncoderMixinProtocol)
+
+
+def prepare_json_value(value: Any) -> Any:
+    """
+    `default` of the encoder: ObjectIds, UUIDs, decimals (`Decimal128` too,
+    so no precision is lost) as strings, datetimes as ISO 8601 in UTC (naive
+    ones, as the driver decodes them, are taken as UTC), binaries as base64
+    and other mappings (e.g. `RawBSONDocument`) as objects.
+    """
+    if isinstance(value, (ObjectId, UUID)):
+        return str(value)
+
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).isoformat()
+
+    if isinstance(value, date):
+        return value.isoformat()
+
+    if isinstance(value, Decimal128):
+        return str(value.to_decimal())
+
+    if isinstance(value, Decimal):
+        return str(value)
+
+    if isinstance(value, bytes):
+        return b64encode(value).decode()
+
+    if isinstance(value, Enum):
+        return value.value
+
+    if isinstance(value, Mapping):
+        return dict(value)
+
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+
+    if isinstance(value, BaseModel):
+        return value.model_dump(by_alias=True)
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_json_encoder = JSONEncoder(
+    default=prepare_json_value,
+    ensure_ascii=False,
+    separators=(",", ":"),
+)
+
+
+class JsonEncoderMixin(Generic[T]):
+    @staticmethod
+    def encode_json_document(document: Any) -> bytes:
+        """One document as compact UTF-8 JSON, see `prepare_json_value`."""
+        return _json_encoder.encode(document).encode()
@@ -0,0 +1,129 @@
+from typing import (
+    Any,
+    Dict,
+    List,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+    Generic,
+)
+
+
+@runtime_checkable
+class ParallelScanMixinProtocol(Protocol):
+    pass
+
+
+T = TypeVar("T", bound=ParallelScanMixinProtocol)
+
+
+class ParallelScanMixin(Generic[T]):
+    @staticmethod
+    def prepare_scan_split_points(samples: List[Any], number_of_partitions: int) -> List[Any]:
+        """Evenly spaced values of the sorted `samples`, at most `number_of_partitions - 1`."""
+        samples = [j for i, j in enumerate(samples) if i == 0 or j != samples[i - 1]]
+        if number_of_partitions < 2 or not samples:
+            return []
+
+        split_points = list()
+        for i in range(1, number_of_partitions):
+            value = samples[len(samples) * i // number_of_partitions]
+            if not split_points or split_points[-1] != value:
+                split_points.append(value)
+
+        return split_points
+
+    @staticmethod
+    def prepare_scan_state(field_name: str, split_points: List[Any]) -> Dict[str, Any]:
+        """
+        The partitions between consecutive `split_points` (the first and last
+        unbounded) with their checkpoints: `last` is the value of `field_name`
+        of the last document delivered. Kept as is, it resumes a scan.
+
+        Ranges only match values of the split points' BSON types, so for a
+        field other than `_id` a last partition holds the documents no range
+        matches (null, missing or of another type), read in `_id` order.
+        """
+        bounds = [None, *split_points, None]
+        partitions = [
+            {
+                "lower": bounds[i],
+                "upper": bounds[i + 1],
+                "last": None,
+                "count": 0,
+                "is_done": False,
+            }
+            for i in range(len(bounds) - 1)
+        ]
+        if split_points and field_name != "_id":
+            partitions.append(
+                {
+                    "lower": None,
+                    "upper": None,
+                    "split_points": list(split_points),
+                    "last": None,
+                    "count": 0,
+                    "is_done": False,
+                }
+            )
+
+        return {"field_name": field_name, "partitions": partitions}
+
+    @staticmethod
+    def prepare_scan_range(lower: Any = None, upper: Any = None) -> Dict:
+        range_ = dict()
+        if lower is not None:
+            range_["$gte"] = lower
+        if upper is not None:
+            range_["$lt"] = upper
+
+        return range_
+
+    @classmethod
+    def prepare_scan_partition_filter(
+        cls,
+        filter_: Dict | None,
+        field_name: str,
+        partition: Dict[str, Any],
+    ) -> Dict:
+        if partition.get("split_points"):
+            bounds = [None, *partition["split_points"], None]
+            conditions = [
+                {
+                    "$nor": [
+                        {field_name: cls.prepare_scan_range(bounds[i], bounds[i + 1])}
+                        for i in range(len(bounds) - 1)
+                    ]
+                }
+            ]
+            if partition["last"] is not None:
+                conditions.append({"_id": {"$gt": partition["last"]}})
+
+        else:
+            range_ = cls.prepare_scan_range(partition["lower"], partition["upper"])
+            if partition["last"] is not None:
+                range_.pop("$gte", None)
+                range_["$gt"] = partition["last"]
+            conditions = [{field_name: range_}] if range_ else []
+
+        if filter_:
+            conditions.insert(0, filter_)
+
+        if not conditions:
+            return {}
+
+        if len(conditions) == 1:
+            return conditions[0]
+
+        return {"$and": conditions}
+
+    @staticmethod
+    def prepare_scan_projection(projection: Dict | None, field_name: str) -> Dict | None:
+        """`projection` keeping `field_name`, which the checkpoints read."""
+        if projection is None:
+            return None
+
+        if any(j for i, j in projection.items() if i != "_id"):
+            return {**projection, field_name: 1}
+
+        return {i: j for i, j in projection.items() if i != field_name}
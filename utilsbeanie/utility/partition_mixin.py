@@ -0,0 +1,166 @@
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+    Generic,
+)
+
+from bson import ObjectId
+
+
+@runtime_checkable
+class PartitionMixinProtocol(Protocol):
+    partition_field_name: str | None = None
+    partition_days: int | None = None
+    epoch_pid_suffix_digits: int = 4
+
+    @staticmethod
+    def get_value_by_path(obj: Dict, path: str) -> Any: ...
+
+
+T = TypeVar("T", bound=PartitionMixinProtocol)
+
+EPOCH = datetime(1970, 1, 1)
+
+
+class PartitionMixin(Generic[T]):
+    """
+    Partitions are collections named `<collection>_<YYYYMM>` (per month) or
+    `<collection>_<YYYYMMDD>` (per `partition_days` days from the epoch) by
+    the start of their time range. The partition field is a datetime, an
+    epoch `pid` or `_id`; datetimes are UTC, naive or not.
+    """
+
+    def prepare_partition_time(self: T, value: Any) -> datetime | None:
+        """The naive UTC time of a value of the partition field."""
+        if isinstance(value, datetime):
+            if value.tzinfo is not None:
+                value = value.astimezone(timezone.utc).replace(tzinfo=None)
+            return value
+
+        if isinstance(value, ObjectId):
+            return value.generation_time.replace(tzinfo=None)
+
+        if isinstance(value, int) and not isinstance(value, bool):
+            return EPOCH + timedelta(seconds=value // 10**self.epoch_pid_suffix_digits)
+
+        return None
+
+    def prepare_partition_start(self: T, time: datetime) -> datetime:
+        if self.partition_days is None:
+            return datetime(time.year, time.month, 1)
+
+        days = (time - EPOCH).days
+        return EPOCH + timedelta(days=days - days % self.partition_days)
+
+    def prepare_next_partition_start(self: T, start: datetime) -> datetime:
+        if self.partition_days is None:
+            return datetime(start.year + start.month // 12, start.month % 12 + 1, 1)
+
+        return start + timedelta(days=self.partition_days)
+
+    def prepare_partition_name(self: T, collection_name: str, start: datetime) -> str:
+        suffix = f"{start:%Y%m}" if self.partition_days is None else f"{start:%Y%m%d}"
+        return f"{collection_name}_{suffix}"
+
+    def parse_partition_name(self: T, collection_name: str, name: str) -> datetime | None:
+        """The start of partition `name` of `collection_name`, None for other collections."""
+        prefix = f"{collection_name}_"
+        suffix = name[len(prefix):]
+        if not name.startswith(prefix) or not suffix.isdigit():
+            return None
+
+        try:
+            if self.partition_days is None and len(suffix) == 6:
+                return datetime.strptime(suffix, "%Y%m")
+            if self.partition_days is not None and len(suffix) == 8:
+                return datetime.strptime(suffix, "%Y%m%d")
+        except ValueError:
+            return None
+
+        return None
+
+    def prepare_partition_time_range(
+        self: T,
+        filter_: Dict | None,
+    ) -> Tuple[datetime | None, datetime | None]:
+        """
+        `(since, until)` of the partition field a document matching
+        `filter_` can have, both inclusive, None where unbounded. Reads
+        top-level conditions, `$and`, and `$or` whose every branch is bounded.
+        """
+        since, until = None, None
+        for condition in self._prepare_partition_conditions(filter_ or {}):
+            if "$or" in condition:
+                ranges = [self.prepare_partition_time_range(i) for i in condition["$or"]]
+                sinces = [i for i, _ in ranges]
+                untils = [j for _, j in ranges]
+                since_ = None if not ranges or None in sinces else min(sinces)
+                until_ = None if not ranges or None in untils else max(untils)
+
+            else:
+                since_, until_ = self._prepare_condition_time_range(condition)
+
+            if since_ is not None and (since is None or since_ > since):
+                since = since_
+            if until_ is not None and (until is None or until_ < until):
+                until = until_
+
+        return since, until
+
+    def filter_partition_starts(
+        self: T,
+        starts: List[datetime],
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> List[datetime]:
+        """The sorted `starts` whose partitions overlap `[since, until]`."""
+        return [
+            i
+            for i in sorted(starts)
+            if (until is None or i <= until)
+            and (since is None or self.prepare_next_partition_start(i) > since)
+        ]
+
+    def _prepare_partition_conditions(self: T, filter_: Dict) -> List[Dict]:
+        conditions = list()
+        for key, value in filter_.items():
+            if key == "$and":
+                for i in value:
+                    conditions.extend(self._prepare_partition_conditions(i))
+            elif key == "$or":
+                conditions.append({"$or": value})
+            elif key == self.partition_field_name:
+                conditions.append({key: value})
+
+        return conditions
+
+    def _prepare_condition_time_range(
+        self: T,
+        condition: Dict,
+    ) -> Tuple[datetime | None, datetime | None]:
+        value = condition[self.partition_field_name]
+        if not isinstance(value, dict) or not any(i.startswith("$") for i in value):
+            time = self.prepare_partition_time(value)
+            return time, time
+
+        since, until = None, None
+        for operator, operand in value.items():
+            time = self.prepare_partition_time(operand)
+            if time is None:
+                continue
+            if operator in ("$gt", "$gte", "$eq"):
+                since = time if since is None else max(since, time)
+            if operator in ("$lt", "$lte", "$eq"):
+                until = time if until is None else min(until, time)
+
+        return since, until
@@ -0,0 +1,406 @@
+from difflib import unified_diff
+from json import dumps
+from typing import (
+    Dict,
+    List,
+    Set,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+    Generic,
+)
+
+
+@runtime_checkable
+class PipelineOptimizerMixinProtocol(Protocol): ...
+
+
+T = TypeVar("T", bound=PipelineOptimizerMixinProtocol)
+
+LOGICAL_OPERATORS = ("$and", "$or", "$nor")
+
+# stages that a `$match` can be moved in front of as long as it does not read
+# the fields they write (checked in `_is_match_movable_before`).
+PASSABLE_STAGES = ("$lookup", "$unwind", "$addFields", "$set", "$project", "$sort", "$match")
+
+# stages `defer_lookup_stages` can move behind the page
+JOIN_STAGES = ("$lookup", "$unwind", "$addFields", "$set", "$project")
+PAGE_STAGES = ("$match", "$sort", "$skip", "$limit")
+
+
+class PipelineOptimizerMixin(Generic[T]):
+    def optimize_aggregation_pipeline(
+        self: T,
+        aggregation_pipeline: List[Dict],
+        print_diff: bool = False,
+        defer_lookups: bool = False,
+    ) -> List[Dict]:
+        """
+        Remove empty stages, move the conditions of every `$match` as early as
+        the stages before it allow (ahead of `$lookup`/`$unwind` when they only
+        read base fields) and merge adjacent `$match` stages. With
+        `defer_lookups`, joins are also moved behind the page, see
+        `defer_lookup_stages`.
+        Stages are never mutated; changed ones are rebuilt.
+        """
+        optimized = self.remove_empty_stages(aggregation_pipeline)
+        optimized = self.push_down_match_stages(optimized)
+        optimized = self.merge_adjacent_match_stages(optimized)
+
+        if defer_lookups:
+            optimized = self.defer_lookup_stages(optimized)
+
+        if print_diff:
+            print(
+                self.format_aggregation_pipeline_diff(aggregation_pipeline, optimized),
+                flush=True,
+            )
+
+        return optimized
+
+    @staticmethod
+    def format_aggregation_pipeline_diff(
+        before: List[Dict],
+        after: List[Dict],
+    ) -> str:
+        def to_lines(aggregation_pipeline: List[Dict]) -> List[str]:
+            return [dumps(i, default=str, sort_keys=True) for i in aggregation_pipeline]
+
+        return "\n".join(
+            unified_diff(
+                to_lines(before),
+                to_lines(after),
+                fromfile="before",
+                tofile="after",
+                lineterm="",
+            )
+        )
+
+    @staticmethod
+    def remove_empty_stages(aggregation_pipeline: List[Dict]) -> List[Dict]:
+        result = list()
+        for stage in aggregation_pipeline:
+            (operator, spec), = stage.items()
+            if operator in ("$match", "$addFields", "$set", "$sort") and not spec:
+                continue
+
+            if operator == "$skip" and spec == 0:
+                continue
+
+            result.append(stage)
+
+        return result
+
+    @classmethod
+    def push_down_match_stages(cls, aggregation_pipeline: List[Dict]) -> List[Dict]:
+        result = list()
+        for stage in aggregation_pipeline:
+            if "$match" not in stage or not result:
+                result.append(stage)
+                continue
+
+            # index of `result` before which each condition will be placed
+            positions = dict()
+            for condition in cls.split_match_conditions(stage["$match"]):
+                fields_names = cls.collect_match_fields(condition)
+
+                position = len(result)
+                while (
+                    fields_names is not None
+                    and position > 0
+                    and cls._is_match_movable_before(result[position - 1], fields_names)
+                ):
+                    position -= 1
+
+                positions.setdefault(position, list()).append(condition)
+
+            for position in sorted(positions, reverse=True):
+                result.insert(
+                    position,
+                    {"$match": cls.join_match_conditions(positions[position])},
+                )
+
+        return result
+
+    @classmethod
+    def defer_lookup_stages(cls, aggregation_pipeline: List[Dict]) -> List[Dict]:
+        """
+        `[..., $lookup, $unwind, $project, $match, $sort, $skip, $limit]` becomes
+        `[..., $match, $sort, $skip, $limit, $lookup, $unwind, $project]` so the
+        server joins only the rows of the page. It is done only when the page
+        stages read base fields that the join stages neither write nor drop,
+        and every `$unwind` keeps unmatched rows (`preserveNullAndEmptyArrays`)
+        of a to-one lookup (see `is_to_one_lookup`), so the join can not
+        change the rows a page contains.
+        """
+        page_start = len(aggregation_pipeline)
+        while (
+            page_start > 0
+            and next(iter(aggregation_pipeline[page_start - 1])) in PAGE_STAGES
+        ):
+            page_start -= 1
+
+        page_stages = aggregation_pipeline[page_start:]
+        if not any("$limit" in i for i in page_stages):
+            return aggregation_pipeline
+
+        join_start = page_start
+        while (
+            join_start > 0
+            and next(iter(aggregation_pipeline[join_start - 1])) in JOIN_STAGES
+        ):
+            join_start -= 1
+
+        join_stages = aggregation_pipeline[join_start:page_start]
+        if not any("$lookup" in i for i in join_stages):
+            return aggregation_pipeline
+
+        fields_names = set()
+        for stage in page_stages:
+            if "$match" in stage:
+                match_fields_names = cls.collect_match_fields(stage["$match"])
+                if match_fields_names is None:
+                    return aggregation_pipeline
+                fields_names |= match_fields_names
+
+            elif "$sort" in stage:
+                fields_names |= set(stage["$sort"])
+
+        to_one_lookups_as = set()
+        for stage in join_stages:
+            if "$lookup" in stage and cls.is_to_one_lookup(stage["$lookup"]):
+                to_one_lookups_as.add(stage["$lookup"]["as"])
+
+            if "$unwind" in stage and not cls._is_to_one_unwind(
+                stage["$unwind"], to_one_lookups_as
+            ):
+                return aggregation_pipeline
+
+            if not cls._is_match_movable_before(stage, fields_names):
+                return aggregation_pipeline
+
+        return [
+            *aggregation_pipeline[:join_start],
+            *page_stages,
+            *join_stages,
+        ]
+
+    @classmethod
+    def prune_count_pipeline(cls, aggregation_pipeline: List[Dict]) -> List[Dict]:
+        """
+        Drop the stages a `$count` does not depend on: `$sort`, and the
+        `$lookup`, `$unwind`, `$project`, `$addFields` whose output no later
+        `$match` reads. Stages are walked from the end; pruning stops at the
+        first stage whose effect on the rows can not be told (`$group`,
+        `$limit`, a `$match` with `$expr`, ...).
+        Like in `defer_lookup_stages`, only the `$unwind` of a to-one lookup
+        that keeps unmatched rows is dropped; any other changes the count.
+        """
+        to_one_lookups_as = {
+            stage["$lookup"]["as"]
+            for stage in aggregation_pipeline
+            if "$lookup" in stage and cls.is_to_one_lookup(stage["$lookup"])
+        }
+        fields_names = set()
+        result = list()
+        is_prunable = True
+        for stage in reversed(aggregation_pipeline):
+            (operator, spec), = stage.items()
+            if not is_prunable or operator == "$count":
+                result.append(stage)
+
+            elif operator == "$match":
+                match_fields_names = cls.collect_match_fields(spec)
+                if match_fields_names is None:
+                    is_prunable = False
+                else:
+                    fields_names |= match_fields_names
+                result.append(stage)
+
+            elif operator == "$sort":
+                continue
+
+            elif operator == "$lookup":
+                if not cls._is_any_path_overlapped(fields_names, [spec["as"]]):
+                    continue
+
+                if "localField" not in spec or "let" in spec:
+                    is_prunable = False
+                else:
+                    fields_names.add(spec["localField"])
+                result.append(stage)
+
+            elif operator == "$unwind":
+                if cls._is_to_one_unwind(spec, to_one_lookups_as):
+                    if cls._is_match_movable_before(stage, fields_names):
+                        continue
+
+                path = spec if isinstance(spec, str) else spec["path"]
+                fields_names.add(path[1:])
+                result.append(stage)
+
+            elif operator in ("$project", "$addFields", "$set"):
+                if cls._is_match_movable_before(stage, fields_names):
+                    continue
+
+                is_prunable = False
+                result.append(stage)
+
+            else:
+                is_prunable = False
+                result.append(stage)
+
+        return result[::-1]
+
+    @staticmethod
+    def is_to_one_lookup(spec: Dict) -> bool:
+        """
+        A `$lookup` that joins at most one document: its pipeline ends with
+        `{"$limit": 1}`, as the `to_one` lookups of `build_lookup_stages` do.
+        """
+        return list(spec.get("pipeline") or [])[-1:] == [{"$limit": 1}]
+
+    @staticmethod
+    def _is_to_one_unwind(spec: Dict | str, to_one_lookups_as: Set[str]) -> bool:
+        """An `$unwind` that keeps every row as it is: of a to-one lookup, keeping unmatched rows."""
+        return (
+            isinstance(spec, dict)
+            and bool(spec.get("preserveNullAndEmptyArrays"))
+            and not spec.get("includeArrayIndex")
+            and spec["path"][1:] in to_one_lookups_as
+        )
+
+    @classmethod
+    def merge_adjacent_match_stages(cls, aggregation_pipeline: List[Dict]) -> List[Dict]:
+        result = list()
+        for stage in aggregation_pipeline:
+            if "$match" in stage and result and "$match" in result[-1]:
+                result[-1] = {
+                    "$match": cls.join_match_conditions(
+                        cls.split_match_conditions(result[-1]["$match"])
+                        + cls.split_match_conditions(stage["$match"])
+                    )
+                }
+                continue
+
+            result.append(stage)
+
+        return result
+
+    @staticmethod
+    def split_match_conditions(match: Dict) -> List[Dict]:
+        conditions = list()
+        for key, value in match.items():
+            if key == "$and":
+                conditions.extend(value)
+
+            else:
+                conditions.append({key: value})
+
+        return conditions
+
+    @staticmethod
+    def join_match_conditions(conditions: List[Dict]) -> Dict:
+        if len(conditions) == 1:
+            return conditions[0]
+
+        keys = [key for condition in conditions for key in condition]
+        if "$and" not in keys and len(keys) == len(set(keys)):
+            return {key: value for condition in conditions for key, value in condition.items()}
+
+        return {"$and": conditions}
+
+    @classmethod
+    def collect_match_fields(cls, condition: Dict) -> Set[str] | None:
+        """Fields a query condition reads, or None when that can not be told (e.g. `$expr`)."""
+        fields_names = set()
+        for key, value in condition.items():
+            if key in LOGICAL_OPERATORS:
+                for i in value:
+                    sub_fields_names = cls.collect_match_fields(i)
+                    if sub_fields_names is None:
+                        return None
+                    fields_names |= sub_fields_names
+
+            elif key == "$comment":
+                continue
+
+            elif key.startswith("$"):
+                return None
+
+            else:
+                fields_names.add(key)
+
+        return fields_names
+
+    @staticmethod
+    def is_path_overlapped(path_1: str, path_2: str) -> bool:
+        return (
+            path_1 == path_2
+            or path_1.startswith(f"{path_2}.")
+            or path_2.startswith(f"{path_1}.")
+        )
+
+    @classmethod
+    def _is_any_path_overlapped(cls, fields_names: Set[str], paths: List[str]) -> bool:
+        return any(cls.is_path_overlapped(i, j) for i in fields_names for j in paths)
+
+    @classmethod
+    def _is_match_movable_before(cls, stage: Dict, fields_names: Set[str]) -> bool:
+        (operator, spec), = stage.items()
+        if operator not in PASSABLE_STAGES:
+            return False
+
+        if operator in ("$sort", "$match"):
+            return True
+
+        if operator == "$lookup":
+            return not cls._is_any_path_overlapped(fields_names, [spec["as"]])
+
+        if operator == "$unwind":
+            if isinstance(spec, str):
+                return not cls._is_any_path_overlapped(fields_names, [spec[1:]])
+
+            paths = [spec["path"][1:]]
+            if spec.get("includeArrayIndex"):
+                paths.append(spec["includeArrayIndex"])
+            return not cls._is_any_path_overlapped(fields_names, paths)
+
+        if operator in ("$addFields", "$set"):
+            return not cls._is_any_path_overlapped(fields_names, list(spec))
+
+        return cls._is_match_movable_before_project(spec, fields_names)
+
+    @classmethod
+    def _is_match_movable_before_project(cls, spec: Dict, fields_names: Set[str]) -> bool:
+        included = list()
+        excluded = list()
+        is_inclusion = False
+        for key, value in spec.items():
+            if value is False or (type(value) in (int, float) and value == 0):
+                excluded.append(key)
+
+            elif value is True or type(value) in (int, float):
+                included.append(key)
+                is_inclusion = True
+
+            else:
+                # a computed value (`"$y"`, an expression) or a nested
+                # projection; either makes it an inclusion projection
+                if cls._is_any_path_overlapped(fields_names, [key]):
+                    return False
+                is_inclusion = True
+
+        if cls._is_any_path_overlapped(fields_names, excluded):
+            return False
+
+        if not is_inclusion:
+            return True
+
+        if "_id" not in excluded:
+            included.append("_id")
+
+        return all(
+            any(i == j or i.startswith(f"{j}.") for j in included)
+            for i in fields_names
+        )
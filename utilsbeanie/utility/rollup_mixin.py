@@ -0,0 +1,300 @@
+from datetime import (
+    date,
+    datetime,
+    timedelta,
+    timezone as dt_timezone,
+)
+from re import fullmatch
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+    Generic,
+)
+from zoneinfo import ZoneInfo
+
+from ..constant import GROUP_BY_ACCUMULATORS
+
+
+@runtime_checkable
+class RollupMixinProtocol(Protocol):
+    field_separator: str = "__"
+    group_by_timezone: str = "UTC"
+    group_by_start_of_week: str = "monday"
+    rollups: Dict[str, Dict[str, Any]]
+
+    def _prepare_fields(self, group_by_on: list[str]) -> Dict: ...
+
+    def _prepare_field_path(self, field_name: str) -> str: ...
+
+    @staticmethod
+    def split_datetime_suffix(field_name: str) -> tuple[str, str | None]: ...
+
+    @staticmethod
+    def parse_datetime_suffix(suffix: str) -> tuple[str, int]: ...
+
+
+T = TypeVar("T", bound=RollupMixinProtocol)
+
+UNIT_RANKS = {
+    "second": 0,
+    "minute": 1,
+    "hour": 2,
+    "day": 3,
+    "week": 4,
+    "month": 5,
+    "quarter": 6,
+    "year": 7,
+}
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# metrics a rollup can store partially and combine again
+ROLLUP_METRICS_OPERATORS = ("count", "sum", "avg", "min", "max")
+
+
+class RollupMixin(Generic[T]):
+    def build_rollup_pipeline(
+        self: T,
+        rollup: Dict[str, Any],
+        since: datetime | None = None,
+    ) -> List[Dict]:
+        """
+        Group the documents from `since` (a bucket start; all of them when
+        None) into `rollup` buckets and `$merge` them into the rollup
+        collection, replacing the buckets computed before. A rollup document
+        has the key fields and `time_field` (the bucket start) at their
+        original paths, so group-by pipelines and filters apply to it as is.
+        """
+        aggregation_pipeline = list()
+        if since is not None:
+            aggregation_pipeline.append({"$match": {rollup["time_field"]: {"$gte": since}}})
+
+        group_id = {f"k{i}": f"${key}" for i, key in enumerate(rollup["keys"])}
+        bucket = {
+            "date": f"${rollup['time_field']}",
+            "unit": rollup["unit"],
+            "timezone": rollup["timezone"],
+        }
+        if rollup["unit"] == "week":
+            bucket["startOfWeek"] = rollup["start_of_week"]
+        group_id["bucket"] = {"$dateTrunc": bucket}
+
+        accumulators = {"count": {"$sum": 1}}
+        for name, (operator, *arguments) in rollup["metrics"].items():
+            if operator == "count":
+                accumulators[name] = {"$sum": 1}
+
+            elif operator == "avg":
+                path = self._prepare_field_path(arguments[0])
+                accumulators[f"_sum_{name}"] = {"$sum": path}
+                accumulators[f"_count_{name}"] = {"$sum": {"$cond": [{"$isNumber": path}, 1, 0]}}
+
+            else:
+                accumulators[name] = {
+                    GROUP_BY_ACCUMULATORS[operator]: self._prepare_field_path(arguments[0])
+                }
+
+        aggregation_pipeline.extend(
+            [
+                {"$group": {"_id": group_id, **accumulators}},
+                {
+                    "$project": {
+                        "_id": 1,
+                        **{key: f"$_id.k{i}" for i, key in enumerate(rollup["keys"])},
+                        rollup["time_field"]: "$_id.bucket",
+                        **{i: 1 for i in accumulators},
+                    }
+                },
+                {
+                    "$merge": {
+                        "into": rollup["collection_name"],
+                        "on": "_id",
+                        "whenMatched": "replace",
+                        "whenNotMatched": "insert",
+                    }
+                },
+            ]
+        )
+        return aggregation_pipeline
+
+    def build_rollup_group_by_pipeline(
+        self: T,
+        group_by_on: list[str],
+        metrics: Dict[str, Tuple] | None = None,
+    ) -> List[Dict]:
+        """`build_group_by_pipeline` for rollup documents: partial metrics are combined."""
+        aggregation_pipeline = list()
+        group_id = self._prepare_fields(group_by_on)
+
+        accumulators = {"count": {"$sum": "$count"}}
+        averages = dict()
+        for name, (operator, *_) in (metrics or {}).items():
+            if operator in ("count", "sum"):
+                accumulators[name] = {"$sum": f"${name}"}
+
+            elif operator == "avg":
+                accumulators[f"_sum_{name}"] = {"$sum": f"$_sum_{name}"}
+                accumulators[f"_count_{name}"] = {"$sum": f"$_count_{name}"}
+                averages[name] = {
+                    "$cond": [
+                        {"$gt": [f"$_count_{name}", 0]},
+                        {"$divide": [f"$_sum_{name}", f"$_count_{name}"]},
+                        None,
+                    ]
+                }
+
+            else:
+                accumulators[name] = {GROUP_BY_ACCUMULATORS[operator]: f"${name}"}
+
+        aggregation_pipeline.append({"$group": {"_id": group_id, **accumulators}})
+        if averages:
+            aggregation_pipeline.append({"$addFields": averages})
+            aggregation_pipeline.append(
+                {
+                    "$project": {
+                        f"_{i}_{name}": 0 for name in averages for i in ("sum", "count")
+                    }
+                }
+            )
+
+        return aggregation_pipeline
+
+    def find_covering_rollup(
+        self: T,
+        aggregation_pipeline: List[Dict] | None,
+        first_filter: Dict | None,
+        middle_filter: Dict | None,
+        group_by_on: list[str],
+        metrics: Dict[str, Tuple] | None = None,
+    ) -> Dict[str, Any] | None:
+        """
+        The coarsest registered rollup that gives the same result as grouping
+        the raw documents: no extra pipeline or middle filter, every grouping
+        a rollup key or `time_field` at a unit derivable from the rollup's,
+        the same metrics, and `first_filter` reading only key fields and
+        bucket-aligned `$gte`/`$lt` bounds of `time_field`.
+        """
+        if aggregation_pipeline or middle_filter:
+            return None
+
+        for rollup in sorted(
+            self.rollups.values(),
+            key=lambda i: UNIT_RANKS[i["unit"]],
+            reverse=True,
+        ):
+            if (
+                rollup["timezone"] == self.group_by_timezone
+                and rollup["start_of_week"] == self.group_by_start_of_week
+                and all(
+                    rollup["metrics"].get(name) == tuple(spec)
+                    for name, spec in (metrics or {}).items()
+                )
+                and self._is_rollup_covering_group_by(rollup, group_by_on)
+                and self._is_rollup_covering_filter(rollup, first_filter or {})
+            ):
+                return rollup
+
+        return None
+
+    def _is_rollup_covering_group_by(
+        self: T,
+        rollup: Dict[str, Any],
+        group_by_on: list[str],
+    ) -> bool:
+        for field_alias_name in group_by_on:
+            field_real_name = field_alias_name.replace(self.field_separator, ".")
+            base_real_name, suffix = self.split_datetime_suffix(field_real_name)
+
+            if suffix is None:
+                if field_real_name not in rollup["keys"]:
+                    return False
+
+            elif base_real_name != rollup["time_field"] or not self.is_unit_derivable(
+                self.parse_datetime_suffix(suffix)[0],
+                rollup["unit"],
+            ):
+                return False
+
+        return True
+
+    def _is_rollup_covering_filter(self: T, rollup: Dict[str, Any], filter_: Dict) -> bool:
+        for key, value in filter_.items():
+            if key in ("$and", "$or", "$nor"):
+                if not all(self._is_rollup_covering_filter(rollup, i) for i in value):
+                    return False
+
+            elif key == rollup["time_field"]:
+                if value is None:
+                    continue
+
+                if not isinstance(value, dict) or not all(
+                    operator in ("$gte", "$lt")
+                    and isinstance(bound, datetime)
+                    and self.truncate_datetime(
+                        bound,
+                        rollup["unit"],
+                        rollup["timezone"],
+                        rollup["start_of_week"],
+                    ) == bound
+                    for operator, bound in value.items()
+                ):
+                    return False
+
+            elif key.startswith("$") or key not in rollup["keys"]:
+                return False
+
+        return True
+
+    @staticmethod
+    def is_unit_derivable(unit: str, rollup_unit: str) -> bool:
+        """Whether buckets (or date parts) of `unit` can be computed from bucket starts of `rollup_unit`."""
+        if rollup_unit == "week":
+            return unit == "week"
+
+        if unit == "week":
+            return UNIT_RANKS[rollup_unit] <= UNIT_RANKS["day"]
+
+        return UNIT_RANKS[unit] >= UNIT_RANKS[rollup_unit]
+
+    @staticmethod
+    def truncate_datetime(
+        value: datetime,
+        unit: str,
+        timezone: str = "UTC",
+        start_of_week: str = "monday",
+    ) -> datetime:
+        """`$dateTrunc` in Python; naive datetimes are UTC, as pymongo returns them."""
+        match = fullmatch(r"([+-])(\d{2}):?(\d{2})", timezone)
+        if match:
+            offset = timedelta(hours=int(match.group(2)), minutes=int(match.group(3)))
+            zone = dt_timezone(-offset if match.group(1) == "-" else offset)
+        else:
+            zone = ZoneInfo(timezone)
+
+        local = (value if value.tzinfo else value.replace(tzinfo=dt_timezone.utc)).astimezone(zone)
+        if unit in ("second", "minute", "hour"):
+            parts = {
+                "second": {"microsecond": 0},
+                "minute": {"second": 0, "microsecond": 0},
+                "hour": {"minute": 0, "second": 0, "microsecond": 0},
+            }[unit]
+            truncated = local.replace(**parts)
+
+        else:
+            day = local.date()
+            if unit == "week":
+                day -= timedelta(days=(day.weekday() - WEEKDAYS.index(start_of_week.lower())) % 7)
+            elif unit == "month":
+                day = day.replace(day=1)
+            elif unit == "quarter":
+                day = date(day.year, (day.month - 1) // 3 * 3 + 1, 1)
+            elif unit == "year":
+                day = date(day.year, 1, 1)
+            truncated = datetime(day.year, day.month, day.day, tzinfo=zone)
+
+        truncated = truncated.astimezone(dt_timezone.utc)
+        return truncated if value.tzinfo else truncated.replace(tzinfo=None)
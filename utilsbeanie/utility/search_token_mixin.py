@@ -0,0 +1,114 @@
+from re import findall
+from unicodedata import (
+    category,
+    normalize,
+)
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+    Protocol,
+    runtime_checkable,
+    TypeVar,
+    Generic,
+)
+
+
+@runtime_checkable
+class SearchTokenMixinProtocol(Protocol):
+    fields_names_for_search_tokens: Tuple[str, ...] = tuple()
+    search_tokens_field_name: str = "_search_tokens"
+    search_tokens_edge_ngram_min_length: int | None = None
+
+
+T = TypeVar("T", bound=SearchTokenMixinProtocol)
+
+
+class SearchTokenMixin(Generic[T]):
+    @staticmethod
+    def normalize_search_text(text: Any) -> List[str]:
+        """Case-fold, strip accents and split a value into word tokens."""
+        if text is None:
+            return []
+
+        text = normalize("NFKD", str(text))
+        text = "".join(i for i in text if category(i) != "Mn")
+        return findall(r"\w+", text.casefold())
+
+    @staticmethod
+    def get_value_by_path(obj: Dict, path: str) -> Any:
+        for key in path.split("."):
+            if not isinstance(obj, dict):
+                return None
+            obj = obj.get(key)
+
+        return obj
+
+    def prepare_search_tokens(self: T, values: Dict) -> List[str]:
+        tokens = set()
+        for field_name in self.fields_names_for_search_tokens:
+            value = self.get_value_by_path(values, field_name)
+            if isinstance(value, (list, tuple, set)):
+                value = " ".join(str(i) for i in value)
+
+            for token in self.normalize_search_text(value):
+                if self.search_tokens_edge_ngram_min_length:
+                    for length in range(
+                        self.search_tokens_edge_ngram_min_length,
+                        len(token) + 1,
+                    ):
+                        tokens.add(token[:length])
+
+                tokens.add(token)
+
+        return sorted(tokens)
+
+    def prepare_search_tokens_projection(self: T) -> Dict[str, int]:
+        return {i: 1 for i in self.fields_names_for_search_tokens}
+
+    def is_search_tokens_affected(self: T, inputs: Dict) -> bool:
+        if not self.fields_names_for_search_tokens:
+            return False
+
+        for key in inputs:
+            for field_name in self.fields_names_for_search_tokens:
+                if (
+                    key == field_name
+                    or field_name.startswith(f"{key}.")
+                    or key.startswith(f"{field_name}.")
+                ):
+                    return True
+
+        return False
+
+    def prepare_filter_for_search_tokens(
+        self: T,
+        search_field_name: str,
+        inputs: dict,
+    ) -> list[dict]:
+        filter_ = []
+        if inputs.get(search_field_name):
+
+            split_value = list()
+            for i in inputs[search_field_name]:
+                split_value.extend(self.normalize_search_text(i))
+
+            if self.search_tokens_edge_ngram_min_length:
+                # shorter terms were never stored as n-grams.
+                split_value = [
+                    i
+                    for i in split_value
+                    if len(i) >= self.search_tokens_edge_ngram_min_length
+                ]
+
+            if split_value:
+                filter_.append(
+                    {
+                        self.search_tokens_field_name: {
+                            "$all": list(dict.fromkeys(split_value))
+                        }
+                    }
+                )
+
+        return filter_
@@ -8,11 +8,26 @@ from utilsbeanie import utility
 
 class UtilsBeanie(
     actions.DeleteMixin,
+    actions.DistinctValuesMixin,
     actions.ExistMixin,
     actions.FetchByAggregationPipelineMixin,
     actions.FetchByGroupByAggregationPipelineMixin,
+    actions.FetchByApproximateGroupByMixin,
+    actions.FetchByApplicationJoinMixin,
+    actions.FetchByPlannedJoinMixin,
+    actions.FetchColumnsMixin,
+    actions.FetchFacetCountsMixin,
     actions.FetchSimpleMixin,
+    actions.GroupByCacheMixin,
     actions.InsertMixin,
+    actions.MigrationMixin,
+    actions.ParallelScanMixin,
+    actions.PartitionMixin,
+    actions.ReferenceCacheMixin,
+    actions.RollupMixin,
+    actions.SearchTokenMixin,
+    actions.StreamJsonMixin,
+    actions.TextSearchMixin,
     actions.UpdateByObjMixin,
     actions.UpdateNoReturnMixin,
     actions.UpdateWithReturnMixin,
@@ -24,12 +39,135 @@ class UtilsBeanie(
     utility.FilterForAggregationMixin,
     utility.FilterForGroupByAggregationMixin,
     utility.FilterMixin,
+    utility.CreationTimeMixin,
+    utility.SearchTokenMixin,
+    utility.PipelineOptimizerMixin,
+    utility.JoinPlannerMixin,
+    utility.RollupMixin,
+    utility.GroupByCacheMixin,
+    utility.ApproximateGroupByMixin,
+    utility.FacetCountsMixin,
+    utility.JsonEncoderMixin,
+    utility.ColumnsMixin,
+    utility.ParallelScanMixin,
+    utility.PartitionMixin,
     utility.HelperMixin,
 ):
     def __init__(
         self,
         document: Type[Document],
-        field_separator: str = "__"
+        field_separator: str = "__",
+        fields_names_for_search_tokens: tuple[str, ...] = tuple(),
+        search_tokens_field_name: str = "_search_tokens",
+        search_tokens_edge_ngram_min_length: int | None = None,
+        use_text_search: bool = False,
+        optimize_aggregation_pipelines: bool = True,
+        print_aggregation_pipeline_diff: bool = False,
+        defer_lookups: bool = True,
+        reference_collections: dict | None = None,
+        reference_cache_max_bytes: int = 64 * 1024 * 1024,
+        join_planner_min_samples: int = 3,
+        join_planner_stats_ttl: float = 300,
+        use_date_trunc: bool = False,
+        group_by_timezone: str = "UTC",
+        group_by_start_of_week: str = "monday",
+        use_rollups: bool = True,
+        use_group_by_bucket_cache: bool = False,
+        group_by_bucket_cache_lag: float = 0,
+        group_by_bucket_cache_max_entries: int = 256,
+        distinct_values_max_cardinality: int = 1000,
+        distinct_values_reconcile_interval: float = 600,
+        distinct_values_catalogs: dict | None = None,
+        creation_time_field_name: str | None = None,
+        creation_time_key: str = "_id",
+        creation_time_slack: float = 1,
+        epoch_pid_suffix_digits: int = 4,
+        partition_field_name: str | None = None,
+        partition_days: int | None = None,
+        partition_names_ttl: float = 60,
     ) -> None:
         self.document: Type[Document] = document
         self.field_separator = field_separator
+
+        # opt-in: when set, inserts and updates keep a token array of these
+        # fields and search inputs compile to `{search_tokens_field_name: {"$all": ...}}`.
+        # A document declaring that field (by alias) writes the tokens with itself,
+        # see `set_search_tokens`.
+        self.fields_names_for_search_tokens = fields_names_for_search_tokens
+        self.search_tokens_field_name = search_tokens_field_name
+        self.search_tokens_edge_ngram_min_length = search_tokens_edge_ngram_min_length
+
+        # search inputs compile to `$text` instead of regexes, see `ensure_text_index`.
+        self.use_text_search = use_text_search
+
+        # aggregation fetchers run `optimize_aggregation_pipeline` before execution.
+        self.optimize_aggregation_pipelines = optimize_aggregation_pipelines
+        self.print_aggregation_pipeline_diff = print_aggregation_pipeline_diff
+        # paginate before joining when the sort and filters allow it,
+        # see `defer_lookup_stages`.
+        self.defer_lookups = defer_lookups
+
+        # small collections held in memory for application-side joins, see
+        # `register_reference_collection`. Pass the same dict to share them.
+        self.reference_collections = (
+            reference_collections if reference_collections is not None else dict()
+        )
+        self.reference_cache_max_bytes = reference_cache_max_bytes
+
+        # `fetch_by_planned_join` statistics: durations per query shape and
+        # plan, and the size and indexes of foreign collections, refreshed
+        # every `join_planner_stats_ttl` seconds.
+        self.join_planner_min_samples = join_planner_min_samples
+        self.join_planner_stats_ttl = join_planner_stats_ttl
+        self.join_planner_stats = dict()
+        self.join_planner_collections_stats = dict()
+
+        # group `_by_*` datetime suffixes on `$dateTrunc` dates (and integer
+        # date parts) instead of `$dateToString` strings, see
+        # `build_datetime_bucket_expression`.
+        self.use_date_trunc = use_date_trunc
+        self.group_by_timezone = group_by_timezone
+        self.group_by_start_of_week = group_by_start_of_week
+
+        # group-by queries are answered from a registered rollup when one
+        # covers them, see `register_rollup` and `find_covering_rollup`.
+        self.use_rollups = use_rollups
+        self.rollups = dict()
+
+        # group-by queries with a time bucket keep the results of closed
+        # buckets in memory and only aggregate the open ones, see
+        # `fetch_group_by_with_bucket_cache`.
+        self.use_group_by_bucket_cache = use_group_by_bucket_cache
+        self.group_by_bucket_cache_lag = group_by_bucket_cache_lag
+        self.group_by_bucket_cache_max_entries = group_by_bucket_cache_max_entries
+        self.group_by_buckets_cache = dict()
+
+        # `fetch_distinct_values` catalogs: fields with more values are
+        # searched by prefix instead of being held in memory.
+        self.distinct_values_max_cardinality = distinct_values_max_cardinality
+        self.distinct_values_reconcile_interval = distinct_values_reconcile_interval
+        # pass the same dict so writes through other `UtilsBeanie` objects of
+        # the document reach these catalogs; each keeps the settings of the
+        # object that created it.
+        self.distinct_values_catalogs = (
+            distinct_values_catalogs if distinct_values_catalogs is not None else dict()
+        )
+
+        # opt-in: range inputs of this field also bound `creation_time_key`
+        # (`_id` or an epoch `pid`), see `prepare_filter_for_creation_time`.
+        self.creation_time_field_name = creation_time_field_name
+        self.creation_time_key = creation_time_key
+        self.creation_time_slack = creation_time_slack
+        # epoch pids are the epoch seconds followed by a random suffix of this many
+        # digits, see `insert_one_by_epoch_pid`; creation time bounds and partition
+        # times of epoch pids read it.
+        self.epoch_pid_suffix_digits = epoch_pid_suffix_digits
+
+        # opt-in: documents live in per-month (or per `partition_days` days)
+        # collections by this field (a datetime, an epoch `pid` or `_id`),
+        # see `actions.PartitionMixin`.
+        self.partition_field_name = partition_field_name
+        self.partition_days = partition_days
+        self.partition_names_ttl = partition_names_ttl
+        self.partitions = dict()
+        self.partitions_refreshed_at = None